@@ -25,6 +25,7 @@ import six
 from six.moves import zip
 import tensorflow as tf
 
+from tensorflow_federated.python.common_libs import lru_cache
 from tensorflow_federated.python.common_libs import py_typecheck
 
 
@@ -60,6 +61,11 @@ class AnonymousTuple(object):
 
   Also note that the user will not be creating such tuples. They are a hidden
   part of the impementation designed to work together with function decorators.
+
+  Tuples with the same sequence of names share a single (read-only) mapping
+  from names to indices. Internal code that constructs many tuples from values
+  it already trusts, such as the executors, can skip the validation done by the
+  constructor with `from_names_and_values()` and `with_values()`.
   """
   __slots__ = ('_hash', '_element_array', '_name_to_index')
 
@@ -86,18 +92,7 @@ class AnonymousTuple(object):
             'element is a string, found {}.'.format(repr(e)))
 
     self._element_array = tuple(e[1] for e in elements)
-    self._name_to_index = {}
-    for idx, e in enumerate(elements):
-      name = e[0]
-      if name is None:
-        continue
-      if name == '_asdict':
-        raise ValueError('The name "_asdict" is reserved for a method, '
-                         'as with namedtuples.')
-      elif name in self._name_to_index:
-        raise ValueError('AnonymousTuple does not support duplicated '
-                         'names, but found ' + str([e[0] for e in elements]))
-      self._name_to_index[name] = idx
+    self._name_to_index = _get_name_to_index(tuple(e[0] for e in elements))
     self._hash = None
 
   def __len__(self):
@@ -178,6 +173,8 @@ def to_elements(an_anonymous_tuple):
   """
   py_typecheck.check_type(an_anonymous_tuple, AnonymousTuple)
   # pylint: disable=protected-access
+  if not an_anonymous_tuple._name_to_index:
+    return [(None, val) for val in an_anonymous_tuple._element_array]
   index_to_name = {
       idx: name
       for name, idx in six.iteritems(an_anonymous_tuple._name_to_index)
@@ -225,7 +222,7 @@ def flatten(structure):
     return tf.nest.flatten(structure)
   else:
     result = []
-    for _, v in to_elements(structure):
+    for v in structure._element_array:  # pylint: disable=protected-access
       result.extend(flatten(v))
     return result
 
@@ -249,16 +246,133 @@ def pack_sequence_as(structure, flat_sequence):
     if not isinstance(structure, AnonymousTuple):
       return flat_sequence[position], position + 1
     else:
-      elements = []
-      for k, v in to_elements(structure):
+      values = []
+      for v in structure._element_array:  # pylint: disable=protected-access
         packed_v, position = _pack(v, flat_sequence, position)
-        elements.append((k, packed_v))
-      return AnonymousTuple(elements), position
+        values.append(packed_v)
+      return with_values(structure, values), position
 
   result, _ = _pack(structure, flat_sequence, 0)
   return result
 
 
+def from_names_and_values(names, values):
+  """Constructs an `AnonymousTuple` from a tuple of names and a list of values.
+
+  This is a fast alternative to the constructor for internal code that builds
+  many tuples with the same names. The names are validated only the first time
+  they are seen, and all tuples with the same names share the mapping from
+  names to indices. The values are taken as they are.
+
+  Args:
+    names: A tuple of the names of the elements, each a string or `None`.
+    values: A list or tuple of the values of the elements, of the same length
+      as `names`.
+
+  Returns:
+    An instance of `AnonymousTuple`.
+
+  Raises:
+    TypeError: If `names` is not a tuple of strings and `None`s.
+    ValueError: If the lengths of `names` and `values` differ, or if any of the
+      names is duplicated or reserved.
+  """
+  py_typecheck.check_type(names, tuple)
+  name_to_index = _get_name_to_index(names)
+  if len(values) != len(names):
+    raise ValueError(
+        'Expected {} values to go with names {}, found {}.'.format(
+            len(names), str(names), len(values)))
+  return _make_anonymous_tuple(tuple(values), name_to_index)
+
+
+def with_values(an_anonymous_tuple, values):
+  """Returns a tuple with the names of `an_anonymous_tuple` and `values`.
+
+  The result shares the mapping from names to indices with
+  `an_anonymous_tuple`, so no validation takes place. This is the fast way to
+  construct a value with the names of a `tff.NamedTupleType`, or with the same
+  names as another value.
+
+  Args:
+    an_anonymous_tuple: An instance of `AnonymousTuple` (or of a subclass, such
+      as `tff.NamedTupleType`) to take the names from.
+    values: A list or tuple of values, one for each element of
+      `an_anonymous_tuple`.
+
+  Returns:
+    An instance of `AnonymousTuple`.
+
+  Raises:
+    TypeError: If `an_anonymous_tuple` is not an `AnonymousTuple`.
+    ValueError: If the number of values does not match.
+  """
+  py_typecheck.check_type(an_anonymous_tuple, AnonymousTuple)
+  # pylint: disable=protected-access
+  if len(values) != len(an_anonymous_tuple._element_array):
+    raise ValueError(
+        'Expected {} values to go with the names of {}, found {}.'.format(
+            len(an_anonymous_tuple._element_array), str(an_anonymous_tuple),
+            len(values)))
+  return _make_anonymous_tuple(
+      tuple(values), an_anonymous_tuple._name_to_index)
+  # pylint: enable=protected-access
+
+
+def _make_anonymous_tuple(element_array, name_to_index):
+  """Constructs an `AnonymousTuple` directly from its internal state."""
+  result = AnonymousTuple.__new__(AnonymousTuple)
+  # pylint: disable=protected-access
+  result._element_array = element_array
+  result._name_to_index = name_to_index
+  result._hash = None
+  # pylint: enable=protected-access
+  return result
+
+
+def _get_name_to_index(names):
+  """Returns the shared mapping from names to indices for a tuple of names.
+
+  Args:
+    names: A tuple of the names of the elements of a tuple, each a string or
+      `None`.
+
+  Returns:
+    A dict from names to indices that must not be modified.
+
+  Raises:
+    TypeError: If any of the names is not a string or `None`.
+    ValueError: If any of the names is duplicated or reserved.
+  """
+  name_to_index = _name_to_index_maps.get(names)
+  if name_to_index is not None:
+    return name_to_index
+  name_to_index = {}
+  for idx, name in enumerate(names):
+    if name is None:
+      continue
+    py_typecheck.check_type(name, six.string_types)
+    if name == '_asdict':
+      raise ValueError('The name "_asdict" is reserved for a method, '
+                       'as with namedtuples.')
+    elif name in name_to_index:
+      raise ValueError('AnonymousTuple does not support duplicated '
+                       'names, but found ' + str(list(names)))
+    name_to_index[name] = idx
+  # Programs usually construct tuples with a small number of distinct sets of
+  # names. The maps are dropped wholesale if this is not the case, which costs
+  # less than tracking their use on each construction.
+  if len(_name_to_index_maps) >= _MAX_NAME_TO_INDEX_MAPS:
+    _name_to_index_maps.clear()
+  _name_to_index_maps[names] = name_to_index
+  return name_to_index
+
+
+_name_to_index_maps = {}
+
+_MAX_NAME_TO_INDEX_MAPS = 10000
+
+
 def is_same_structure(a, b):
   """Compares whether `a` and `b` have the same nested structure.
 
@@ -329,11 +443,143 @@ def map_structure(fn, *structure):
       raise TypeError('Structure at position {} is not the same '
                       'structure'.format(i))
 
-  flat_structure = [flatten(s) for s in structure]
+  plan = StructurePlan(structure[0])
+  flat_structure = [plan.flatten(s) for s in structure]
   entries = zip(*flat_structure)
   s = [fn(*x) for x in entries]
 
-  return pack_sequence_as(structure[0], s)
+  return plan.pack(s)
+
+
+class StructurePlan(object):
+  """The nesting and the names of a (possibly nested) anonymous tuple.
+
+  A plan is computed once for a given structure, and then flattens values of
+  that structure into lists of leaves, and packs lists of leaves back into that
+  structure, each in a single pass that does not inspect the structure again.
+  This makes it cheaper than `flatten()` and `pack_sequence_as()` for code that
+  handles many values of the same structure. The leaves are all elements that
+  are not anonymous tuples, as in `pack_sequence_as()`, so that `pack()` is the
+  exact inverse of `flatten()`.
+
+  Plans for hashable structures, in particular for TFF types, can be shared
+  with `get_structure_plan()`.
+  """
+
+  def __init__(self, structure):
+    """Constructs a plan for `structure`.
+
+    Args:
+      structure: An anonymous tuple, possibly recursively nested, or a non-tuple
+        value that is treated as a single leaf.
+    """
+    self._node = _make_structure_node(structure)
+    self._num_leaves = _count_leaves(self._node)
+
+  @property
+  def num_leaves(self):
+    return self._num_leaves
+
+  def flatten(self, value):
+    """Returns the list of the leaves of `value`, in depth-first order.
+
+    Args:
+      value: A value with the structure of this plan.
+
+    Returns:
+      The list of leaves, of length `num_leaves`.
+
+    Raises:
+      ValueError: If `value` does not have the structure of this plan.
+    """
+    if self._node is None:
+      return [value]
+    result = []
+    _flatten_node(self._node, value, result)
+    return result
+
+  def pack(self, flat_sequence):
+    """Packs the leaves in `flat_sequence` into the structure of this plan.
+
+    Args:
+      flat_sequence: A list or tuple of `num_leaves` leaves.
+
+    Returns:
+      An anonymous tuple with the structure of this plan (or the single leaf,
+      if the structure is not a tuple).
+
+    Raises:
+      ValueError: If `flat_sequence` has the wrong length.
+    """
+    if len(flat_sequence) != self._num_leaves:
+      raise ValueError(
+          'Expected a sequence of {} leaves, found {}.'.format(
+              self._num_leaves, len(flat_sequence)))
+    if self._node is None:
+      return flat_sequence[0]
+    return _pack_node(self._node, iter(flat_sequence))
+
+
+# The structure is represented as a tree of nodes, in which each leaf is `None`,
+# and each tuple is a pair of the mapping from its names to indices and the
+# tuple of its child nodes.
+def _make_structure_node(structure):
+  if not isinstance(structure, AnonymousTuple):
+    return None
+  # pylint: disable=protected-access
+  return (structure._name_to_index,
+          tuple(_make_structure_node(v) for v in structure._element_array))
+  # pylint: enable=protected-access
+
+
+def _count_leaves(node):
+  if node is None:
+    return 1
+  return sum(_count_leaves(child) for child in node[1])
+
+
+def _flatten_node(node, value, result):
+  if not isinstance(value, AnonymousTuple):
+    raise ValueError(
+        'Expected an anonymous tuple, found {}.'.format(type(value).__name__))
+  children = node[1]
+  elements = value._element_array  # pylint: disable=protected-access
+  if len(elements) != len(children):
+    raise ValueError(
+        'Expected an anonymous tuple of {} elements, found {}.'.format(
+            len(children), len(elements)))
+  for child, element in zip(children, elements):
+    if child is None:
+      result.append(element)
+    else:
+      _flatten_node(child, element, result)
+
+
+def _pack_node(node, leaves):
+  name_to_index, children = node
+  return _make_anonymous_tuple(
+      tuple(
+          next(leaves) if child is None else _pack_node(child, leaves)
+          for child in children), name_to_index)
+
+
+def get_structure_plan(structure):
+  """Returns a (possibly cached) `StructurePlan` for `structure`.
+
+  Args:
+    structure: A hashable structure, e.g., an instance of `tff.Type`.
+
+  Returns:
+    An instance of `StructurePlan`.
+  """
+  plan = _structure_plans.get(structure)
+  if plan is None:
+    plan = StructurePlan(structure)
+    _structure_plans.put(structure, plan)
+  return plan
+
+
+_structure_plans = lru_cache.LruCache(1000)
 
 
 def from_container(value, recursive=False):
@@ -0,0 +1,78 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for constructing instances of anonymous_tuple.AnonymousTuple."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from six.moves import range
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import test
+
+
+class ConstructAnonymousTupleBenchmark(tf.test.Benchmark):
+  """Compares the constructor of `AnonymousTuple` with the fast paths."""
+
+  def _benchmark_construct(self, name, construct, num_tuples, num_iters=5):
+    construct_time_array = []
+    for _ in range(num_iters):
+      construct_start = time.time()
+      for idx in range(num_tuples):
+        construct(idx)
+      construct_stop = time.time()
+      construct_time_array.append(construct_stop - construct_start)
+    wall_time = np.mean(construct_time_array)
+    self.report_benchmark(
+        name='Construct {} tuples with {}'.format(num_tuples, name),
+        wall_time=wall_time,
+        iters=num_iters,
+        extras={'tuples_per_second': num_tuples / wall_time})
+
+  def benchmark_construct_unnamed_pairs(self):
+    names = (None, None)
+    for name, construct in [
+        ('constructor',
+         lambda idx: anonymous_tuple.AnonymousTuple([(None, idx),
+                                                     (None, idx)])),
+        ('from_names_and_values',
+         lambda idx: anonymous_tuple.from_names_and_values(names, [idx, idx])),
+    ]:
+      self._benchmark_construct('{} (unnamed pairs)'.format(name), construct,
+                                100000)
+
+  def benchmark_construct_named_tuples(self):
+    names = tuple('layer_{}'.format(k) for k in range(20))
+    template = anonymous_tuple.from_names_and_values(names, [0] * len(names))
+    for name, construct in [
+        ('constructor',
+         lambda idx: anonymous_tuple.AnonymousTuple([(k, idx) for k in names])),
+        ('from_names_and_values',
+         lambda idx: anonymous_tuple.from_names_and_values(
+             names, [idx] * len(names))),
+        ('with_values',
+         lambda idx: anonymous_tuple.with_values(template, [idx] * len(names))),
+    ]:
+      self._benchmark_construct('{} (20 named elements)'.format(name),
+                                construct, 20000)
+
+
+if __name__ == '__main__':
+  test.main()
@@ -198,6 +198,90 @@ class AnonymousTupleTest(absltest.TestCase):
     z = anonymous_tuple.pack_sequence_as(x, y)
     self.assertEqual(str(z), '<a=10,b=<x=<p=40>,y=30,z=<q=50,r=60>>,c=20>')
 
+  def test_structure_plan_flatten_and_pack(self):
+    x = anonymous_tuple.AnonymousTuple([
+        ('a', 10),
+        ('b',
+         anonymous_tuple.AnonymousTuple([
+             ('x', anonymous_tuple.AnonymousTuple([('p', 40)])),
+             (None, 30),
+             ('z', anonymous_tuple.AnonymousTuple([])),
+         ])),
+        ('c', [20, 21]),
+    ])
+    plan = anonymous_tuple.StructurePlan(x)
+    self.assertEqual(plan.num_leaves, 4)
+    y = plan.flatten(x)
+    self.assertEqual(y, [10, 40, 30, [20, 21]])
+    z = plan.pack([1, 2, 3, 4])
+    self.assertEqual(str(z), '<a=1,b=<x=<p=2>,3,z=<>>,c=4>')
+    self.assertEqual(plan.flatten(z), [1, 2, 3, 4])
+
+  def test_structure_plan_with_non_tuple(self):
+    plan = anonymous_tuple.StructurePlan(10)
+    self.assertEqual(plan.num_leaves, 1)
+    self.assertEqual(plan.flatten(20), [20])
+    self.assertEqual(plan.pack([30]), 30)
+
+  def test_structure_plan_fails_on_mismatched_structure(self):
+    plan = anonymous_tuple.StructurePlan(
+        anonymous_tuple.AnonymousTuple([('a', 10), ('b', 20)]))
+    with self.assertRaises(ValueError):
+      plan.flatten(anonymous_tuple.AnonymousTuple([('a', 10)]))
+    with self.assertRaises(ValueError):
+      plan.flatten(10)
+    with self.assertRaises(ValueError):
+      plan.pack([1, 2, 3])
+
+  def test_get_structure_plan_caches_plans(self):
+    x = anonymous_tuple.AnonymousTuple([('a', 10), ('b', (20, 30))])
+    plan = anonymous_tuple.get_structure_plan(x)
+    self.assertIs(
+        anonymous_tuple.get_structure_plan(
+            anonymous_tuple.AnonymousTuple([('a', 10), ('b', (20, 30))])), plan)
+
+  def test_from_names_and_values(self):
+    x = anonymous_tuple.from_names_and_values(('a', None, 'c'), [10, 20, 30])
+    self.assertIsInstance(x, anonymous_tuple.AnonymousTuple)
+    self.assertEqual(x, anonymous_tuple.AnonymousTuple([('a', 10), (None, 20),
+                                                        ('c', 30)]))
+    self.assertEqual(x.c, 30)
+    self.assertEqual(
+        str(anonymous_tuple.from_names_and_values((), [])), '<>')
+
+  def test_from_names_and_values_fails_on_bad_names(self):
+    with self.assertRaises(ValueError):
+      anonymous_tuple.from_names_and_values(('a', 'a'), [10, 20])
+    with self.assertRaises(ValueError):
+      anonymous_tuple.from_names_and_values(('_asdict',), [10])
+    with self.assertRaises(ValueError):
+      anonymous_tuple.from_names_and_values(('a', 'b'), [10])
+    with self.assertRaises(TypeError):
+      anonymous_tuple.from_names_and_values(('a', 1), [10, 20])
+    with self.assertRaises(TypeError):
+      anonymous_tuple.from_names_and_values(['a'], [10])
+
+  def test_with_values(self):
+    x = anonymous_tuple.AnonymousTuple([('a', 10), (None, 20), ('b', 30)])
+    y = anonymous_tuple.with_values(x, [1, 2, 3])
+    self.assertEqual(str(y), '<a=1,2,b=3>')
+    self.assertEqual(str(x), '<a=10,20,b=30>')
+    self.assertEqual(hash(y),
+                     hash(anonymous_tuple.from_names_and_values(
+                         ('a', None, 'b'), (1, 2, 3))))
+    with self.assertRaises(ValueError):
+      anonymous_tuple.with_values(x, [1, 2])
+
+  def test_tuples_with_same_names_share_name_to_index(self):
+    x = anonymous_tuple.AnonymousTuple([('a', 10), ('b', 20)])
+    y = anonymous_tuple.AnonymousTuple([('a', 30), ('b', 40)])
+    z = anonymous_tuple.from_names_and_values(('a', 'b'), [50, 60])
+    # pylint: disable=protected-access
+    self.assertIs(x._name_to_index, y._name_to_index)
+    self.assertIs(x._name_to_index, z._name_to_index)
+    # pylint: enable=protected-access
+    self.assertEqual([x.b, y.b, z.b], [20, 40, 60])
+
   def test_is_same_structure_check_types(self):
     self.assertTrue(
         anonymous_tuple.is_same_structure(
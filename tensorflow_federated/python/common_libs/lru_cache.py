@@ -0,0 +1,146 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A simple thread-safe bounded cache with least-recently-used eviction."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import threading
+
+from tensorflow_federated.python.common_libs import py_typecheck
+
+
+class LruCache(object):
+  """A bounded mapping that evicts the least recently used entries.
+
+  The cache keeps track of the number of lookups that were served from the
+  cache (`hits`) and of those that were not (`misses`). All operations are
+  guarded by a lock, so a single instance can be shared between threads.
+
+  Example:
+
+  ```python
+  cache = LruCache(2)
+  cache.put('a', 1)
+  cache.put('b', 2)
+  cache.get('a') == 1
+  cache.put('c', 3)  # Evicts 'b', the least recently used entry.
+  cache.get('b') is None
+  ```
+  """
+
+  def __init__(self, max_size, on_evict=None):
+    """Constructs an empty cache.
+
+    Args:
+      max_size: The maximum number of entries to retain, a positive integer.
+      on_evict: An optional callable to invoke with the value of each entry
+        that is dropped from the cache, either due to eviction or as a result of
+        calling `clear()`, e.g., to release the resources the value holds.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+      ValueError: If `max_size` is not positive.
+    """
+    py_typecheck.check_type(max_size, int)
+    if max_size < 1:
+      raise ValueError(
+          'The maximum size of the cache must be positive, found {}.'.format(
+              max_size))
+    if on_evict is not None:
+      py_typecheck.check_callable(on_evict)
+    self._max_size = max_size
+    self._on_evict = on_evict
+    self._entries = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+
+  @property
+  def max_size(self):
+    return self._max_size
+
+  @property
+  def hits(self):
+    return self._hits
+
+  @property
+  def misses(self):
+    return self._misses
+
+  def __len__(self):
+    return len(self._entries)
+
+  def __contains__(self, key):
+    return key in self._entries
+
+  def get(self, key, default=None):
+    """Returns the value cached under `key`, or `default` if there is none.
+
+    A successful lookup marks the entry as the most recently used one.
+
+    Args:
+      key: The hashable key to look up.
+      default: The value to return if `key` is not in the cache.
+
+    Returns:
+      The cached value, or `default`.
+    """
+    with self._lock:
+      value = self._entries.pop(key, _MISSING)
+      if value is _MISSING:
+        self._misses += 1
+        return default
+      self._entries[key] = value
+      self._hits += 1
+      return value
+
+  def put(self, key, value):
+    """Caches `value` under `key`, evicting the oldest entries if needed.
+
+    Args:
+      key: The hashable key to cache the value under.
+      value: The value to cache.
+    """
+    evicted = []
+    with self._lock:
+      previous = self._entries.pop(key, _MISSING)
+      if previous is not _MISSING and previous is not value:
+        evicted.append(previous)
+      self._entries[key] = value
+      while len(self._entries) > self._max_size:
+        _, oldest = self._entries.popitem(last=False)
+        evicted.append(oldest)
+    self._evict(evicted)
+
+  def clear(self):
+    """Drops all entries from the cache (the counters are left intact)."""
+    with self._lock:
+      evicted = list(self._entries.values())
+      self._entries.clear()
+    self._evict(evicted)
+
+  def _evict(self, values):
+    # The callback is invoked outside of the lock, since it may be arbitrarily
+    # expensive (e.g., closing a session).
+    if self._on_evict is not None:
+      for value in values:
+        self._on_evict(value)
+
+
+# A sentinel distinct from any value a client might cache (including `None`).
+_MISSING = object()
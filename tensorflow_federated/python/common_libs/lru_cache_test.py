@@ -0,0 +1,76 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for lru_cache.py."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from absl.testing import absltest
+
+from tensorflow_federated.python.common_libs import lru_cache
+
+
+class LruCacheTest(absltest.TestCase):
+
+  def test_construction_with_bad_size_fails(self):
+    with self.assertRaises(TypeError):
+      lru_cache.LruCache('10')
+    with self.assertRaises(ValueError):
+      lru_cache.LruCache(0)
+
+  def test_get_counts_hits_and_misses(self):
+    cache = lru_cache.LruCache(10)
+    self.assertIsNone(cache.get('a'))
+    cache.put('a', 1)
+    self.assertEqual(cache.get('a'), 1)
+    self.assertEqual(cache.get('a'), 1)
+    self.assertEqual(cache.get('b', 5), 5)
+    self.assertEqual(cache.hits, 2)
+    self.assertEqual(cache.misses, 2)
+
+  def test_put_evicts_least_recently_used(self):
+    evicted = []
+    cache = lru_cache.LruCache(2, on_evict=evicted.append)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    self.assertLen(cache, 2)
+    self.assertIn('a', cache)
+    self.assertNotIn('b', cache)
+    self.assertIn('c', cache)
+    self.assertEqual(evicted, [2])
+
+  def test_put_replacing_value_evicts_previous_value(self):
+    evicted = []
+    cache = lru_cache.LruCache(2, on_evict=evicted.append)
+    cache.put('a', 1)
+    cache.put('a', 2)
+    self.assertEqual(cache.get('a'), 2)
+    self.assertEqual(evicted, [1])
+
+  def test_clear_evicts_all_values(self):
+    evicted = []
+    cache = lru_cache.LruCache(3, on_evict=evicted.append)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.clear()
+    self.assertEmpty(cache)
+    self.assertCountEqual(evicted, [1, 2])
+
+
+if __name__ == '__main__':
+  absltest.main()
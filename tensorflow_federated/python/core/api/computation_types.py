@@ -33,7 +33,17 @@ from tensorflow_federated.python.tensorflow_libs import tensor_utils
 
 @six.add_metaclass(abc.ABCMeta)
 class Type(object):
-  """An abstract interface for all classes that represent TFF types."""
+  """An abstract interface for all classes that represent TFF types.
+
+  Types are immutable, and they are hashable consistently with `__eq__`, so
+  that they can be used as keys in dictionaries. Each type computes its hash
+  once, when it is first needed, and retains it. Comparisons for equality
+  return early for identical objects, and for types whose hashes have both
+  been computed already and differ.
+  """
+
+  # The cached hash of this type, or `None` if it has not been computed yet.
+  _hash_value = None
 
   @abc.abstractmethod
   def __repr__(self):
@@ -68,6 +78,38 @@ class Type(object):
   def __ne__(self, other):
     return not self == other
 
+  @abc.abstractmethod
+  def __hash__(self):
+    """Returns a hash of this type consistent with `__eq__`."""
+    raise NotImplementedError
+
+  def _cached_hash(self, *components):
+    """Returns the hash of `components`, computed once per instance."""
+    if self._hash_value is None:
+      self._hash_value = hash((type(self).__name__,) + components)
+    return self._hash_value
+
+  def _get_cached_hash(self):
+    """Returns the hash of this type if already computed, or else `None`."""
+    return self._hash_value
+
+  def _hashes_differ(self, other):
+    """Returns whether the hashes of `self` and `other` are known to differ.
+
+    Only hashes that have already been computed are compared, so this never
+    traverses either of the types.
+
+    Args:
+      other: Another instance of `Type`.
+
+    Returns:
+      `True` if the types are certainly not equal, or `False` if it is unknown.
+    """
+    self_hash = self._get_cached_hash()
+    other_hash = other._get_cached_hash()  # pylint: disable=protected-access
+    return (self_hash is not None and other_hash is not None and
+            self_hash != other_hash)
+
 
 class TensorType(Type):
   """An implementation of `tff.Type` representing types of tensors in TFF."""
@@ -131,9 +173,19 @@ class TensorType(Type):
       return self._dtype.name
 
   def __eq__(self, other):
-    return (isinstance(other, TensorType) and self._dtype == other.dtype and
+    if self is other:
+      return True
+    return (isinstance(other, TensorType) and
+            not self._hashes_differ(other) and self._dtype == other.dtype and
             tensor_utils.same_shape(self._shape, other.shape))
 
+  def __hash__(self):
+    if self._hash_value is not None:
+      return self._hash_value
+    if self._shape.ndims is None:
+      return self._cached_hash(self._dtype, None)
+    return self._cached_hash(self._dtype, tuple(self._shape.as_list()))
+
 
 class NamedTupleType(anonymous_tuple.AnonymousTuple, Type):
   """An implementation of `tff.Type` representing named tuple types in TFF."""
@@ -196,9 +248,18 @@ class NamedTupleType(anonymous_tuple.AnonymousTuple, Type):
     ])))
 
   def __eq__(self, other):
+    if self is other:
+      return True
     return (isinstance(other, NamedTupleType) and
+            not self._hashes_differ(other) and
             super(NamedTupleType, self).__eq__(other))
 
+  # The hash of the elements, cached by `AnonymousTuple`.
+  __hash__ = anonymous_tuple.AnonymousTuple.__hash__
+
+  def _get_cached_hash(self):
+    return self._hash
+
 
 # While this lives in the `api` diretory, `NamedTupleTypeWithPyContainerType` is
 # intended to be TFF internal and not exposed in the public API.
@@ -238,7 +299,13 @@ class SequenceType(Type):
     return '{}*'.format(str(self._element))
 
   def __eq__(self, other):
-    return isinstance(other, SequenceType) and self._element == other.element
+    if self is other:
+      return True
+    return (isinstance(other, SequenceType) and
+            not self._hashes_differ(other) and self._element == other.element)
+
+  def __hash__(self):
+    return self._cached_hash(self._element)
 
 
 class FunctionType(Type):
@@ -274,9 +341,15 @@ class FunctionType(Type):
         str(self._result))
 
   def __eq__(self, other):
+    if self is other:
+      return True
     return (isinstance(other, FunctionType) and
+            not self._hashes_differ(other) and
             self._parameter == other.parameter and self._result == other.result)
 
+  def __hash__(self):
+    return self._cached_hash(self._parameter, self._result)
+
 
 class AbstractType(Type):
   """An implementation of `tff.Type` representing abstract types in TFF."""
@@ -304,6 +377,9 @@ class AbstractType(Type):
   def __eq__(self, other):
     return isinstance(other, AbstractType) and self._label == other.label
 
+  def __hash__(self):
+    return self._cached_hash(self._label)
+
 
 class PlacementType(Type):
   """An implementation of `tff.Type` representing the placement type in TFF.
@@ -322,6 +398,9 @@ class PlacementType(Type):
   def __eq__(self, other):
     return isinstance(other, PlacementType)
 
+  def __hash__(self):
+    return self._cached_hash()
+
 
 class FederatedType(Type):
   """An implementation of `tff.Type` representing federated types in TFF."""
@@ -382,11 +461,16 @@ class FederatedType(Type):
       return '{{{}}}@{}'.format(str(self._member), str(self._placement))
 
   def __eq__(self, other):
+    if self is other:
+      return True
     return (isinstance(other, FederatedType) and
-            self._member == other.member and
+            not self._hashes_differ(other) and self._member == other.member and
             self._placement == other.placement and
             self._all_equal == other.all_equal)
 
+  def __hash__(self):
+    return self._cached_hash(self._member, self._placement, self._all_equal)
+
 
 def to_type(spec):
   """Converts the argument into an instance of `tff.Type`.
@@ -69,6 +69,16 @@ class TensorTypeTest(absltest.TestCase):
     self.assertEqual(t3, t4)
     self.assertNotEqual(t1, t3)
 
+  def test_hash(self):
+    t1 = computation_types.TensorType(tf.int32, [10])
+    t2 = computation_types.TensorType(tf.int32, [10])
+    t3 = computation_types.TensorType(tf.int32, [None])
+    t4 = computation_types.TensorType(tf.int32, [None])
+    t5 = computation_types.TensorType(tf.int32, None)
+    self.assertEqual(hash(t1), hash(t2))
+    self.assertEqual(hash(t3), hash(t4))
+    self.assertEqual(len(set([t1, t2, t3, t4, t5])), 3)
+
 
 class NamedTupleTypeTest(absltest.TestCase):
 
@@ -128,6 +138,27 @@ class NamedTupleTypeTest(absltest.TestCase):
     self.assertNotEqual(t4, t5)
     self.assertNotEqual(t4, t6)
 
+  def test_hash(self):
+    t1 = computation_types.to_type([('a', tf.int32), ('b', tf.bool)])
+    t2 = computation_types.to_type([('a', tf.int32), ('b', tf.bool)])
+    t3 = computation_types.to_type([tf.int32, tf.bool])
+    self.assertEqual(hash(t1), hash(t2))
+    self.assertEqual(set([t1, t2, t3]), set([t1, t3]))
+
+  def test_equality_with_hashes_computed(self):
+    t1 = computation_types.to_type([('a', tf.int32), ('b', [tf.bool])])
+    t2 = computation_types.to_type([('a', tf.int32), ('b', [tf.bool])])
+    t3 = computation_types.to_type([('a', tf.int32), ('b', [tf.int32])])
+    self.assertEqual(t1, t1)
+    for t in [t1, t2, t3]:
+      hash(t)
+    self.assertEqual(t1, t2)
+    self.assertNotEqual(t1, t3)
+    self.assertEqual(
+        computation_types.SequenceType(t1), computation_types.SequenceType(t2))
+    self.assertNotEqual(
+        computation_types.SequenceType(t1), computation_types.SequenceType(t3))
+
 
 class NamedTupleTypeWithPyContainerTypeTest(absltest.TestCase):
 
@@ -295,6 +326,16 @@ class FederatedTypeTest(absltest.TestCase):
     self.assertNotEqual(t1, t4)
     self.assertNotEqual(t1, t5)
 
+  def test_hash(self):
+    t1 = computation_types.FederatedType(tf.int32, placements.CLIENTS, False)
+    t2 = computation_types.FederatedType(tf.int32, placements.CLIENTS, False)
+    t3 = computation_types.FederatedType(tf.int32, placements.CLIENTS, True)
+    t4 = computation_types.FunctionType(t1, computation_types.SequenceType(t1))
+    t5 = computation_types.FunctionType(t2, computation_types.SequenceType(t2))
+    self.assertEqual(hash(t1), hash(t2))
+    self.assertEqual(hash(t4), hash(t5))
+    self.assertEqual(len(set([t1, t2, t3, t4, t5])), 3)
+
 
 class ToTypeTest(absltest.TestCase):
 
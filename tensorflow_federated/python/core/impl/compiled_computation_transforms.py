@@ -18,7 +18,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import six
 from six.moves import range
+from six.moves import zip
 
 import tensorflow as tf
 
@@ -30,6 +32,7 @@ from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.impl import computation_building_blocks
 from tensorflow_federated.python.core.impl import graph_utils
 from tensorflow_federated.python.core.impl import type_serialization
+from tensorflow_federated.python.core.impl import type_utils
 
 
 def select_graph_output(comp, name=None, index=None):
@@ -394,3 +397,315 @@ def pad_graph_inputs_to_match_type(comp, type_signature):
           result=proto.tensorflow.result))
 
   return computation_building_blocks.CompiledComputation(input_padded_proto)
+
+
+def compose_tensorflow_computations(outer, inner):
+  r"""Fuses two `CompiledComputation`s applied one after the other into one.
+
+  Given instances of `computation_building_blocks.CompiledComputation` `outer`
+  and `inner`, with type signatures (U -> V) and (T -> U') respectively, where
+  U is assignable from U', `compose_tensorflow_computations` returns a single
+  `CompiledComputation` with type signature (T -> V) that represents the logic
+  of calling `outer` on the result of calling `inner`. The graphs of the two
+  are imported into a single graph, in which the parameters of `outer` are
+  wired to the results of `inner`, so that the composition runs in a single
+  call to TensorFlow. This is necessary to transform the structure below:
+
+                                Call
+                               /    \
+                          Outer      Call
+                                    /    \
+                               Inner      Comp
+
+  into:
+
+                                       Call
+                                      /    \
+  compose_tensorflow_computations(...)      Comp
+
+  Args:
+    outer: Instance of `computation_building_blocks.CompiledComputation` to
+      apply to the result of `inner`.
+    inner: Instance of `computation_building_blocks.CompiledComputation` to
+      apply first.
+
+  Returns:
+    An instance of `computation_building_blocks.CompiledComputation` as
+    described.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types, or if the parameter of
+      `outer` is not assignable from the result of `inner`.
+    ValueError: If the parameter binding of `outer` does not have the same
+      structure as the result binding of `inner`, or if the initializers of
+      `outer` and `inner` cannot be run together (see
+      `can_compose_initialize_ops`).
+  """
+  py_typecheck.check_type(outer,
+                          computation_building_blocks.CompiledComputation)
+  py_typecheck.check_type(inner,
+                          computation_building_blocks.CompiledComputation)
+  outer_type = outer.type_signature
+  inner_type = inner.type_signature
+  if (outer_type.parameter is None or not type_utils.is_assignable_from(
+      outer_type.parameter, inner_type.result)):
+    raise TypeError(
+        'Cannot compose a computation of type {} with one of type {}.'.format(
+            str(outer_type), str(inner_type)))
+  if not can_compose_initialize_ops(outer, inner):
+    raise ValueError(
+        'Cannot compose a computation whose initializer reads its parameter '
+        'with one that has an initializer of its own.')
+  outer_proto = outer.proto.tensorflow
+  inner_proto = inner.proto.tensorflow
+  parameter_map = graph_utils.compute_map_from_bindings(outer_proto.parameter,
+                                                        inner_proto.result)
+  graph = tf.Graph()
+  with graph.as_default():
+    _import_graph_def(inner_proto, 'inner')
+    _import_graph_def(
+        outer_proto, 'outer', {
+            k: graph.get_tensor_by_name(_add_prefix('inner', v))
+            for k, v in six.iteritems(parameter_map)
+        })
+    initialize_op = _group_initialize_ops(graph, [('inner', inner_proto),
+                                                  ('outer', outer_proto)])
+  composed_proto = pb.Computation(
+      type=type_serialization.serialize_type(
+          computation_types.FunctionType(inner_type.parameter,
+                                         outer_type.result)),
+      tensorflow=pb.TensorFlow(
+          graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+          initialize_op=initialize_op,
+          parameter=(_add_prefix_to_binding('inner', inner_proto.parameter)
+                     if inner_type.parameter is not None else None),
+          result=_add_prefix_to_binding('outer', outer_proto.result)))
+  return computation_building_blocks.CompiledComputation(composed_proto)
+
+
+def can_compose_initialize_ops(outer, inner):
+  """Returns whether the initializers of `outer` and `inner` can be grouped.
+
+  The composition of two computations runs their initializers together, in no
+  particular order. If the initializer of `outer` reads its parameter (e.g., to
+  initialize a variable with it), it reads the result of `inner`, which may in
+  turn read the variables of `inner` before they are initialized. Such
+  computations are therefore not composed, unless `inner` has no initializer.
+
+  Args:
+    outer: Instance of `computation_building_blocks.CompiledComputation` to
+      apply to the result of `inner`.
+    inner: Instance of `computation_building_blocks.CompiledComputation` to
+      apply first.
+
+  Returns:
+    `True` if the initializers can be run together, and `False` otherwise.
+  """
+  py_typecheck.check_type(outer,
+                          computation_building_blocks.CompiledComputation)
+  py_typecheck.check_type(inner,
+                          computation_building_blocks.CompiledComputation)
+  outer_proto = outer.proto.tensorflow
+  if not outer_proto.initialize_op or not inner.proto.tensorflow.initialize_op:
+    return True
+  if outer.type_signature.parameter is None:
+    return True
+  parameter_ops = set(
+      _get_op_name(name) for name in
+      graph_utils.extract_tensor_names_from_binding(outer_proto.parameter))
+  graph_def = serialization_utils.unpack_graph_def(outer_proto.graph_def)
+  nodes = {node.name: node for node in graph_def.node}
+  visited = set()
+  pending = [_get_op_name(outer_proto.initialize_op)]
+  while pending:
+    name = pending.pop()
+    if name in parameter_ops:
+      return False
+    if name in visited or name not in nodes:
+      continue
+    visited.add(name)
+    pending.extend(_get_op_name(i) for i in nodes[name].input)
+  return True
+
+
+def _get_op_name(name):
+  """Returns the name of the op of a tensor or control input `name`."""
+  return name.lstrip('^').split(':')[0]
+
+
+def concatenate_tensorflow_computations(elements):
+  r"""Fuses `CompiledComputation`s called on the same argument into one.
+
+  Given a list of named instances of
+  `computation_building_blocks.CompiledComputation` with type signatures
+  (T -> U_1), ..., (T -> U_n), `concatenate_tensorflow_computations` returns a
+  single `CompiledComputation` with type signature (T -> <U_1, ..., U_n>)
+  (with the names of the elements) that represents the logic of calling each
+  of them on the same argument, in a single call to TensorFlow. This is
+  necessary to transform the structure below:
+
+                                Tuple
+                               / ... \
+                           Call       Call
+                          /    \     /    \
+                    Graph_1    Comp Graph_n    Comp
+
+  into:
+
+                                           Call
+                                          /    \
+  concatenate_tensorflow_computations(...)      Comp
+
+  Args:
+    elements: A non-empty list of pairs, each consisting of the name of an
+      element of the result (a string or `None`) and an instance of
+      `computation_building_blocks.CompiledComputation`. All of the
+      computations must declare the same parameter type (or none).
+
+  Returns:
+    An instance of `computation_building_blocks.CompiledComputation` as
+    described.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types, or if the computations
+      declare different parameter types.
+    ValueError: If `elements` is empty, or if the computations have parameter
+      bindings of different structures.
+  """
+  py_typecheck.check_type(elements, list)
+  if not elements:
+    raise ValueError('Expected at least one computation to concatenate.')
+  for name, comp in elements:
+    if name is not None:
+      py_typecheck.check_type(name, six.string_types)
+    py_typecheck.check_type(comp,
+                            computation_building_blocks.CompiledComputation)
+  parameter_type = elements[0][1].type_signature.parameter
+  for _, comp in elements[1:]:
+    if comp.type_signature.parameter != parameter_type:
+      raise TypeError(
+          'Can only concatenate computations with the same parameter type; '
+          'found {} and {}.'.format(
+              str(parameter_type), str(comp.type_signature.parameter)))
+  protos = [comp.proto.tensorflow for _, comp in elements]
+  prefixes = ['element_{}'.format(idx) for idx in range(len(elements))]
+  graph = tf.Graph()
+  with graph.as_default():
+    _import_graph_def(protos[0], prefixes[0])
+    for prefix, proto in zip(prefixes[1:], protos[1:]):
+      if parameter_type is None:
+        input_map = None
+      else:
+        parameter_map = graph_utils.compute_map_from_bindings(
+            proto.parameter, protos[0].parameter)
+        input_map = {
+            k: graph.get_tensor_by_name(_add_prefix(prefixes[0], v))
+            for k, v in six.iteritems(parameter_map)
+        }
+      _import_graph_def(proto, prefix, input_map)
+    initialize_op = _group_initialize_ops(graph, list(zip(prefixes, protos)))
+  result_type = computation_types.NamedTupleType([
+      (name, comp.type_signature.result) for name, comp in elements
+  ])
+  result_binding = pb.TensorFlow.Binding(
+      tuple=pb.TensorFlow.NamedTupleBinding(element=[
+          _add_prefix_to_binding(prefix, proto.result)
+          for prefix, proto in zip(prefixes, protos)
+      ]))
+  concatenated_proto = pb.Computation(
+      type=type_serialization.serialize_type(
+          computation_types.FunctionType(parameter_type, result_type)),
+      tensorflow=pb.TensorFlow(
+          graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+          initialize_op=initialize_op,
+          parameter=(_add_prefix_to_binding(prefixes[0], protos[0].parameter)
+                     if parameter_type is not None else None),
+          result=result_binding))
+  return computation_building_blocks.CompiledComputation(concatenated_proto)
+
+
+def _add_prefix(prefix, name):
+  """Returns the name that `name` gets when imported with `prefix`."""
+  return '{}/{}'.format(prefix, name)
+
+
+def _import_graph_def(tensorflow_proto, prefix, input_map=None):
+  """Imports the graph of `tensorflow_proto` into the default graph.
+
+  Args:
+    tensorflow_proto: An instance of `pb.TensorFlow`.
+    prefix: The prefix to add to the names of all imported nodes.
+    input_map: An optional dictionary from the names of tensors in the graph of
+      `tensorflow_proto` to the tensors in the default graph to replace them
+      with.
+  """
+  tf.graph_util.import_graph_def(
+      serialization_utils.unpack_graph_def(tensorflow_proto.graph_def),
+      input_map=input_map,
+      name=prefix)
+
+
+def _group_initialize_ops(graph, prefixes_and_protos):
+  """Returns the name of an op that runs the initializers of imported graphs.
+
+  Args:
+    graph: The graph into which the graphs have been imported.
+    prefixes_and_protos: A list of pairs, each consisting of the prefix with
+      which a graph has been imported, and the instance of `pb.TensorFlow` it
+      has been imported from.
+
+  Returns:
+    The name of the op, or `None` if none of the graphs has an initializer.
+  """
+  initialize_ops = [
+      graph.get_operation_by_name(_add_prefix(prefix, proto.initialize_op))
+      for prefix, proto in prefixes_and_protos
+      if proto.initialize_op
+  ]
+  if not initialize_ops:
+    return None
+  with graph.as_default():
+    return tf.group(*initialize_ops, name='grouped_initialize_ops').name
+
+
+def _add_prefix_to_binding(prefix, binding):
+  """Returns a copy of `binding` with names of tensors prefixed by `prefix`.
+
+  Args:
+    prefix: The prefix with which the graph `binding` refers to was imported.
+    binding: An instance of `pb.TensorFlow.Binding`.
+
+  Returns:
+    An instance of `pb.TensorFlow.Binding` with the structure of `binding`.
+
+  Raises:
+    ValueError: If the binding is of an unsupported kind.
+  """
+  binding_oneof = binding.WhichOneof('binding')
+  if binding_oneof == 'tensor':
+    return pb.TensorFlow.Binding(
+        tensor=pb.TensorFlow.TensorBinding(
+            tensor_name=_add_prefix(prefix, binding.tensor.tensor_name)))
+  elif binding_oneof == 'sequence':
+    sequence_oneof = binding.sequence.WhichOneof('binding')
+    if sequence_oneof == 'variant_tensor_name':
+      return pb.TensorFlow.Binding(
+          sequence=pb.TensorFlow.SequenceBinding(
+              variant_tensor_name=_add_prefix(
+                  prefix, binding.sequence.variant_tensor_name)))
+    elif sequence_oneof == 'iterator_string_handle_name':
+      # TODO(b/129956296): Eventually delete this deprecated code path.
+      return pb.TensorFlow.Binding(
+          sequence=pb.TensorFlow.SequenceBinding(
+              iterator_string_handle_name=_add_prefix(
+                  prefix, binding.sequence.iterator_string_handle_name)))
+    else:
+      raise ValueError('Unsupported sequence binding {}'.format(sequence_oneof))
+  elif binding_oneof == 'tuple':
+    return pb.TensorFlow.Binding(
+        tuple=pb.TensorFlow.NamedTupleBinding(element=[
+            _add_prefix_to_binding(prefix, e) for e in binding.tuple.element
+        ]))
+  else:
+    raise ValueError(
+        'Unsupported type of binding \'{}\'.'.format(binding_oneof))
@@ -473,5 +473,124 @@ class GraphInputPaddingTest(test.TestCase):
     self.assertEqual(executable_padded_inputs([1, 10.]), expected_result)
 
 
+class ComposeTensorFlowComputationsTest(test.TestCase):
+
+  def test_compose_tensorflow_computations_raises_on_none(self):
+    foo = _create_compiled_computation(lambda x: x, tf.int32)
+    with self.assertRaises(TypeError):
+      compiled_computation_transforms.compose_tensorflow_computations(foo, None)
+    with self.assertRaises(TypeError):
+      compiled_computation_transforms.compose_tensorflow_computations(None, foo)
+
+  def test_compose_tensorflow_computations_raises_on_mismatched_types(self):
+    foo = _create_compiled_computation(lambda x: x, tf.int32)
+    bar = _create_compiled_computation(lambda x: x, tf.float32)
+    with self.assertRaises(TypeError):
+      compiled_computation_transforms.compose_tensorflow_computations(foo, bar)
+
+  def test_compose_tensorflow_computations_has_correct_type_signature(self):
+    outer = _create_compiled_computation(lambda x: tf.cast(x, tf.float32) * 2.,
+                                         tf.int32)
+    inner = _create_compiled_computation(lambda x: x[0] + x[1],
+                                         [tf.int32, tf.int32])
+    composed = compiled_computation_transforms.compose_tensorflow_computations(
+        outer, inner)
+    self.assertIsInstance(composed,
+                          computation_building_blocks.CompiledComputation)
+    self.assertEqual(
+        str(composed.type_signature), '(<int32,int32> -> float32)')
+
+  def test_compose_tensorflow_computations_executes_correctly(self):
+    outer = _create_compiled_computation(lambda x: tf.cast(x, tf.float32) * 2.,
+                                         tf.int32)
+    inner = _create_compiled_computation(lambda x: x[0] + x[1],
+                                         [tf.int32, tf.int32])
+    composed = compiled_computation_transforms.compose_tensorflow_computations(
+        outer, inner)
+    executable_composed = _to_computation_impl(composed)
+    self.assertEqual(executable_composed([1, 2]), 6.)
+
+  def test_compose_tensorflow_computations_with_no_arg_and_variables(self):
+
+    def _make_constant():
+      v = tf.Variable(10, name='v')
+      return v + 1
+
+    inner = _create_compiled_computation(_make_constant, None)
+    outer = _create_compiled_computation(lambda x: x * 3, tf.int32)
+    composed = compiled_computation_transforms.compose_tensorflow_computations(
+        outer, inner)
+    self.assertEqual(str(composed.type_signature), '( -> int32)')
+    self.assertEqual(_to_computation_impl(composed)(), 33)
+
+
+  def test_compose_tensorflow_computations_raises_on_initializer_reading_arg(
+      self):
+
+    def _read_variable(x):
+      v = tf.Variable(10, name='v')
+      return v + x
+
+    def _initialize_variable_with_arg(x):
+      v = tf.Variable(x, name='v')
+      return v * 3
+
+    inner = _create_compiled_computation(_read_variable, tf.int32)
+    outer = _create_compiled_computation(_initialize_variable_with_arg,
+                                         tf.int32)
+    self.assertFalse(
+        compiled_computation_transforms.can_compose_initialize_ops(
+            outer, inner))
+    with self.assertRaises(ValueError):
+      compiled_computation_transforms.compose_tensorflow_computations(
+          outer, inner)
+
+  def test_compose_tensorflow_computations_with_initializer_reading_arg(self):
+
+    def _initialize_variable_with_arg(x):
+      v = tf.Variable(x, name='v')
+      return v * 3
+
+    inner = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    outer = _create_compiled_computation(_initialize_variable_with_arg,
+                                         tf.int32)
+    self.assertTrue(
+        compiled_computation_transforms.can_compose_initialize_ops(
+            outer, inner))
+    composed = compiled_computation_transforms.compose_tensorflow_computations(
+        outer, inner)
+    self.assertEqual(_to_computation_impl(composed)(1), 6)
+
+class ConcatenateTensorFlowComputationsTest(test.TestCase):
+
+  def test_concatenate_tensorflow_computations_raises_on_empty_list(self):
+    with self.assertRaises(ValueError):
+      compiled_computation_transforms.concatenate_tensorflow_computations([])
+
+  def test_concatenate_tensorflow_computations_raises_on_different_params(
+      self):
+    foo = _create_compiled_computation(lambda x: x, tf.int32)
+    bar = _create_compiled_computation(lambda x: x, tf.float32)
+    with self.assertRaises(TypeError):
+      compiled_computation_transforms.concatenate_tensorflow_computations([
+          ('a', foo), ('b', bar)
+      ])
+
+  def test_concatenate_tensorflow_computations_executes_correctly(self):
+    foo = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    bar = _create_compiled_computation(lambda x: tf.cast(x, tf.float32) / 2.,
+                                       tf.int32)
+    concatenated = (
+        compiled_computation_transforms.concatenate_tensorflow_computations([
+            ('a', foo), (None, bar)
+        ]))
+    self.assertEqual(
+        str(concatenated.type_signature), '(int32 -> <a=int32,float32>)')
+    executable_concatenated = _to_computation_impl(concatenated)
+    self.assertEqual(
+        executable_concatenated(5),
+        anonymous_tuple.AnonymousTuple([('a', 6), (None, 2.5)]))
+
+
 if __name__ == '__main__':
   test.main()
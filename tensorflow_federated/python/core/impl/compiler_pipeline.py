@@ -18,6 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import functools
+import time
+
 import six
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -27,30 +31,111 @@ from tensorflow_federated.python.core.impl import computation_building_blocks
 from tensorflow_federated.python.core.impl import computation_impl
 from tensorflow_federated.python.core.impl import context_stack_base
 from tensorflow_federated.python.core.impl import intrinsic_bodies
+from tensorflow_federated.python.core.impl import transformation_utils
 from tensorflow_federated.python.core.impl import transformations
 
+# Only replaces intrinsics with their bodies.
+NO_OPTIMIZATION = 0
+
+# Additionally merges adjacent TensorFlow computations.
+DEFAULT_OPTIMIZATION = 1
+
+# Additionally simplifies the structure of the computation with the rules in
+# `transformations.SIMPLIFICATION_RULES`, and eliminates common subexpressions,
+# before merging TensorFlow.
+FULL_OPTIMIZATION = 2
+
+
+class PassStats(object):
+  """Counters that describe the work done by a single compiler pass.
+
+  Attributes:
+    runs: The number of times the pass has been run.
+    modified_runs: The number of those runs that modified the computation.
+    total_seconds: The total time spent running the pass, in seconds.
+    nodes_removed: The total number of building blocks removed from the
+      computations by the pass (negative if the pass added building blocks).
+  """
+
+  def __init__(self):
+    self.runs = 0
+    self.modified_runs = 0
+    self.total_seconds = 0.0
+    self.nodes_removed = 0
+
+  def __str__(self):
+    return ('PassStats(runs={}, modified_runs={}, total_seconds={:.6f}, '
+            'nodes_removed={})'.format(self.runs, self.modified_runs,
+                                       self.total_seconds, self.nodes_removed))
+
 
 class CompilerPipeline(object):
   """The compiler pipeline.
 
   This pipeline will eventually be made configurable, and driven largely by what
   the targeted backend can support. The set of conversions that are currently
-  being performed is fixed, and includes the following:
+  being performed is determined by the optimization level, and includes the
+  following:
 
   1. Replacing occurrences of a subset of intrinsics with their definitions in
      terms of other intrinsics, as defined in `intrinsic_bodies.py`.
+  2. At `FULL_OPTIMIZATION`, simplifying the structure of the computation by
+     applying the rules in `transformations.SIMPLIFICATION_RULES` until none of
+     them applies, e.g., replacing called lambdas with blocks, removing mapped
+     identities, and fusing chained federated maps. The rules are applied in a
+     single traversal of the computation.
+  3. At `FULL_OPTIMIZATION`, binding the subexpressions that are repeated in the
+     computation to locals, so that each of them is computed only once.
+  4. At `DEFAULT_OPTIMIZATION` and above, merging adjacent TensorFlow
+     computations into single compiled computations, as defined in
+     `transformations.py`, so that they can be run by the backend in a single
+     call to TensorFlow.
+
+  The pipeline keeps statistics on each of the passes it runs, and on the number
+  of times each of the simplification rules has been applied, accumulated over
+  all the computations it compiles, in `pass_stats` and `rewrite_counts`.
   """
 
-  def __init__(self, context_stack):
+  def __init__(self, context_stack, optimization_level=DEFAULT_OPTIMIZATION):
     """Constructs this pipeline with the given dictionary of intrinsic bodies.
 
     Args:
       context_stack: The context stack to use.
+      optimization_level: One of `NO_OPTIMIZATION`, `DEFAULT_OPTIMIZATION` or
+        `FULL_OPTIMIZATION`.
+
+    Raises:
+      ValueError: If `optimization_level` is not one of the above.
     """
     py_typecheck.check_type(context_stack, context_stack_base.ContextStack)
+    py_typecheck.check_type(optimization_level, int)
+    if optimization_level not in (NO_OPTIMIZATION, DEFAULT_OPTIMIZATION,
+                                  FULL_OPTIMIZATION):
+      raise ValueError(
+          'Unknown optimization level {}.'.format(optimization_level))
     self._context_stack = context_stack
     self._intrinsic_bodies = intrinsic_bodies.get_intrinsic_bodies(
         context_stack)
+    self._optimization_level = optimization_level
+    self._pass_stats = collections.OrderedDict()
+    self._rewrite_counts = collections.Counter()
+
+  @property
+  def optimization_level(self):
+    return self._optimization_level
+
+  @property
+  def pass_stats(self):
+    """Returns an `OrderedDict` from the names of passes to their `PassStats`.
+
+    The passes are listed in the order in which they were first run.
+    """
+    return self._pass_stats
+
+  @property
+  def rewrite_counts(self):
+    """Returns a `Counter` from the names of simplification rules to uses."""
+    return self._rewrite_counts
 
   def compile(self, computation_to_compile):
     """Compiles `computation_to_compile`.
@@ -75,19 +160,85 @@ class CompilerPipeline(object):
     py_typecheck.check_type(computation_proto, pb.Computation)
     comp = computation_building_blocks.ComputationBuildingBlock.from_proto(
         computation_proto)
+    node_count = [None]
 
     # Replace intrinsics with their bodies, for now manually in a fixed order.
     # TODO(b/113123410): Replace this with a more automated implementation that
     # does not rely on manual maintenance.
     for uri, body in six.iteritems(self._intrinsic_bodies):
-      comp, _ = transformations.replace_intrinsic_with_callable(
-          comp, uri, body, self._context_stack)
+      replace_intrinsic = functools.partial(
+          transformations.replace_intrinsic_with_callable,
+          uri=uri,
+          body=body,
+          context_stack=self._context_stack)
+      comp, _ = self._run_pass('replace_intrinsic_with_callable',
+                               replace_intrinsic, comp, node_count)
+
+    if self._optimization_level >= FULL_OPTIMIZATION:
+      change_log = []
+      simplify = functools.partial(
+          transformation_utils.transform_postorder_with_rules,
+          rules=transformations.SIMPLIFICATION_RULES,
+          change_log=change_log)
+      comp, _ = self._run_pass('simplify', simplify, comp, node_count)
+      self._rewrite_counts.update(name for name, _, _ in change_log)
+      comp, _ = self._run_pass('eliminate_common_subexpressions',
+                               transformations.eliminate_common_subexpressions,
+                               comp, node_count)
+
+    if self._optimization_level >= DEFAULT_OPTIMIZATION:
+      comp, _ = self._run_pass('merge_tensorflow_computations',
+                               transformations.merge_tensorflow_computations,
+                               comp, node_count)
 
     # TODO(b/113123410): Add more transformations to simplify and optimize the
     # structure, e.g., such as:
-    # * removing unnecessary lambdas,
     # * flatteting the structure,
-    # * merging TensorFlow blocks where appropriate,
     # * ...and so on.
 
     return computation_impl.ComputationImpl(comp.proto, self._context_stack)
+
+  def _run_pass(self, name, fn, comp, node_count):
+    """Runs the pass `fn` on `comp`, and records it in `pass_stats`.
+
+    Args:
+      name: The name under which to record the pass.
+      fn: A function that takes a building block and returns a tuple of the
+        transformed building block and whether it was modified.
+      comp: The building block to run the pass on.
+      node_count: A single-element list holding the number of building blocks
+        in `comp`, or `None` if not yet counted. Updated with the number in the
+        returned building block. The building blocks are only counted when a
+        pass modifies the computation.
+
+    Returns:
+      The result of `fn`.
+    """
+    stats = self._pass_stats.get(name)
+    if stats is None:
+      stats = PassStats()
+      self._pass_stats[name] = stats
+    start_time = time.time()
+    transformed_comp, modified = fn(comp)
+    stats.total_seconds += time.time() - start_time
+    stats.runs += 1
+    if modified:
+      stats.modified_runs += 1
+      if node_count[0] is None:
+        node_count[0] = _count_nodes(comp)
+      new_node_count = _count_nodes(transformed_comp)
+      stats.nodes_removed += node_count[0] - new_node_count
+      node_count[0] = new_node_count
+    return transformed_comp, modified
+
+
+def _count_nodes(comp):
+  """Returns the number of building blocks in the tree rooted at `comp`."""
+  count = [0]
+
+  def _count(comp):
+    count[0] += 1
+    return comp, False
+
+  transformation_utils.transform_postorder(comp, _count)
+  return count[0]
@@ -67,6 +67,56 @@ class CompilerPipelineTest(absltest.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def test_raises_on_unknown_optimization_level(self):
+    with self.assertRaises(ValueError):
+      compiler_pipeline.CompilerPipeline(
+          context_stack_impl.context_stack, optimization_level=3)
+
+  def test_full_optimization_removes_mapped_identity_and_records_stats(self):
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def foo(x):
+      return intrinsics.federated_map(
+          computations.federated_computation(lambda y: y, tf.int32), x)
+
+    pipeline = compiler_pipeline.CompilerPipeline(
+        context_stack_impl.context_stack,
+        optimization_level=compiler_pipeline.FULL_OPTIMIZATION)
+
+    compiled_foo = pipeline.compile(foo)
+
+    def _not_federated_map(x):
+      if isinstance(x, computation_building_blocks.Intrinsic):
+        self.assertNotEqual(x.uri, intrinsic_defs.FEDERATED_MAP.uri)
+      return x, False
+
+    transformation_utils.transform_postorder(
+        computation_building_blocks.ComputationBuildingBlock.from_proto(
+            computation_impl.ComputationImpl.get_proto(compiled_foo)),
+        _not_federated_map)
+    stats = pipeline.pass_stats['simplify']
+    self.assertEqual(stats.runs, 1)
+    self.assertEqual(stats.modified_runs, 1)
+    self.assertGreater(stats.nodes_removed, 0)
+    self.assertEqual(
+        pipeline.rewrite_counts['remove_mapped_or_applied_identity'], 1)
+
+  def test_no_optimization_runs_only_intrinsic_replacement(self):
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    pipeline = compiler_pipeline.CompilerPipeline(
+        context_stack_impl.context_stack,
+        optimization_level=compiler_pipeline.NO_OPTIMIZATION)
+    pipeline.compile(foo)
+
+    self.assertEqual(
+        list(pipeline.pass_stats.keys()), ['replace_intrinsic_with_callable'])
+
 
 if __name__ == '__main__':
   absltest.main()
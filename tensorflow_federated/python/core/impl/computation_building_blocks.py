@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import abc
+import hashlib
 import zlib
 
 import six
@@ -29,6 +30,7 @@ from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import typed_object
 from tensorflow_federated.python.core.impl import placement_literals
+from tensorflow_federated.python.core.impl import tensorflow_deserialization
 from tensorflow_federated.python.core.impl import type_serialization
 from tensorflow_federated.python.core.impl import type_utils
 
@@ -57,11 +59,19 @@ class ComputationBuildingBlock(typed_object.TypedObject):
   _deserializer_dict = None  # Defined at the end of this file.
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     """Returns an instance of a derived class based on 'computation_proto'.
 
+    The computation is deserialized in a single pass. The type declared in the
+    proto is checked against the type derived from the structure of the
+    computation only at the root, unless `strict` is set, in which case it is
+    checked at every node (e.g., to pinpoint the node at fault when debugging
+    a malformed proto).
+
     Args:
       computation_proto: An instance of pb.Computation.
+      strict: Whether to check the declared types of all nested computations,
+        rather than only that of the root.
 
     Returns:
       An instance of a class that implements 'ComputationBuildingBlock' and
@@ -73,22 +83,10 @@ class ComputationBuildingBlock(typed_object.TypedObject):
       ValueError: if deserialization failed due to the argument being invalid.
     """
     py_typecheck.check_type(computation_proto, pb.Computation)
-    computation_oneof = computation_proto.WhichOneof('computation')
-    deserializer = cls._deserializer_dict.get(computation_oneof)
-    if deserializer is not None:
-      deserialized = deserializer(computation_proto)
-      type_spec = type_serialization.deserialize_type(computation_proto.type)
-      if not type_utils.are_equivalent_types(deserialized.type_signature,
-                                             type_spec):
-        raise ValueError(
-            'The type {} derived from the computation structure does not '
-            'match the type {} declared in its signature'.format(
-                str(deserialized.type_signature), str(type_spec)))
-      return deserialized
-    else:
-      raise NotImplementedError(
-          'Deserialization for computations of type {} has not been '
-          'implemented yet.'.format(computation_oneof))
+    deserialized = _deserialize_computation(computation_proto, strict)
+    if not strict:
+      _check_declared_type(deserialized, computation_proto)
+    return deserialized
 
   def __init__(self, type_spec):
     """Constructs a computation building block with the given TFF type.
@@ -105,9 +103,26 @@ class ComputationBuildingBlock(typed_object.TypedObject):
   def type_signature(self):
     return self._type_signature
 
-  @abc.abstractproperty
+  @property
   def proto(self):
-    """Returns a serialized form of this object as a pb.Computation instance."""
+    """Returns a serialized form of this object as a pb.Computation instance.
+
+    The proto is built anew on each access, in a single pass that writes the
+    serialized forms of all the descendants directly into it, so the caller
+    owns the result and is free to modify it. The only exception is
+    `CompiledComputation`, which returns the proto it embeds.
+    """
+    computation_proto = pb.Computation()
+    self._serialize_into(computation_proto)
+    return computation_proto
+
+  @abc.abstractmethod
+  def _serialize_into(self, computation_proto):
+    """Writes the serialized form of this object into `computation_proto`.
+
+    Args:
+      computation_proto: An empty instance of pb.Computation to populate.
+    """
     raise NotImplementedError
 
   @abc.abstractproperty
@@ -115,8 +130,23 @@ class ComputationBuildingBlock(typed_object.TypedObject):
     """Returns the representation of the instance using TFF syntax."""
     pass
 
-  # TODO(b/113112885): Add memoization after identifying a suitable externally
-  # available standard library that works in Python 2/3.
+  def _write_tff_repr(self, parts):
+    """Appends the pieces of the representation in TFF syntax to `parts`.
+
+    Building blocks with children override this to write the representations
+    of the children directly into `parts`, so that, like the proto, the
+    representation of a computation is built in a single pass, in time linear
+    in its size, and is not retained by any of the building blocks.
+
+    Args:
+      parts: The list of strings to append to.
+    """
+    parts.append(self.tff_repr)
+
+  def _build_tff_repr(self):
+    parts = []
+    self._write_tff_repr(parts)
+    return ''.join(parts)
 
   @abc.abstractmethod
   def __repr__(self):
@@ -142,7 +172,8 @@ class Reference(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
+    del strict  # Unused, there are no nested computations.
     _check_computation_oneof(computation_proto, 'reference')
     return cls(
         str(computation_proto.reference.name),
@@ -167,11 +198,10 @@ class Reference(ComputationBuildingBlock):
     self._name = name
     self._context = context
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        reference=pb.Reference(name=self._name))
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    computation_proto.reference.name = self._name
 
   @property
   def name(self):
@@ -203,10 +233,10 @@ class Selection(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     _check_computation_oneof(computation_proto, 'selection')
-    selection = ComputationBuildingBlock.from_proto(
-        computation_proto.selection.source)
+    selection = _deserialize_computation(computation_proto.selection.source,
+                                         strict)
     selection_oneof = computation_proto.selection.WhichOneof('selection')
     if selection_oneof == 'name':
       return cls(selection, name=str(computation_proto.selection.name))
@@ -271,15 +301,17 @@ class Selection(ComputationBuildingBlock):
             'valid range 0..{} determined by the source type '
             'signature.'.format(index, str(len(elements) - 1)))
 
-  @property
-  def proto(self):
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    # pylint: disable=protected-access
+    selection = computation_proto.selection
+    self._source._serialize_into(selection.source)
     if self._name is not None:
-      selection = pb.Selection(source=self._source.proto, name=self._name)
+      selection.name = self._name
     else:
-      selection = pb.Selection(source=self._source.proto, index=self._index)
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        selection=selection)
+      selection.index = self._index
+    # pylint: enable=protected-access
 
   @property
   def source(self):
@@ -295,10 +327,14 @@ class Selection(ComputationBuildingBlock):
 
   @property
   def tff_repr(self):
+    return self._build_tff_repr()
+
+  def _write_tff_repr(self, parts):
+    self._source._write_tff_repr(parts)
     if self._name is not None:
-      return '{}.{}'.format(str(self._source), self._name)
+      parts.append('.{}'.format(self._name))
     else:
-      return '{}[{}]'.format(str(self._source), self._index)
+      parts.append('[{}]'.format(self._index))
 
   def __repr__(self):
     if self._name is not None:
@@ -322,10 +358,10 @@ class Tuple(ComputationBuildingBlock, anonymous_tuple.AnonymousTuple):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     _check_computation_oneof(computation_proto, 'tuple')
     return cls([(str(e.name) if e.name else None,
-                 ComputationBuildingBlock.from_proto(e.value))
+                 _deserialize_computation(e.value, strict))
                 for e in computation_proto.tuple.element])
 
   def __init__(self, elements):
@@ -365,22 +401,31 @@ class Tuple(ComputationBuildingBlock, anonymous_tuple.AnonymousTuple):
         ]))
     anonymous_tuple.AnonymousTuple.__init__(self, elements)
 
-  @property
-  def proto(self):
-    elements = []
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    # pylint: disable=protected-access
+    computation_proto.tuple.SetInParent()
     for k, v in anonymous_tuple.to_elements(self):
+      element = computation_proto.tuple.element.add()
       if k is not None:
-        element = pb.Tuple.Element(name=k, value=v.proto)
-      else:
-        element = pb.Tuple.Element(value=v.proto)
-      elements.append(element)
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        tuple=pb.Tuple(element=elements))
+        element.name = k
+      v._serialize_into(element.value)
+    # pylint: enable=protected-access
 
   @property
   def tff_repr(self):
-    return anonymous_tuple.AnonymousTuple.__str__(self)
+    return self._build_tff_repr()
+
+  def _write_tff_repr(self, parts):
+    parts.append('<')
+    for idx, (name, value) in enumerate(anonymous_tuple.to_elements(self)):
+      if idx:
+        parts.append(',')
+      if name is not None:
+        parts.append('{}='.format(name))
+      value._write_tff_repr(parts)
+    parts.append('>')
 
   def __repr__(self):
     return 'Tuple([{}])'.format(', '.join(
@@ -402,12 +447,12 @@ class Call(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     _check_computation_oneof(computation_proto, 'call')
-    fn = ComputationBuildingBlock.from_proto(computation_proto.call.function)
+    fn = _deserialize_computation(computation_proto.call.function, strict)
     arg_proto = computation_proto.call.argument
     if arg_proto.WhichOneof('computation') is not None:
-      arg = ComputationBuildingBlock.from_proto(arg_proto)
+      arg = _deserialize_computation(arg_proto, strict)
     else:
       arg = None
     return cls(fn, arg)
@@ -452,15 +497,15 @@ class Call(ComputationBuildingBlock):
     self._function = fn
     self._argument = arg
 
-  @property
-  def proto(self):
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    # pylint: disable=protected-access
+    call = computation_proto.call
+    self._function._serialize_into(call.function)
     if self._argument is not None:
-      call = pb.Call(
-          function=self._function.proto, argument=self._argument.proto)
-    else:
-      call = pb.Call(function=self._function.proto)
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature), call=call)
+      self._argument._serialize_into(call.argument)
+    # pylint: enable=protected-access
 
   @property
   def function(self):
@@ -472,10 +517,14 @@ class Call(ComputationBuildingBlock):
 
   @property
   def tff_repr(self):
+    return self._build_tff_repr()
+
+  def _write_tff_repr(self, parts):
+    self._function._write_tff_repr(parts)
+    parts.append('(')
     if self._argument is not None:
-      return '{}({})'.format(str(self._function), str(self._argument))
-    else:
-      return '{}()'.format(str(self._function))
+      self._argument._write_tff_repr(parts)
+    parts.append(')')
 
   def __repr__(self):
     if self._argument is not None:
@@ -494,14 +543,14 @@ class Lambda(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     _check_computation_oneof(computation_proto, 'lambda')
     the_lambda = getattr(computation_proto, 'lambda')
     return cls(
         str(the_lambda.parameter_name),
         type_serialization.deserialize_type(
             computation_proto.type.function.parameter),
-        ComputationBuildingBlock.from_proto(the_lambda.result))
+        _deserialize_computation(the_lambda.result, strict))
 
   def __init__(self, parameter_name, parameter_type, result):
     """Creates a lambda expression.
@@ -530,16 +579,14 @@ class Lambda(ComputationBuildingBlock):
     self._parameter_type = parameter_type
     self._result = result
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        **{
-            'lambda':
-                pb.Lambda(
-                    parameter_name=self._parameter_name,
-                    result=self._result.proto)
-        })
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    # pylint: disable=protected-access
+    lambda_proto = getattr(computation_proto, 'lambda')
+    lambda_proto.parameter_name = self._parameter_name
+    self._result._serialize_into(lambda_proto.result)
+    # pylint: enable=protected-access
 
   @property
   def parameter_name(self):
@@ -555,7 +602,12 @@ class Lambda(ComputationBuildingBlock):
 
   @property
   def tff_repr(self):
-    return '({} -> {})'.format(self._parameter_name, str(self._result))
+    return self._build_tff_repr()
+
+  def _write_tff_repr(self, parts):
+    parts.append('({} -> '.format(self._parameter_name))
+    self._result._write_tff_repr(parts)
+    parts.append(')')
 
   def __repr__(self):
     return ('Lambda(\'{}\', {}, {})'.format(self._parameter_name,
@@ -605,12 +657,11 @@ class Block(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
     _check_computation_oneof(computation_proto, 'block')
-    return cls([(str(loc.name), ComputationBuildingBlock.from_proto(loc.value))
+    return cls([(str(loc.name), _deserialize_computation(loc.value, strict))
                 for loc in computation_proto.block.local],
-               ComputationBuildingBlock.from_proto(
-                   computation_proto.block.result))
+               _deserialize_computation(computation_proto.block.result, strict))
 
   def __init__(self, local_symbols, result):
     """Creates a block of TFF code.
@@ -644,18 +695,17 @@ class Block(ComputationBuildingBlock):
     self._locals = updated_locals
     self._result = result
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        block=pb.Block(
-            **{
-                'local': [
-                    pb.Block.Local(name=k, value=v.proto)
-                    for k, v in self._locals
-                ],
-                'result': self._result.proto
-            }))
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    # pylint: disable=protected-access
+    block = computation_proto.block
+    for k, v in self._locals:
+      local = block.local.add()
+      local.name = k
+      v._serialize_into(local.value)
+    self._result._serialize_into(block.result)
+    # pylint: enable=protected-access
 
   @property
   def locals(self):
@@ -667,9 +717,18 @@ class Block(ComputationBuildingBlock):
 
   @property
   def tff_repr(self):
-    return ('(let {} in {})'.format(
-        ','.join('{}={}'.format(k, str(v)) for k, v in self._locals),
-        str(self._result)))
+    return self._build_tff_repr()
+
+  def _write_tff_repr(self, parts):
+    parts.append('(let ')
+    for idx, (name, value) in enumerate(self._locals):
+      if idx:
+        parts.append(',')
+      parts.append('{}='.format(name))
+      value._write_tff_repr(parts)
+    parts.append(' in ')
+    self._result._write_tff_repr(parts)
+    parts.append(')')
 
   def __repr__(self):
     return ('Block([{}], {})'.format(
@@ -689,7 +748,8 @@ class Intrinsic(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
+    del strict  # Unused, there are no nested computations.
     _check_computation_oneof(computation_proto, 'intrinsic')
     return cls(computation_proto.intrinsic.uri,
                type_serialization.deserialize_type(computation_proto.type))
@@ -713,11 +773,10 @@ class Intrinsic(ComputationBuildingBlock):
     super(Intrinsic, self).__init__(type_spec)
     self._uri = uri
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        intrinsic=pb.Intrinsic(uri=self._uri))
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    computation_proto.intrinsic.uri = self._uri
 
   @property
   def uri(self):
@@ -740,7 +799,8 @@ class Data(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
+    del strict  # Unused, there are no nested computations.
     _check_computation_oneof(computation_proto, 'data')
     return cls(computation_proto.data.uri,
                type_serialization.deserialize_type(computation_proto.type))
@@ -767,11 +827,10 @@ class Data(ComputationBuildingBlock):
     super(Data, self).__init__(type_spec)
     self._uri = uri
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        data=pb.Data(uri=self._uri))
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    computation_proto.data.uri = self._uri
 
   @property
   def uri(self):
@@ -818,11 +877,58 @@ class CompiledComputation(ComputationBuildingBlock):
     else:
       self._name = '{:x}'.format(
           zlib.adler32(six.b(repr(self._proto))) & 0xFFFFFFFF)
+    self._fingerprint = None
+    self._deserialization_plan = None
 
   @property
   def proto(self):
+    """Returns the embedded pb.Computation instance.
+
+    Unlike for other building blocks, the proto is not copied, since it may
+    contain a large serialized graph, so it must not be modified, or else the
+    cached `fingerprint` and `deserialization_plan` go out of sync with it.
+    """
     return self._proto
 
+  def _serialize_into(self, computation_proto):
+    computation_proto.CopyFrom(self._proto)
+
+  @property
+  def fingerprint(self):
+    """A string that identifies the content of this computation.
+
+    Unlike the name, which is only used for debugging and may differ between
+    occurrences of the same computation, the fingerprint is a hash of the
+    serialized proto (i.e., of the type signature and, e.g., the serialized
+    graph), so any two compiled computations with identical content share the
+    same fingerprint. It is computed on first access.
+
+    Returns:
+      The hexadecimal SHA-256 digest of the serialized proto.
+    """
+    if self._fingerprint is None:
+      self._fingerprint = hashlib.sha256(
+          self._proto.SerializeToString(deterministic=True)).hexdigest()
+    return self._fingerprint
+
+  @property
+  def deserialization_plan(self):
+    """The plan to stamp this TensorFlow computation into graphs.
+
+    The plan is derived from the proto on first access, and then reused by all
+    callers that stamp this computation, e.g., each time it is run.
+
+    Returns:
+      An instance of `tensorflow_deserialization.DeserializationPlan`.
+
+    Raises:
+      ValueError: If this is not a TensorFlow computation.
+    """
+    if self._deserialization_plan is None:
+      self._deserialization_plan = (
+          tensorflow_deserialization.DeserializationPlan(self._proto))
+    return self._deserialization_plan
+
   @property
   def tff_repr(self):
     return 'comp#{}'.format(self._name)
@@ -839,7 +945,8 @@ class Placement(ComputationBuildingBlock):
   """
 
   @classmethod
-  def from_proto(cls, computation_proto):
+  def from_proto(cls, computation_proto, strict=False):
+    del strict  # Unused, there are no nested computations.
     _check_computation_oneof(computation_proto, 'placement')
     py_typecheck.check_type(
         type_serialization.deserialize_type(computation_proto.type),
@@ -861,11 +968,10 @@ class Placement(ComputationBuildingBlock):
     super(Placement, self).__init__(computation_types.PlacementType())
     self._literal = literal
 
-  @property
-  def proto(self):
-    return pb.Computation(
-        type=type_serialization.serialize_type(self.type_signature),
-        placement=pb.Placement(uri=self._literal.uri))
+  def _serialize_into(self, computation_proto):
+    computation_proto.type.CopyFrom(
+        type_serialization.serialize_type(self.type_signature))
+    computation_proto.placement.uri = self._literal.uri
 
   @property
   def uri(self):
@@ -890,6 +996,57 @@ ComputationBuildingBlock._deserializer_dict = {
     'intrinsic': Intrinsic.from_proto,
     'data': Data.from_proto,
     'placement': Placement.from_proto,
-    'tensorflow': CompiledComputation,
+    'tensorflow': lambda proto, strict: CompiledComputation(proto),
 }
 # pylint: enable=protected-access
+
+
+def _deserialize_computation(computation_proto, strict):
+  """Deserializes `computation_proto`, a nested computation in a computation.
+
+  Args:
+    computation_proto: An instance of pb.Computation.
+    strict: Whether to check the type declared in `computation_proto`, and in
+      all computations nested in it, as in `from_proto`.
+
+  Returns:
+    An instance of `ComputationBuildingBlock`.
+
+  Raises:
+    NotImplementedError: if computation_proto contains a kind of computation
+      for which deserialization has not been implemented yet.
+    ValueError: if `strict` is set, and the declared type does not match.
+  """
+  computation_oneof = computation_proto.WhichOneof('computation')
+  # pylint: disable=protected-access
+  deserializer = ComputationBuildingBlock._deserializer_dict.get(
+      computation_oneof)
+  # pylint: enable=protected-access
+  if deserializer is None:
+    raise NotImplementedError(
+        'Deserialization for computations of type {} has not been '
+        'implemented yet.'.format(computation_oneof))
+  deserialized = deserializer(computation_proto, strict)
+  if strict:
+    _check_declared_type(deserialized, computation_proto)
+  return deserialized
+
+
+def _check_declared_type(deserialized, computation_proto):
+  """Checks the type of `deserialized` against that in `computation_proto`.
+
+  Args:
+    deserialized: An instance of `ComputationBuildingBlock` deserialized from
+      `computation_proto`.
+    computation_proto: An instance of pb.Computation.
+
+  Raises:
+    ValueError: If the types are not equivalent.
+  """
+  type_spec = type_serialization.deserialize_type(computation_proto.type)
+  if not type_utils.are_equivalent_types(deserialized.type_signature,
+                                         type_spec):
+    raise ValueError(
+        'The type {} derived from the computation structure does not '
+        'match the type {} declared in its signature'.format(
+            str(deserialized.type_signature), str(type_spec)))
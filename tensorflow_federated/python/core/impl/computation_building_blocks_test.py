@@ -23,6 +23,7 @@ import re
 from absl.testing import absltest
 import tensorflow as tf
 
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import anonymous_tuple
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import placements
@@ -257,6 +258,26 @@ class ComputationBuildingBlocksTest(absltest.TestCase):
     self.assertEqual(y.tff_repr, 'comp#foo')
     self._serialize_deserialize_roundtrip_test(x)
 
+  def test_fingerprint_of_compiled_computation_depends_only_on_proto(self):
+    comp, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: x + 3, tf.int32, context_stack_impl.context_stack)
+    other_comp, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: x * 3, tf.int32, context_stack_impl.context_stack)
+    x = computation_building_blocks.CompiledComputation(comp, name='foo')
+    y = computation_building_blocks.CompiledComputation(comp, name='bar')
+    z = computation_building_blocks.CompiledComputation(other_comp, name='foo')
+    self.assertRegexpMatches(x.fingerprint, r'^[0-9a-f]{64}$')
+    self.assertEqual(x.fingerprint, y.fingerprint)
+    self.assertNotEqual(x.fingerprint, z.fingerprint)
+
+  def test_deserialization_plan_of_compiled_computation_is_cached(self):
+    comp, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: x + 3, tf.int32, context_stack_impl.context_stack)
+    x = computation_building_blocks.CompiledComputation(comp)
+    plan = x.deserialization_plan
+    self.assertEqual(str(plan.type_signature), '(int32 -> int32)')
+    self.assertIs(x.deserialization_plan, plan)
+
   def test_basic_functionality_of_placement_class(self):
     x = computation_building_blocks.Placement(placements.CLIENTS)
     self.assertEqual(str(x.type_signature), 'placement')
@@ -270,6 +291,72 @@ class ComputationBuildingBlocksTest(absltest.TestCase):
     self.assertEqual(x_proto.placement.uri, x.uri)
     self._serialize_deserialize_roundtrip_test(x)
 
+  def test_tff_repr_of_nested_building_blocks(self):
+    x = computation_building_blocks.Lambda(
+        'x', tf.int32,
+        computation_building_blocks.Tuple([
+            computation_building_blocks.Reference('x', tf.int32),
+            computation_building_blocks.Selection(
+                computation_building_blocks.Tuple(
+                    [computation_building_blocks.Reference('x', tf.int32)]),
+                index=0)
+        ]))
+    self.assertEqual(x.tff_repr, '(x -> <x,<x>[0]>)')
+    self.assertEqual(x.result.tff_repr, '<x,<x>[0]>')
+    self.assertEqual(
+        computation_building_blocks.Block([('y', x.result), ('z', x)],
+                                          x.result[1]).tff_repr,
+        '(let y=<x,<x>[0]>,z=(x -> <x,<x>[0]>) in <x>[0])')
+    self._serialize_deserialize_roundtrip_test(x)
+
+  def test_modifying_proto_does_not_affect_later_roundtrip(self):
+    x = computation_building_blocks.Lambda(
+        'x', tf.int32,
+        computation_building_blocks.Tuple([
+            computation_building_blocks.Reference('x', tf.int32),
+            computation_building_blocks.Selection(
+                computation_building_blocks.Tuple(
+                    [computation_building_blocks.Reference('x', tf.int32)]),
+                index=0)
+        ]))
+    x_proto = x.proto
+    self.assertIsNot(x.proto, x_proto)
+    getattr(x_proto, 'lambda').result.tuple.element[1].ClearField('value')
+    x_proto.type.Clear()
+    y = computation_building_blocks.ComputationBuildingBlock.from_proto(
+        x.proto)
+    self.assertEqual(y.tff_repr, '(x -> <x,<x>[0]>)')
+    self.assertEqual(str(y.type_signature), '(int32 -> <int32,int32>)')
+    self._serialize_deserialize_roundtrip_test(x)
+
+  def test_from_proto_checks_nested_types_only_if_strict(self):
+    x = computation_building_blocks.Lambda(
+        'x', tf.int32,
+        computation_building_blocks.Tuple(
+            [computation_building_blocks.Reference('x', tf.int32)]))
+    x_proto = pb.Computation()
+    x_proto.CopyFrom(x.proto)
+    getattr(x_proto, 'lambda').result.type.CopyFrom(
+        type_serialization.serialize_type(
+            computation_types.to_type([tf.bool])))
+    y = computation_building_blocks.ComputationBuildingBlock.from_proto(x_proto)
+    self.assertEqual(y.tff_repr, x.tff_repr)
+    with self.assertRaises(ValueError):
+      computation_building_blocks.ComputationBuildingBlock.from_proto(
+          x_proto, strict=True)
+
+  def test_from_proto_checks_root_type(self):
+    x = computation_building_blocks.Lambda(
+        'x', tf.int32, computation_building_blocks.Reference('x', tf.int32))
+    x_proto = pb.Computation()
+    x_proto.CopyFrom(x.proto)
+    x_proto.type.function.result.CopyFrom(
+        type_serialization.serialize_type(computation_types.to_type(tf.bool)))
+    for strict in [False, True]:
+      with self.assertRaises(ValueError):
+        computation_building_blocks.ComputationBuildingBlock.from_proto(
+            x_proto, strict=strict)
+
   def _serialize_deserialize_roundtrip_test(self, target):
     """Performs roundtrip serialization/deserialization of the given target.
 
@@ -646,7 +646,7 @@ class PolymorphicFunction(object):
     # containters into anonymous tuples.
     packed_arg = pack_args_into_anonymous_tuple(args, kwargs)
     arg_type = type_utils.infer_type(packed_arg)
-    key = repr(arg_type)
+    key = arg_type
     concrete_fn = self._concrete_function_cache.get(key)
     if not concrete_fn:
       concrete_fn = self._concrete_function_factory(arg_type)
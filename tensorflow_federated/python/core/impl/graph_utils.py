@@ -222,6 +222,55 @@ def make_dataset_from_variant_tensor(variant_tensor, type_spec):
           computation_types.to_type(type_spec))))
 
 
+def copy_data_set_into_graph(dataset, graph, element_type):
+  """Recreates a `tf.data.Dataset` created in eager mode in `graph`.
+
+  The data set is serialized into a `tf.GraphDef` that describes how it is
+  constructed, which is imported into `graph`, so that its elements are only
+  produced as they are consumed by the ops in `graph`, rather than having to be
+  listed and embedded in `graph` upfront.
+
+  The data set is serialized eagerly, outside of any graph that may be the
+  default at the time of the call (e.g., the graph that a computation that
+  consumes the data set is being stamped into).
+
+  Args:
+    dataset: An instance of `tf.data.Dataset` created in eager mode.
+    graph: The graph in which to recreate the data set.
+    element_type: The type of elements, an instance of `types.Type` or something
+      convertible to it.
+
+  Returns:
+    The data set in `graph`, or `None` if `dataset` cannot be serialized, e.g.,
+    because it depends on stateful ops such as Python generators, or because it
+    has not been created in eager mode.
+  """
+  py_typecheck.check_type(dataset, DATASET_REPRESENTATION_TYPES)
+  py_typecheck.check_type(graph, tf.Graph)
+  try:
+    with tf.init_scope():
+      if not tf.executing_eagerly():
+        return None
+      serialized_graph_def = tf.raw_ops.DatasetToGraph(
+          input_dataset=tf.data.experimental.to_variant(dataset)).numpy()
+  except (tf.errors.FailedPreconditionError, tf.errors.InvalidArgumentError,
+          tf.errors.UnimplementedError):
+    # These are raised by `DatasetToGraph` for data sets that it is unable to
+    # serialize, e.g., because they depend on stateful ops.
+    return None
+  graph_def = tf.GraphDef.FromString(serialized_graph_def)
+  output_names = [n.input[0] for n in graph_def.node if n.op == '_Retval']
+  if len(output_names) != 1:
+    return None
+  output_name = output_names[0]
+  if ':' not in output_name:
+    output_name = '{}:0'.format(output_name)
+  with graph.as_default():
+    variant_tensor = tf.import_graph_def(
+        graph_def, return_elements=[output_name], name='dataset')[0]
+    return make_dataset_from_variant_tensor(variant_tensor, element_type)
+
+
 def capture_result_from_graph(result, graph):
   """Captures a result stamped into a tf.Graph as a type signature and binding.
 
@@ -471,59 +520,104 @@ def assemble_result_from_graph(type_spec, binding, output_map):
           'Element with key {} in the output map is {}, not a tensor.'.format(
               k, py_typecheck.type_string(type(v))))
 
+  tensor_names, assemble_fn = make_result_assembler(type_spec, binding)
+  tensors = []
+  for tensor_name in tensor_names:
+    if tensor_name not in output_map:
+      raise ValueError(
+          'Tensor named {} not found in the output map.'.format(tensor_name))
+    tensors.append(output_map[tensor_name])
+  return assemble_fn(tensors)
+
+
+def make_result_assembler(type_spec, binding):
+  """Compiles a type signature and binding into a function to assemble results.
+
+  This underlies `assemble_result_from_graph`. The type signature and binding
+  are only walked once, here, so that results of the same type and binding
+  (e.g., each time the same computation is stamped into a graph) can then be
+  assembled without walking them again.
+
+  Args:
+    type_spec: The type signature of the result to assemble, an instance of
+      `types.Type` or something convertible to it.
+    binding: The binding that relates the type signature to names of tensors in
+      the graph, an instance of `pb.TensorFlow.Binding`.
+
+  Returns:
+    A tuple (tensor_names, assemble_fn), where `tensor_names` is the list of the
+    names of the tensors that appear in `binding`, in order and including any
+    duplicates, and `assemble_fn` is a function that accepts a list of the
+    tensors stamped for these names (in the same order) and returns the
+    assembled result, as `assemble_result_from_graph` would.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If the type and binding don't match.
+  """
+  type_spec = computation_types.to_type(type_spec)
+  py_typecheck.check_type(type_spec, computation_types.Type)
+  py_typecheck.check_type(binding, pb.TensorFlow.Binding)
+  tensor_names = []
+  assemble_fn = _make_result_assembler(type_spec, binding, tensor_names)
+  return tensor_names, assemble_fn
+
+
+def _make_result_assembler(type_spec, binding, tensor_names):
+  """Implements `make_result_assembler`, appending names to `tensor_names`."""
   binding_oneof = binding.WhichOneof('binding')
   if isinstance(type_spec, computation_types.TensorType):
     if binding_oneof != 'tensor':
       raise ValueError(
           'Expected a tensor binding, found {}.'.format(binding_oneof))
-    elif binding.tensor.tensor_name not in output_map:
-      raise ValueError('Tensor named {} not found in the output map.'.format(
-          binding.tensor.tensor_name))
-    else:
-      return output_map[binding.tensor.tensor_name]
+    idx = len(tensor_names)
+    tensor_names.append(str(binding.tensor.tensor_name))
+    return lambda tensors: tensors[idx]
   elif isinstance(type_spec, computation_types.NamedTupleType):
     if binding_oneof != 'tuple':
       raise ValueError(
           'Expected a tuple binding, found {}.'.format(binding_oneof))
-    else:
-      type_elements = anonymous_tuple.to_elements(type_spec)
-      if len(binding.tuple.element) != len(type_elements):
-        raise ValueError(
-            'Mismatching tuple sizes in type ({}) and binding ({}).'.format(
-                len(type_elements), len(binding.tuple.element)))
-      result_elements = []
-      for (element_name,
-           element_type), element_binding in zip(type_elements,
-                                                 binding.tuple.element):
-        element_object = assemble_result_from_graph(element_type,
-                                                    element_binding, output_map)
-        result_elements.append((element_name, element_object))
-      if not isinstance(type_spec,
-                        computation_types.NamedTupleTypeWithPyContainerType):
-        return anonymous_tuple.AnonymousTuple(result_elements)
-      container_type = computation_types.NamedTupleTypeWithPyContainerType.get_container_type(
-          type_spec)
-      if (py_typecheck.is_named_tuple(container_type) or
-          py_typecheck.is_attrs(container_type)):
-        return container_type(**dict(result_elements))
-      return container_type(result_elements)
+    type_elements = anonymous_tuple.to_elements(type_spec)
+    if len(binding.tuple.element) != len(type_elements):
+      raise ValueError(
+          'Mismatching tuple sizes in type ({}) and binding ({}).'.format(
+              len(type_elements), len(binding.tuple.element)))
+    element_assemblers = [
+        (element_name,
+         _make_result_assembler(element_type, element_binding, tensor_names))
+        for (element_name, element_type
+            ), element_binding in zip(type_elements, binding.tuple.element)
+    ]
+    if not isinstance(type_spec,
+                      computation_types.NamedTupleTypeWithPyContainerType):
+      return lambda tensors: anonymous_tuple.AnonymousTuple(
+          [(k, fn(tensors)) for k, fn in element_assemblers])
+    container_type = computation_types.NamedTupleTypeWithPyContainerType.get_container_type(
+        type_spec)
+    if (py_typecheck.is_named_tuple(container_type) or
+        py_typecheck.is_attrs(container_type)):
+      return lambda tensors: container_type(
+          **{k: fn(tensors) for k, fn in element_assemblers})
+    return lambda tensors: container_type(
+        [(k, fn(tensors)) for k, fn in element_assemblers])
   elif isinstance(type_spec, computation_types.SequenceType):
     if binding_oneof != 'sequence':
       raise ValueError(
           'Expected a sequence binding, found {}.'.format(binding_oneof))
+    idx = len(tensor_names)
+    sequence_oneof = binding.sequence.WhichOneof('binding')
+    if sequence_oneof == 'iterator_string_handle_name':
+      # TODO(b/129956296): Eventually delete this deprecated code path.
+      tensor_names.append(str(binding.sequence.iterator_string_handle_name))
+      return lambda tensors: make_dataset_from_string_handle(
+          tensors[idx], type_spec.element)
+    elif sequence_oneof == 'variant_tensor_name':
+      tensor_names.append(str(binding.sequence.variant_tensor_name))
+      return lambda tensors: make_dataset_from_variant_tensor(
+          tensors[idx], type_spec.element)
     else:
-      sequence_oneof = binding.sequence.WhichOneof('binding')
-      if sequence_oneof == 'iterator_string_handle_name':
-        # TODO(b/129956296): Eventually delete this deprecated code path.
-        handle = output_map[binding.sequence.iterator_string_handle_name]
-        return make_dataset_from_string_handle(handle, type_spec.element)
-      elif sequence_oneof == 'variant_tensor_name':
-        variant_tensor = output_map[binding.sequence.variant_tensor_name]
-        return make_dataset_from_variant_tensor(variant_tensor,
-                                                type_spec.element)
-      else:
-        raise ValueError(
-            'Unsupported sequence binding \'{}\'.'.format(sequence_oneof))
+      raise ValueError(
+          'Unsupported sequence binding \'{}\'.'.format(sequence_oneof))
   else:
     raise ValueError('Unsupported type \'{}\'.'.format(str(type_spec)))
 
@@ -765,16 +859,14 @@ def to_tensor_slices_from_list_structure_for_element_type_spec(
 def make_data_set_from_elements(graph, elements, element_type):
   """Creates a `tf.data.Dataset` in `graph` from explicitly listed `elements`.
 
-  NOTE: The underlying implementation attempts to use the
-  `tf.data.Dataset.from_tensor_slices() method to build the data set quickly,
-  but this doesn't always work. The typical scenario where it breaks is one
-  with data set being composed of unequal batches. Typically, only the last
-  batch is odd, so on the first attempt, we try to construct two data sets,
-  one from all elements but the last one, and one from the last element, then
-  concatenate the two. In the unlikely case that this fails (e.g., because
-  all data set elements are batches of unequal sizes), we revert to the slow,
-  but reliable method of constructing data sets from singleton elements, and
-  then concatenating them all.
+  NOTE: The underlying implementation groups runs of consecutive elements in
+  which all tensors have the same shapes (e.g., all the full batches of a data
+  set, followed by a smaller last batch), and builds each group with a single
+  call to `tf.data.Dataset.from_tensor_slices()`. If there are more than a few
+  such groups, all tensors are instead padded to common shapes, stacked in one
+  call to `tf.data.Dataset.from_tensor_slices()` along with their actual
+  shapes, and sliced back to those shapes as the data set is iterated over, so
+  that the data set does not consist of a long chain of concatenations.
 
   Args:
     graph: The graph in which to construct the `tf.data.Dataset`.
@@ -793,38 +885,18 @@ def make_data_set_from_elements(graph, elements, element_type):
   element_type = computation_types.to_type(element_type)
   py_typecheck.check_type(element_type, computation_types.Type)
 
-  def _make(element_subset):
-    structure = make_empty_list_structure_for_element_type_spec(element_type)
-    for el in element_subset:
-      append_to_list_structure_for_element_type_spec(structure, el,
-                                                     element_type)
-    tensor_slices = to_tensor_slices_from_list_structure_for_element_type_spec(
-        structure, element_type)
-    return tf.data.Dataset.from_tensor_slices(tensor_slices)
-
   with graph.as_default():
     if not elements:
       # Just return an empty data set with the appropriate types.
-      dummy_element = _make_dummy_element_for_type_spec(element_type)
-      ds = _make([dummy_element]).take(0)
-    elif len(elements) == 1:
-      ds = _make(elements)
+      structure = make_empty_list_structure_for_element_type_spec(element_type)
+      append_to_list_structure_for_element_type_spec(
+          structure, _make_dummy_element_for_type_spec(element_type),
+          element_type)
+      ds = tf.data.Dataset.from_tensor_slices(
+          to_tensor_slices_from_list_structure_for_element_type_spec(
+              structure, element_type)).take(0)
     else:
-      try:
-        # It is common for the last element to be a batch of a size different
-        # from all the preceding batches. With this in mind, we proactively
-        # single out the last element (optimizing for the common case).
-        ds = _make(elements[0:-1]).concatenate(_make(elements[-1:]))
-      except ValueError:
-        # In case elements beyond just the last one are of unequal shapes, we
-        # may have failed (the most likely cause), so fall back onto the slow
-        # process of constructing and joining data sets from singletons. Not
-        # optimizing this for now, as it's very unlikely in scenarios
-        # we're targeting.
-        ds = None
-        for i in range(len(elements)):
-          singleton_ds = _make(elements[i:i + 1])
-          ds = singleton_ds if ds is None else ds.concatenate(singleton_ds)
+      ds = _make_data_set_from_nonempty_elements(elements, element_type)
     ds_element_type = type_utils.tf_dtypes_and_shapes_to_type(
         tf.compat.v1.data.get_output_types(ds),
         tf.compat.v1.data.get_output_shapes(ds))
@@ -836,14 +908,133 @@ def make_data_set_from_elements(graph, elements, element_type):
   return ds
 
 
-def fetch_value_in_session(sess, value):
+# The maximum number of groups of elements with equal shapes that
+# `make_data_set_from_elements` concatenates, beyond which it pads the elements.
+_MAX_DATA_SET_SEGMENTS = 4
+
+
+def _make_data_set_from_nonempty_elements(elements, element_type):
+  """Implements `make_data_set_from_elements` for a nonempty `elements`."""
+  structure = make_empty_list_structure_for_element_type_spec(element_type)
+  for el in elements:
+    append_to_list_structure_for_element_type_spec(structure, el, element_type)
+  leaves = _get_list_structure_leaves(structure)
+  shapes = [tuple(np.shape(leaf[idx]) for leaf in leaves)
+            for idx in range(len(elements))]
+  segment_bounds = [0] + [
+      idx for idx in range(1, len(elements)) if shapes[idx] != shapes[idx - 1]
+  ] + [len(elements)]
+  if len(segment_bounds) - 1 <= _MAX_DATA_SET_SEGMENTS:
+    ds = None
+    for start, stop in zip(segment_bounds[:-1], segment_bounds[1:]):
+      segment = _map_list_structure(structure, lambda x: x[start:stop])  # pylint: disable=cell-var-from-loop
+      segment_ds = tf.data.Dataset.from_tensor_slices(
+          to_tensor_slices_from_list_structure_for_element_type_spec(
+              segment, element_type))
+      ds = segment_ds if ds is None else ds.concatenate(segment_ds)
+    return ds
+  leaf_types = anonymous_tuple.flatten(element_type)
+  padded_leaves = []
+  shape_leaves = []
+  common_shapes = []
+  for leaf_idx, (leaf, leaf_type) in enumerate(zip(leaves, leaf_types)):
+    leaf_shapes = np.array([s[leaf_idx] for s in shapes], dtype=np.int64)
+    if leaf_shapes.ndim != 2:
+      raise ValueError(
+          'The elements of a data set must have tensors of the same rank, '
+          'found shapes {}.'.format(
+              sorted(set(s[leaf_idx] for s in shapes))))
+    max_shape = leaf_shapes.max(axis=0)
+    numpy_dtype = leaf_type.dtype.as_numpy_dtype
+    if leaf_type.dtype == tf.string:
+      padded = np.full([len(leaf)] + list(max_shape), b'', dtype=object)
+    else:
+      padded = np.zeros([len(leaf)] + list(max_shape), dtype=numpy_dtype)
+    for idx, value in enumerate(leaf):
+      padded[idx][tuple(slice(0, d) for d in leaf_shapes[idx])] = value
+    padded_leaves.append(padded)
+    shape_leaves.append(leaf_shapes)
+    common_shapes.append([
+        int(d) if (leaf_shapes[:, k] == d).all() else None
+        for k, d in enumerate(max_shape)
+    ])
+
+  # The leaves are listed in the order of the type, whereas `tf.nest` orders
+  # the keys of dictionaries, so the common shapes are looked up by position.
+  flat_leaf_indices = tf.nest.flatten(
+      _pack_list_structure(structure, range(len(leaves))))
+
+  def _slice_to_actual_shapes(padded, actual_shapes):
+    flat_padded = tf.nest.flatten(padded)
+    flat_shapes = tf.nest.flatten(actual_shapes)
+    sliced = []
+    for x, shape, leaf_idx in zip(flat_padded, flat_shapes, flat_leaf_indices):
+      x = tf.slice(x, tf.zeros_like(shape), shape)
+      x.set_shape(common_shapes[leaf_idx])
+      sliced.append(x)
+    return tf.nest.pack_sequence_as(padded, sliced)
+
+  padded_structure = _pack_list_structure(structure, padded_leaves)
+  shape_structure = _pack_list_structure(structure, shape_leaves)
+  return tf.data.Dataset.from_tensor_slices(
+      (padded_structure, shape_structure)).map(_slice_to_actual_shapes)
+
+
+def _get_list_structure_leaves(structure):
+  """Returns the leaf lists of a structure of lists, in order."""
+  if isinstance(structure, list):
+    return [structure]
+  leaves = []
+  for v in (structure.values()
+            if isinstance(structure, collections.OrderedDict) else structure):
+    leaves.extend(_get_list_structure_leaves(v))
+  return leaves
+
+
+def _pack_list_structure(structure, leaves):
+  """Replaces the leaf lists of `structure` with `leaves`, in order."""
+  leaves_iter = iter(leaves)
+  return _map_list_structure(structure, lambda _: next(leaves_iter))
+
+
+def _map_list_structure(structure, fn):
+  """Applies `fn` to the leaf lists of a structure of lists."""
+  if isinstance(structure, list):
+    return fn(structure)
+  elif isinstance(structure, collections.OrderedDict):
+    return collections.OrderedDict([
+        (k, _map_list_structure(v, fn)) for k, v in six.iteritems(structure)
+    ])
+  else:
+    return tuple(_map_list_structure(v, fn) for v in structure)
+
+
+# The default number of data set elements fetched per `session.run()` by
+# `fetch_value_in_session`.
+DEFAULT_DATA_SET_CHUNK_SIZE = 1000
+
+
+def fetch_value_in_session(sess,
+                           value,
+                           feed_dict=None,
+                           data_set_chunk_size=DEFAULT_DATA_SET_CHUNK_SIZE):
   """Fetches `value` in `session`.
 
+  To fetch the same `value` repeatedly, construct a `ValueFetcher` once and
+  reuse it instead.
+
   Args:
     sess: The session in which to perform the fetch (as a single run).
     value: A Python object of a form analogous to that constructed by the
       function `assemble_result_from_graph`, made of tensors and anononymous
       tuples, or a `tf.data.Dataset`.
+    feed_dict: An optional dictionary that maps placeholders in the graph to
+      the values to feed into them in the course of the fetch.
+    data_set_chunk_size: The number of elements of data sets to fetch in each
+      `session.run()`, or `None` to fetch the elements one at a time. Data sets
+      are batched in the graph into chunks of this size (with elements of
+      varying shapes padded to a common shape), which are split back into the
+      original elements after they are fetched.
 
   Returns:
     A Python object with structure similar to `value`, but with tensors
@@ -854,50 +1045,170 @@ def fetch_value_in_session(sess, value):
     ValueError: If `value` is not a `tf.data.Dataset` or not a structure of
       tensors and anonoymous tuples.
   """
-  py_typecheck.check_type(sess, tf.Session)
-  # TODO(b/113123634): Investigate handling `list`s and `tuple`s of
-  # `tf.data.Dataset`s and what the API would look like to support this.
-  if isinstance(value, DATASET_REPRESENTATION_TYPES):
-    with sess.graph.as_default():
-      iterator = tf.compat.v1.data.make_one_shot_iterator(value)
-      next_element = iterator.get_next()
-    elements = []
-    while True:
-      try:
-        elements.append(sess.run(next_element))
-      except tf.errors.OutOfRangeError:
-        break
-    return elements
-  else:
-    flattened_value = anonymous_tuple.flatten(value)
-    dataset_results = {}
-    flat_tensors = []
+  return ValueFetcher(value).fetch(sess, feed_dict, data_set_chunk_size)
+
+
+class ValueFetcher(object):
+  """Fetches the values of a given structure of tensors and data sets.
+
+  The structure is analyzed once, upon construction, into the list of tensors
+  to fetch and the positions at which their values and the elements of data
+  sets are to be packed into the result, so that the same structure can be
+  fetched repeatedly (e.g., each time a computation is run in a reused session)
+  in time linear in the number of its constituents.
+  """
+
+  def __init__(self, value):
+    """Constructs a fetcher for `value`.
+
+    Args:
+      value: A Python object of a form analogous to that constructed by the
+        function `assemble_result_from_graph`, made of tensors and anononymous
+        tuples, or a `tf.data.Dataset`.
+
+    Raises:
+      ValueError: If `value` is not a `tf.data.Dataset` or not a structure of
+        tensors and anonoymous tuples.
+    """
+    self._value = value
+    self._tensors = []
+    self._tensor_positions = []
+    self._data_sets = []
+    self._data_set_positions = []
+    self._data_set_fetchers = {}
+    # TODO(b/113123634): Investigate handling `list`s and `tuple`s of
+    # `tf.data.Dataset`s and what the API would look like to support this.
+    if isinstance(value, DATASET_REPRESENTATION_TYPES):
+      self._num_leaves = None
+      self._decode_strings = False
+      return
+    self._structure_plan = anonymous_tuple.StructurePlan(value)
+    flattened_value = self._structure_plan.flatten(value)
     for idx, v in enumerate(flattened_value):
       if isinstance(v, DATASET_REPRESENTATION_TYPES):
-        dataset_results[idx] = fetch_value_in_session(sess, v)
+        self._data_sets.append(v)
+        self._data_set_positions.append(idx)
       elif tf.is_tensor(v):
-        flat_tensors.append(v)
+        self._tensors.append(v)
+        self._tensor_positions.append(idx)
       else:
         raise ValueError('Unsupported value type {}.'.format(str(v)))
-    flat_computed_tensors = sess.run(flat_tensors)
-    flattened_results = _interleave_dataset_results_and_tensors(
-        dataset_results, flat_computed_tensors)
-
-    def _to_unicode(v):
-      if six.PY3 and isinstance(v, bytes):
-        return v.decode('utf-8')
-      return v
-
-    if tf.is_tensor(value) and value.dtype == tf.string:
-      flattened_results = [_to_unicode(result) for result in flattened_results]
-    return anonymous_tuple.pack_sequence_as(value, flattened_results)
+    self._num_leaves = len(flattened_value)
+    self._decode_strings = (
+        six.PY3 and tf.is_tensor(value) and value.dtype == tf.string)
+
+  def fetch(self,
+            sess,
+            feed_dict=None,
+            data_set_chunk_size=DEFAULT_DATA_SET_CHUNK_SIZE):
+    """Fetches the value in `sess`, as in `fetch_value_in_session`."""
+    py_typecheck.check_type(sess, tf.Session)
+    if data_set_chunk_size is not None:
+      py_typecheck.check_type(data_set_chunk_size, int)
+    data_set_fetchers = self._get_data_set_fetchers(sess.graph,
+                                                    data_set_chunk_size)
+    if self._num_leaves is None:
+      return data_set_fetchers[0].fetch(sess, feed_dict)
+    flattened_results = [None] * self._num_leaves
+    for idx, fetcher in zip(self._data_set_positions, data_set_fetchers):
+      flattened_results[idx] = fetcher.fetch(sess, feed_dict)
+    flat_computed_tensors = sess.run(self._tensors, feed_dict=feed_dict)
+    for idx, v in zip(self._tensor_positions, flat_computed_tensors):
+      flattened_results[idx] = v
+    if self._decode_strings and isinstance(flattened_results[0], bytes):
+      flattened_results[0] = flattened_results[0].decode('utf-8')
+    return self._structure_plan.pack(flattened_results)
+
+  def _get_data_set_fetchers(self, graph, data_set_chunk_size):
+    """Returns the `_DataSetFetcher`s for the data sets in `graph`.
+
+    The fetchers are constructed upon the first fetch in `graph` with the given
+    `data_set_chunk_size`, and reused in subsequent fetches.
+    """
+    key = (graph, data_set_chunk_size)
+    fetchers = self._data_set_fetchers.get(key)
+    if fetchers is None:
+      data_sets = (
+          [self._value] if self._num_leaves is None else self._data_sets)
+      fetchers = [
+          _DataSetFetcher(graph, ds, data_set_chunk_size) for ds in data_sets
+      ]
+      self._data_set_fetchers[key] = fetchers
+    return fetchers
+
+
+class _DataSetFetcher(object):
+  """Fetches the elements of a data set with ops constructed once.
+
+  The iterator over the data set (and the batching of its elements into chunks)
+  is added to the graph upon construction, so that fetching the data set
+  repeatedly in the same session only reinitializes the iterator, and does not
+  grow the graph.
+  """
 
+  def __init__(self, graph, dataset, chunk_size):
+    """Constructs the ops to fetch `dataset` in `graph`.
 
-def _interleave_dataset_results_and_tensors(dataset_results, flat_run_tensors):
-  flattened_results = []
-  for idx in range(len(dataset_results) + len(flat_run_tensors)):
-    if dataset_results.get(idx):
-      flattened_results.append(dataset_results[idx])
-    else:
-      flattened_results.append(flat_run_tensors.pop(0))
-  return flattened_results
+    Args:
+      graph: The graph in which `dataset` is defined.
+      dataset: The `tf.data.Dataset` to fetch.
+      chunk_size: The number of elements to fetch in each `session.run()`, or
+        `None` to fetch the elements one at a time. The elements are only
+        batched if they are of known rank.
+    """
+    output_types = tf.compat.v1.data.get_output_types(dataset)
+    flat_shapes = tf.nest.flatten(tf.compat.v1.data.get_output_shapes(dataset))
+    self._batched = (
+        chunk_size is not None and chunk_size > 1 and
+        all(shape.ndims is not None for shape in flat_shapes))
+    self._padded = self._batched and not all(
+        shape.is_fully_defined() for shape in flat_shapes)
+    with graph.as_default():
+      if self._padded:
+        # Elements are padded to the largest shape in each chunk, so the actual
+        # shapes of their components are fetched along with them, to strip the
+        # padding back off.
+        def _with_shapes(*args):
+          # Only plain tuples are unpacked into separate arguments by `map()`,
+          # named tuples are passed as a single argument, like other structures.
+          element = args if type(output_types) is tuple else args[0]  # pylint: disable=unidiomatic-typecheck
+          return element, tf.nest.map_structure(tf.shape, element)
+
+        dataset = dataset.map(_with_shapes)
+        dataset = dataset.padded_batch(
+            chunk_size,
+            padded_shapes=tf.compat.v1.data.get_output_shapes(dataset))
+      elif self._batched:
+        dataset = dataset.batch(chunk_size)
+      # An initializable iterator is used, since unlike a one-shot iterator, it
+      # can be rerun, and it supports data sets that depend on the placeholders
+      # in `feed_dict`.
+      iterator = tf.compat.v1.data.make_initializable_iterator(dataset)
+      self._initializer = iterator.initializer
+      self._next_element = iterator.get_next()
+
+  def fetch(self, sess, feed_dict):
+    """Fetches the list of elements of the data set in `sess`."""
+    sess.run(self._initializer, feed_dict=feed_dict)
+    elements = []
+    while True:
+      try:
+        element = sess.run(self._next_element, feed_dict=feed_dict)
+      except tf.errors.OutOfRangeError:
+        break
+      if not self._batched:
+        elements.append(element)
+      elif not self._padded:
+        chunk_length = len(tf.nest.flatten(element)[0])
+        for idx in range(chunk_length):
+          elements.append(tf.nest.map_structure(lambda x: x[idx], element))  # pylint: disable=cell-var-from-loop
+      else:
+        values, shapes = element
+        chunk_length = len(tf.nest.flatten(values)[0])
+        for idx in range(chunk_length):
+          elements.append(
+              tf.nest.map_structure(
+                  lambda x, s: x[idx][tuple(slice(0, d) for d in s[idx])],  # pylint: disable=cell-var-from-loop
+                  values,
+                  shapes))
+    return elements
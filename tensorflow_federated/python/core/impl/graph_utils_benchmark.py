@@ -0,0 +1,79 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark for fetching data sets with graph_utils.fetch_value_in_session."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+from six.moves import range
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import test
+from tensorflow_federated.python.core.impl import graph_utils
+
+
+class FetchDataSetBenchmark(tf.test.Benchmark):
+  """Compares fetching data set elements one at a time and in chunks."""
+
+  def _benchmark_fetch(self, name, make_data_set, num_elements, num_iters=5):
+    for chunk_size in [None, 100, graph_utils.DEFAULT_DATA_SET_CHUNK_SIZE]:
+      fetch_time_array = []
+      for _ in range(num_iters):
+        with tf.Graph().as_default() as graph:
+          ds = make_data_set()
+        with tf.Session(graph=graph) as sess:
+          fetch_start = time.time()
+          elements = graph_utils.fetch_value_in_session(
+              sess, ds, data_set_chunk_size=chunk_size)
+          fetch_stop = time.time()
+        assert len(elements) == num_elements
+        fetch_time_array.append(fetch_stop - fetch_start)
+      wall_time = np.mean(fetch_time_array)
+      self.report_benchmark(
+          name="Fetch {} elements of {}, chunk size {}".format(
+              num_elements, name, chunk_size),
+          wall_time=wall_time,
+          iters=num_iters,
+          extras={"elements_per_second": num_elements / wall_time})
+
+  def benchmark_fetch_scalars(self):
+    num_elements = 10000
+    self._benchmark_fetch("scalars",
+                          lambda: tf.data.Dataset.range(num_elements),
+                          num_elements)
+
+  def benchmark_fetch_batches(self):
+    num_elements = 2000
+    self._benchmark_fetch(
+        "batches of x=float32[8,784], y=int32[8]",
+        lambda: tf.data.Dataset.from_tensors({
+            "x": tf.zeros([8, 784]),
+            "y": tf.zeros([8], dtype=tf.int32),
+        }).repeat(num_elements), num_elements)
+
+  def benchmark_fetch_batches_of_varying_sizes(self):
+    num_elements = 2000
+    self._benchmark_fetch(
+        "batches of float32[?,784]",
+        lambda: tf.data.Dataset.range(num_elements).map(
+            lambda k: tf.zeros([k % 8 + 1, 784])), num_elements)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -511,6 +511,41 @@ class GraphUtilsTest(test.TestCase):
         str(result.output_shapes),
         'TestNamedTuple(X=TensorShape([]), Y=TensorShape([]))')
 
+  @test.graph_mode_test
+  def test_make_result_assembler_with_named_tuple(self):
+    test_named_tuple = collections.namedtuple('_', 'X Y')
+    type_spec = [('a', test_named_tuple(tf.int32, tf.int32)), ('b', tf.int32)]
+    binding = pb.TensorFlow.Binding(
+        tuple=pb.TensorFlow.NamedTupleBinding(element=[
+            pb.TensorFlow.Binding(
+                tuple=pb.TensorFlow.NamedTupleBinding(element=[
+                    pb.TensorFlow.Binding(
+                        tensor=pb.TensorFlow.TensorBinding(tensor_name='P')),
+                    pb.TensorFlow.Binding(
+                        tensor=pb.TensorFlow.TensorBinding(tensor_name='Q'))
+                ])),
+            pb.TensorFlow.Binding(
+                tensor=pb.TensorFlow.TensorBinding(tensor_name='P')),
+        ]))
+    tensor_names, assemble_fn = graph_utils.make_result_assembler(
+        type_spec, binding)
+    self.assertEqual(tensor_names, ['P', 'Q', 'P'])
+    for _ in range(2):
+      tensor_a = tf.constant(1)
+      tensor_b = tf.constant(2)
+      result = assemble_fn([tensor_a, tensor_b, tensor_a])
+      self.assertIsInstance(result, anonymous_tuple.AnonymousTuple)
+      self.assertIsInstance(result.a, test_named_tuple)
+      self.assertEqual(result.a.X, tensor_a)
+      self.assertEqual(result.a.Y, tensor_b)
+      self.assertEqual(result.b, tensor_a)
+
+  def test_make_result_assembler_with_mismatching_binding_fails(self):
+    binding = pb.TensorFlow.Binding(
+        tensor=pb.TensorFlow.TensorBinding(tensor_name='P'))
+    with self.assertRaises(ValueError):
+      graph_utils.make_result_assembler([tf.int32, tf.int32], binding)
+
   def test_make_dummy_element_TensorType(self):
     type_spec = computation_types.TensorType(tf.float32,
                                              [None, 10, None, 10, 10])
@@ -698,6 +733,112 @@ class GraphUtilsTest(test.TestCase):
       y = graph_utils.fetch_value_in_session(sess, x)
     self.assertEqual(str(y), '<a=<b=10>>')
 
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_data_set_fed_from_placeholder(self):
+    x = tf.placeholder(tf.int32, shape=[3])
+    ds = tf.data.Dataset.from_tensor_slices(x)
+    with tf.Session() as sess:
+      y = graph_utils.fetch_value_in_session(
+          sess, ds, feed_dict={x: np.array([1, 2, 3], dtype=np.int32)})
+    self.assertEqual(y, [1, 2, 3])
+
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_data_set_in_chunks(self):
+    ds = tf.data.Dataset.range(10).map(lambda x: {
+        'a': x,
+        'b': tf.fill([2], tf.to_float(x)),
+    })
+    with tf.Session() as sess:
+      expected = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=None)
+      for chunk_size in [2, 3, 10, 100]:
+        actual = graph_utils.fetch_value_in_session(
+            sess, ds, data_set_chunk_size=chunk_size)
+        self.assertLen(actual, 10)
+        for x, y in zip(actual, expected):
+          self.assertEqual(x['a'], y['a'])
+          self.assertTrue(np.array_equal(x['b'], y['b']))
+
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_data_set_of_varying_shapes(self):
+    ds = tf.data.Dataset.range(1, 6).map(lambda x: tf.range(x))
+    with tf.Session() as sess:
+      result = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=2)
+    self.assertLen(result, 5)
+    for idx, x in enumerate(result):
+      self.assertTrue(np.array_equal(x, np.arange(idx + 1)))
+
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_data_set_of_named_tuples_in_chunks(self):
+    element_type = collections.namedtuple('_', 'a b')
+    ds = tf.data.Dataset.range(1, 6).map(
+        lambda x: element_type(a=x, b=tf.range(x)))
+    with tf.Session() as sess:
+      result = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=2)
+    self.assertLen(result, 5)
+    for idx, x in enumerate(result):
+      self.assertIsInstance(x, element_type)
+      self.assertEqual(x.a, idx + 1)
+      self.assertTrue(np.array_equal(x.b, np.arange(idx + 1)))
+
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_data_set_of_tuples_in_chunks(self):
+    ds = tf.data.Dataset.range(1, 6).map(lambda x: (x, tf.range(x)))
+    with tf.Session() as sess:
+      result = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=2)
+    self.assertLen(result, 5)
+    for idx, x in enumerate(result):
+      self.assertEqual(x[0], idx + 1)
+      self.assertTrue(np.array_equal(x[1], np.arange(idx + 1)))
+
+  @test.graph_mode_test
+  def test_fetch_value_in_session_with_empty_data_set_and_tensors(self):
+    x = anonymous_tuple.AnonymousTuple([
+        ('a', tf.constant(10)),
+        ('b', tf.data.Dataset.range(5).take(0)),
+        ('c', tf.constant(20)),
+    ])
+    with tf.Session() as sess:
+      y = graph_utils.fetch_value_in_session(sess, x)
+    self.assertEqual(y.a, 10)
+    self.assertEqual(y.b, [])
+    self.assertEqual(y.c, 20)
+
+  @test.graph_mode_test
+  def test_value_fetcher_fetches_repeatedly_with_feed_dict(self):
+    x = tf.placeholder(tf.int32, shape=[])
+    value = anonymous_tuple.AnonymousTuple([
+        ('a', x + 1),
+        ('b', anonymous_tuple.AnonymousTuple([('c', x * 2)])),
+    ])
+    fetcher = graph_utils.ValueFetcher(value)
+    with tf.Session() as sess:
+      for k in range(3):
+        self.assertEqual(
+            str(fetcher.fetch(sess, {x: k})),
+            '<a={},b=<c={}>>'.format(k + 1, k * 2))
+
+  @test.graph_mode_test
+  def test_value_fetcher_refetches_data_set_without_growing_graph(self):
+    x = tf.placeholder(tf.int64, shape=[])
+    value = anonymous_tuple.AnonymousTuple([
+        ('a', x),
+        ('b', tf.data.Dataset.range(x)),
+    ])
+    fetcher = graph_utils.ValueFetcher(value)
+    with tf.Session() as sess:
+      result = fetcher.fetch(sess, {x: 3}, data_set_chunk_size=2)
+      self.assertEqual(result.a, 3)
+      self.assertEqual(result.b, [0, 1, 2])
+      num_ops = len(sess.graph.get_operations())
+      for k in range(2):
+        result = fetcher.fetch(sess, {x: k}, data_set_chunk_size=2)
+        self.assertEqual(result.b, list(range(k)))
+      self.assertLen(sess.graph.get_operations(), num_ops)
+
   def test_make_empty_list_structure_for_element_type_spec_w_tuple_dict(self):
     type_spec = computation_types.to_type(
         [tf.int32, [('a', tf.bool), ('b', tf.float32)]])
@@ -880,6 +1021,52 @@ class GraphUtilsTest(test.TestCase):
         'x': np.array([7, 8])
     }], [('x', computation_types.TensorType(tf.int32, tf.TensorShape([None])))])
 
+  @test.graph_mode_test
+  def test_make_data_set_from_elements_with_many_odd_batches(self):
+    elements = [
+        collections.OrderedDict([
+            ('x', np.arange(k % 3 + 1, dtype=np.float32)),
+            ('y', np.int32(k)),
+        ]) for k in range(10)
+    ]
+    ds = graph_utils.make_data_set_from_elements(
+        tf.get_default_graph(), elements,
+        [('x', computation_types.TensorType(tf.float32, [None])),
+         ('y', tf.int32)])
+    output_shapes = tf.compat.v1.data.get_output_shapes(ds)
+    self.assertEqual(output_shapes['x'].as_list(), [None])
+    self.assertEqual(output_shapes['y'].as_list(), [])
+    with tf.Session() as sess:
+      result = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=None)
+    self.assertLen(result, 10)
+    for k, element in enumerate(result):
+      self.assertTrue(np.array_equal(element['x'], elements[k]['x']))
+      self.assertEqual(element['y'], k)
+
+  def test_make_data_set_from_elements_with_many_odd_batches_unsorted_names(
+      self):
+    elements = [
+        collections.OrderedDict([
+            ('y', np.arange(k % 3 + 1, dtype=np.float32)),
+            ('x', np.full([k % 5 + 1, 2], k, dtype=np.int32)),
+        ]) for k in range(10)
+    ]
+    ds = graph_utils.make_data_set_from_elements(
+        tf.get_default_graph(), elements,
+        [('y', computation_types.TensorType(tf.float32, [None])),
+         ('x', computation_types.TensorType(tf.int32, [None, 2]))])
+    output_shapes = tf.compat.v1.data.get_output_shapes(ds)
+    self.assertEqual(output_shapes['y'].as_list(), [None])
+    self.assertEqual(output_shapes['x'].as_list(), [None, 2])
+    with tf.Session() as sess:
+      result = graph_utils.fetch_value_in_session(
+          sess, ds, data_set_chunk_size=None)
+    self.assertLen(result, 10)
+    for k, element in enumerate(result):
+      self.assertTrue(np.array_equal(element['y'], elements[k]['y']))
+      self.assertTrue(np.array_equal(element['x'], elements[k]['x']))
+
   def test_make_data_set_from_elements_with_just_one_batch(self):
     graph_utils.make_data_set_from_elements(
         tf.get_default_graph(), [np.array([1])],
@@ -933,6 +1120,29 @@ class GraphUtilsTest(test.TestCase):
         graph_utils.make_dataset_from_variant_tensor(
             tf.data.experimental.to_variant(tf.data.Dataset.range(5)), 'a')
 
+  def test_copy_data_set_into_graph(self):
+    ds = tf.data.Dataset.range(5).map(lambda x: x * 2)
+    graph = tf.Graph()
+    ds_in_graph = graph_utils.copy_data_set_into_graph(ds, graph, tf.int64)
+    with graph.as_default():
+      result = ds_in_graph.reduce(np.int64(0), lambda x, y: x + y)
+    with tf.Session(graph=graph) as sess:
+      self.assertEqual(sess.run(result), 20)
+
+  def test_copy_data_set_into_graph_with_another_default_graph(self):
+    ds = tf.data.Dataset.range(5).map(lambda x: x * 2)
+    graph = tf.Graph()
+    with graph.as_default():
+      ds_in_graph = graph_utils.copy_data_set_into_graph(ds, graph, tf.int64)
+      result = ds_in_graph.reduce(np.int64(0), lambda x, y: x + y)
+    with tf.Session(graph=graph) as sess:
+      self.assertEqual(sess.run(result), 20)
+
+  def test_copy_data_set_into_graph_with_stateful_data_set(self):
+    ds = tf.data.Dataset.from_generator(lambda: iter(range(5)), tf.int64)
+    self.assertIsNone(
+        graph_utils.copy_data_set_into_graph(ds, tf.Graph(), tf.int64))
+
   def test_fetch_value_with_nested_datasets(self):
 
     def return_two_datasets():
@@ -0,0 +1,307 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Generic zero and addition of tensors and tuples of tensors in NumPy.
+
+The values operated on are in the representation used by the executors, i.e.,
+NumPy arrays and scalars (and Python scalars) for tensors, and instances of
+`anonymous_tuple.AnonymousTuple` for named tuples.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+from six.moves import range
+from six.moves import zip
+
+from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import lru_cache
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl import type_utils
+
+
+class ArithmeticPlan(object):
+  """Implements the generic zero and plus for a given TFF type in NumPy.
+
+  The plan is constructed once per type, and it records the dtypes and shapes
+  of the tensors in the type in the order in which `anonymous_tuple.flatten()`
+  yields them. The arithmetic is then carried out directly on flat lists of
+  leaves, which are flattened from and packed back into the structure of the
+  type with an `anonymous_tuple.StructurePlan`.
+
+  Tensors of rank 0 are represented by NumPy scalars, and all other tensors by
+  NumPy arrays, with the dtypes declared by the type.
+  """
+
+  def __init__(self, type_spec):
+    """Constructs a plan for `type_spec`.
+
+    Args:
+      type_spec: An instance of `computation_types.Type` composed only of tensor
+        and named tuple types, with numeric or boolean tensors of fully defined
+        shapes (see `is_supported_type`).
+
+    Raises:
+      TypeError: If `type_spec` is not supported.
+    """
+    py_typecheck.check_type(type_spec, computation_types.Type)
+    if not is_supported_type(type_spec):
+      raise TypeError(
+          'The type {} is not supported by NumPy arithmetic.'.format(
+              str(type_spec)))
+    self._type_signature = type_spec
+    self._structure_plan = anonymous_tuple.get_structure_plan(type_spec)
+    leaf_types = self._structure_plan.flatten(type_spec)
+    self._dtypes = [np.dtype(t.dtype.as_numpy_dtype) for t in leaf_types]
+    self._shapes = [tuple(t.shape.as_list()) for t in leaf_types]
+
+  @property
+  def type_signature(self):
+    return self._type_signature
+
+  def zero(self):
+    """Returns a zero value of the type of this plan."""
+    return self._pack(self._zero_leaves())
+
+  def plus(self, x, y):
+    """Returns the sum of `x` and `y`, two values of the type of this plan."""
+    x_leaves = self._flatten(x)
+    y_leaves = self._flatten(y)
+    return self._pack([
+        self._cast(idx, np.add(x_leaves[idx], y_leaves[idx]))
+        for idx in range(len(self._dtypes))
+    ])
+
+  def sum(self, values):
+    """Returns the sum of an iterable of values of the type of this plan.
+
+    The sum is accumulated in arrays allocated at the beginning, and updated in
+    place with each of the values, none of which are modified.
+
+    Args:
+      values: An iterable of values of the type of this plan.
+
+    Returns:
+      The sum of `values`, or a zero value if `values` is empty.
+    """
+    accumulator = self._zero_leaves()
+    for value in values:
+      self._add_leaves_into(accumulator, self._flatten(value))
+    return self._pack(accumulator)
+
+  def tree_sum(self, values, fan_in):
+    """Returns the sum of an iterable of values, reduced in a tree.
+
+    The values are consumed as a stream. Each run of `fan_in` consecutive values
+    is summed into a partial sum at the first level of the tree, each run of
+    `fan_in` consecutive partial sums at the first level is summed into a
+    partial sum at the second level, and so on. Only a single partial sum is
+    retained per level of the tree at any time, so the memory used grows with
+    the logarithm of the number of values, rather than linearly with it. Tree
+    reductions also tend to accumulate less floating point error than the
+    left-to-right sum computed by `sum()`.
+
+    Args:
+      values: An iterable of values of the type of this plan.
+      fan_in: The number of children summed into each node of the tree, an
+        integer greater than 1.
+
+    Returns:
+      The sum of `values`, or a zero value if `values` is empty.
+
+    Raises:
+      ValueError: If `fan_in` is less than 2.
+    """
+    py_typecheck.check_type(fan_in, int)
+    if fan_in < 2:
+      raise ValueError(
+          'The fan-in of a tree reduction must be at least 2, found {}.'.format(
+              fan_in))
+    # Each level is a pair [accumulator, count], where the accumulator holds the
+    # flattened partial sum of `count` nodes from the level below it.
+    levels = []
+    for value in values:
+      self._add_into_level(levels, 0, self._flatten(value), fan_in)
+    accumulator = self._zero_leaves()
+    for level_accumulator, _ in levels:
+      if level_accumulator is not None:
+        self._add_leaves_into(accumulator, level_accumulator)
+    return self._pack(accumulator)
+
+  def _add_into_level(self, levels, level, leaves, fan_in):
+    """Adds `leaves` into the partial sum at `level`, carrying if complete."""
+    if level == len(levels):
+      levels.append([None, 0])
+    accumulator, count = levels[level]
+    if accumulator is None:
+      if level:
+        # Partial sums carried from the level below are owned by the tree.
+        accumulator = leaves
+      else:
+        accumulator = self._zero_leaves()
+        self._add_leaves_into(accumulator, leaves)
+    else:
+      self._add_leaves_into(accumulator, leaves)
+    count += 1
+    if count < fan_in:
+      levels[level] = [accumulator, count]
+    else:
+      levels[level] = [None, 0]
+      self._add_into_level(levels, level + 1, accumulator, fan_in)
+
+  def weighted_mean(self, values, weights, accumulator_dtype=None):
+    """Returns the mean of `values` weighted by `weights`, in a single pass.
+
+    The weighted sum and the total weight are accumulated together, and the
+    weighted sum is divided by the total weight once at the end. The products
+    of the leaves and the weights are computed in scratch buffers allocated up
+    front, so no memory is allocated per value.
+
+    Args:
+      values: An iterable of values of the type of this plan, which must be
+        composed of floating point tensors.
+      weights: An iterable of scalar weights, one per element of `values`.
+      accumulator_dtype: The optional NumPy floating point dtype in which to
+        accumulate the weighted sum (e.g., `np.float64` to limit the rounding
+        error with many values), or `None` to accumulate in the dtypes of the
+        leaves. The result is in the dtypes of the leaves either way.
+
+    Returns:
+      The weighted mean, or a zero value if `values` is empty.
+
+    Raises:
+      ZeroDivisionError: If `values` is not empty, and the weights sum to zero.
+    """
+    if accumulator_dtype is not None:
+      accumulator_dtypes = [np.dtype(accumulator_dtype)] * len(self._dtypes)
+    else:
+      accumulator_dtypes = self._dtypes
+    accumulator = [
+        np.zeros(shape, dtype)
+        for dtype, shape in zip(accumulator_dtypes, self._shapes)
+    ]
+    scratch = [
+        np.empty(shape, dtype)
+        for dtype, shape in zip(accumulator_dtypes, self._shapes)
+    ]
+    total_weight = 0.0
+    num_values = 0
+    for value, weight in zip(values, weights):
+      total_weight += weight
+      num_values += 1
+      for idx, leaf in enumerate(self._flatten(value)):
+        np.multiply(leaf, weight, out=scratch[idx])
+        np.add(accumulator[idx], scratch[idx], out=accumulator[idx])
+    if not num_values:
+      return self.zero()
+    if total_weight == 0:
+      raise ZeroDivisionError('The weights of the values sum to zero.')
+    return self._pack([
+        self._cast(idx, np.divide(accumulator[idx], total_weight))
+        for idx in range(len(self._dtypes))
+    ])
+
+  def multiply_by_scalar(self, value, multiplier):
+    """Returns `value` multiplied by a scalar `multiplier`.
+
+    Args:
+      value: A value of the type of this plan.
+      multiplier: A Python or NumPy scalar.
+
+    Returns:
+      The product, with the same dtypes as `value`.
+    """
+    return self._pack([
+        self._cast(idx, np.multiply(leaf, multiplier))
+        for idx, leaf in enumerate(self._flatten(value))
+    ])
+
+  def _zero_leaves(self):
+    leaves = []
+    for dtype, shape in zip(self._dtypes, self._shapes):
+      if shape:
+        leaves.append(np.zeros(shape, dtype))
+      else:
+        leaves.append(dtype.type(0))
+    return leaves
+
+  def _add_leaves_into(self, accumulator, leaves):
+    for idx, leaf in enumerate(leaves):
+      if isinstance(accumulator[idx], np.ndarray):
+        np.add(accumulator[idx], leaf, out=accumulator[idx])
+      else:
+        accumulator[idx] = self._cast(idx, np.add(accumulator[idx], leaf))
+
+  def _cast(self, idx, value):
+    dtype = self._dtypes[idx]
+    if isinstance(value, np.ndarray):
+      return value.astype(dtype, copy=False)
+    return dtype.type(value)
+
+  def _flatten(self, value):
+    return self._structure_plan.flatten(value)
+
+  def _pack(self, leaves):
+    return self._structure_plan.pack(leaves)
+
+
+def is_supported_type(type_spec):
+  """Returns whether an `ArithmeticPlan` can be constructed for `type_spec`.
+
+  Args:
+    type_spec: An instance of `computation_types.Type`.
+
+  Returns:
+    `True` if `type_spec` is composed only of tensor and named tuple types, with
+    numeric or boolean tensors of fully defined shapes, and `False` otherwise.
+  """
+  if not type_utils.check_whitelisted(
+      type_spec,
+      (computation_types.TensorType, computation_types.NamedTupleType)):
+    return False
+  for leaf_type in anonymous_tuple.flatten(type_spec):
+    if not leaf_type.shape.is_fully_defined():
+      return False
+    if not (leaf_type.dtype.is_bool or leaf_type.dtype.is_integer or
+            leaf_type.dtype.is_floating or leaf_type.dtype.is_complex):
+      return False
+  return True
+
+
+def get_arithmetic_plan(type_spec):
+  """Returns a (possibly cached) `ArithmeticPlan` for `type_spec`.
+
+  Args:
+    type_spec: An instance of `computation_types.Type`.
+
+  Returns:
+    An instance of `ArithmeticPlan`, or `None` if `type_spec` is not supported.
+  """
+  py_typecheck.check_type(type_spec, computation_types.Type)
+  key = type_spec
+  plan = _plans.get(key, _NOT_CACHED)
+  if plan is _NOT_CACHED:
+    plan = ArithmeticPlan(type_spec) if is_supported_type(type_spec) else None
+    _plans.put(key, plan)
+  return plan
+
+
+# Plans are small, and there are usually few distinct types to sum over in the
+# lifetime of a process.
+_plans = lru_cache.LruCache(1000)
+
+_NOT_CACHED = object()
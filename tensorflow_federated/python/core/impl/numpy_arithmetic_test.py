@@ -0,0 +1,160 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for numpy_arithmetic.py."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from absl.testing import absltest
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl import numpy_arithmetic
+
+
+class NumpyArithmeticTest(absltest.TestCase):
+
+  def test_is_supported_type(self):
+    self.assertTrue(numpy_arithmetic.is_supported_type(
+        computation_types.to_type(tf.int32)))
+    self.assertTrue(numpy_arithmetic.is_supported_type(
+        computation_types.to_type([('a', (tf.float32, [2])), ('b', tf.bool)])))
+    self.assertFalse(numpy_arithmetic.is_supported_type(
+        computation_types.to_type(tf.string)))
+    self.assertFalse(numpy_arithmetic.is_supported_type(
+        computation_types.to_type((tf.float32, [None]))))
+    self.assertFalse(numpy_arithmetic.is_supported_type(
+        computation_types.SequenceType(tf.int32)))
+
+  def test_get_arithmetic_plan_caches_plans(self):
+    plan = numpy_arithmetic.get_arithmetic_plan(
+        computation_types.to_type([tf.int32, tf.float32]))
+    self.assertIs(
+        numpy_arithmetic.get_arithmetic_plan(
+            computation_types.to_type([tf.int32, tf.float32])), plan)
+    self.assertIsNone(
+        numpy_arithmetic.get_arithmetic_plan(
+            computation_types.SequenceType(tf.int32)))
+
+  def test_zero_with_tensor_type(self):
+    plan = numpy_arithmetic.ArithmeticPlan(computation_types.to_type(tf.int32))
+    zero = plan.zero()
+    self.assertIsInstance(zero, np.int32)
+    self.assertEqual(zero, 0)
+
+  def test_zero_with_named_tuple_type(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([('a', (tf.float32, [2, 3])),
+                                   ('b', [('c', tf.int64)])]))
+    zero = plan.zero()
+    self.assertIsInstance(zero, anonymous_tuple.AnonymousTuple)
+    self.assertEqual(zero.a.dtype, np.float32)
+    np.testing.assert_array_equal(zero.a, np.zeros([2, 3]))
+    self.assertIsInstance(zero.b.c, np.int64)
+
+  def test_plus_with_named_tuple_type(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([('a', (tf.float32, [2])), ('b', tf.int32)]))
+    x = anonymous_tuple.AnonymousTuple([('a', np.array([1., 2.],
+                                                       dtype=np.float32)),
+                                        ('b', 3)])
+    y = anonymous_tuple.AnonymousTuple([('a', np.array([10., 20.],
+                                                       dtype=np.float32)),
+                                        ('b', 4)])
+    result = plan.plus(x, y)
+    self.assertEqual(str(result), '<a=[11. 22.],b=7>')
+    self.assertIsInstance(result.b, np.int32)
+    np.testing.assert_array_equal(x.a, [1., 2.])
+
+  def test_sum_does_not_modify_values(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type((tf.float32, [2])))
+    values = [np.array([1., 2.], dtype=np.float32) for _ in range(3)]
+    np.testing.assert_array_equal(plan.sum(values), [3., 6.])
+    for v in values:
+      np.testing.assert_array_equal(v, [1., 2.])
+
+  def test_sum_of_no_values_is_zero(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([tf.int32, tf.int32]))
+    self.assertEqual(str(plan.sum([])), '<0,0>')
+
+  def test_tree_sum_matches_sum(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([('a', (tf.float64, [3])), ('b', tf.int32)]))
+    values = [
+        anonymous_tuple.AnonymousTuple([('a', np.full([3], k, np.float64)),
+                                        ('b', k)]) for k in range(1, 12)
+    ]
+    expected = plan.sum(values)
+    for fan_in in [2, 3, 10, 11, 100]:
+      result = plan.tree_sum(iter(values), fan_in)
+      np.testing.assert_allclose(result.a, expected.a)
+      self.assertEqual(result.b, expected.b)
+    np.testing.assert_array_equal(values[0].a, [1., 1., 1.])
+
+  def test_tree_sum_with_bad_fan_in_fails(self):
+    plan = numpy_arithmetic.ArithmeticPlan(computation_types.to_type(tf.int32))
+    with self.assertRaises(ValueError):
+      plan.tree_sum([1, 2], 1)
+
+  def test_multiply_by_scalar_preserves_dtypes(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([(tf.float32, [2]), tf.float32]))
+    result = plan.multiply_by_scalar(
+        anonymous_tuple.AnonymousTuple([(None, np.array([1., 2.], np.float32)),
+                                        (None, np.float32(3.))]), 0.5)
+    np.testing.assert_allclose(result[0], [0.5, 1.])
+    self.assertEqual(result[0].dtype, np.float32)
+    self.assertIsInstance(result[1], np.float32)
+
+  def test_weighted_mean(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([('a', (tf.float32, [2])),
+                                   ('b', tf.float32)]))
+    values = [
+        anonymous_tuple.AnonymousTuple([('a', np.array([k, 2. * k],
+                                                       dtype=np.float32)),
+                                        ('b', np.float32(k))])
+        for k in range(1, 4)
+    ]
+    weights = [np.float32(1.), np.float32(2.), np.float32(3.)]
+    for accumulator_dtype in [None, np.float64]:
+      result = plan.weighted_mean(values, weights, accumulator_dtype)
+      np.testing.assert_allclose(result.a, [14. / 6., 28. / 6.], rtol=1e-6)
+      self.assertEqual(result.a.dtype, np.float32)
+      self.assertAlmostEqual(result.b, 14. / 6., places=6)
+      self.assertIsInstance(result.b, np.float32)
+
+  def test_weighted_mean_of_no_values_is_zero(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type([tf.float32, (tf.float32, [2])]))
+    result = plan.weighted_mean([], [])
+    self.assertEqual(result[0], 0.)
+    np.testing.assert_array_equal(result[1], [0., 0.])
+
+  def test_weighted_mean_with_zero_total_weight_fails(self):
+    plan = numpy_arithmetic.ArithmeticPlan(
+        computation_types.to_type(tf.float32))
+    with self.assertRaises(ZeroDivisionError):
+      plan.weighted_mean([np.float32(1.), np.float32(2.)],
+                         [np.float32(0.), np.float32(0.)])
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -0,0 +1,153 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An executor optimized for the performance of simulations.
+
+This executor shares the interpretation of computation building blocks and the
+value representations with the reference executor, and is tested against the
+same suite of tests, but it trades some of the simplicity of the reference
+executor for speed. In particular, it reuses the graphs and sessions it runs
+TensorFlow computations in, and it keeps the NumPy values fetched from these
+sessions as they are, rather than verifying and converting their representation
+each time a value crosses the TensorFlow graph boundary.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorflow_federated.python.core.impl import reference_executor
+
+
+class OptimizedExecutor(reference_executor.ReferenceExecutor):
+  """An executor optimized for the performance of simulations.
+
+  Unlike the `ReferenceExecutor`, which favors simplicity and is intended to
+  serve as the gold standard of correctness, this executor is intended for use
+  in simulations with many clients and rounds. The results it computes should
+  always match those of the reference executor.
+
+  TensorFlow computations run in the graphs and sessions retained in a session
+  cache, which is always enabled. The arguments and results of computations
+  that are served from the cache stay in the NumPy representation in which they
+  are fed into and fetched from the session. All other computations (e.g.,
+  those that consume or return sequences) run as in the reference executor.
+
+  Calls to TensorFlow are the only boundary at which values are converted.
+  Tuples, selections, blocks and references pass the computed values through
+  as they are, and the intrinsics operate on them in NumPy, so values computed
+  by cached TensorFlow computations are not converted again until the final
+  result is returned to the caller.
+  """
+
+  def __init__(self,
+               compiler=None,
+               session_cache=None,
+               map_parallelism=None,
+               aggregation_fan_in=None,
+               aggregation_accumulator_dtype=None,
+               compile_cache_size=100,
+               client_batch_size=None):
+    """Creates an optimized executor.
+
+    Args:
+      compiler: The compiler pipeline to be used by this executor, or `None` if
+        the executor is to run without one.
+      session_cache: An optional instance of
+        `reference_executor.TensorFlowSessionCache` to use for running compiled
+        TensorFlow computations. If `None`, the executor creates its own.
+      map_parallelism: The optional number of worker threads to use for
+        applying the mapping function in `federated_map` and `sequence_map`,
+        or `None` if these are to be evaluated sequentially.
+      aggregation_fan_in: The optional fan-in of the tree in which values are
+        summed by the aggregation intrinsics, or `None` if these are to be
+        summed left to right.
+      aggregation_accumulator_dtype: The optional floating point dtype in which
+        to accumulate the weighted sums computed by `federated_weighted_mean`,
+        or `None` to accumulate in the dtypes of the values being averaged.
+        Cannot be combined with `aggregation_fan_in`.
+      compile_cache_size: The maximum number of compiled computations to retain
+        for reuse, or `None` if each invocation is to be compiled anew.
+      client_batch_size: The optional maximum number of clients for which a
+        compiled TensorFlow computation mapped by `federated_map` is to run in a
+        single `session.run()`, or `None` if it is to run separately for each
+        client.
+    """
+    if session_cache is None:
+      session_cache = reference_executor.TensorFlowSessionCache()
+    super(OptimizedExecutor, self).__init__(
+        compiler=compiler,
+        session_cache=session_cache,
+        map_parallelism=map_parallelism,
+        aggregation_fan_in=aggregation_fan_in,
+        aggregation_accumulator_dtype=aggregation_accumulator_dtype,
+        compile_cache_size=compile_cache_size,
+        client_batch_size=client_batch_size)
+
+  @property
+  def session_cache(self):
+    return self._session_cache
+
+  def _run_tensorflow(self, comp, arg):
+    """Runs a compiled TensorFlow computation `comp` with argument `arg`.
+
+    Values computed by this executor are already in the representation that
+    `reference_executor.to_representation_for_type` produces, and the results
+    fetched from a session (NumPy arrays and scalars, in anonymous tuples) are
+    as well, so neither is converted on the way into or out of the session.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg: An instance of `reference_executor.ComputedValue` that represents the
+        argument, or `None` if the compuation expects no argument.
+
+    Returns:
+      An instance of `reference_executor.ComputedValue` with the result.
+    """
+    arg_type = arg.type_signature if arg is not None else None
+    prepared = self._session_cache.get_prepared_computation(comp, arg_type)
+    if prepared is None:
+      return reference_executor.run_tensorflow(comp, arg)
+    try:
+      result_val = prepared.run(arg.value if arg is not None else None)
+    finally:
+      prepared.release()
+    return reference_executor.ComputedValue(result_val,
+                                            comp.type_signature.result)
+
+  def _run_tensorflow_batch(self, comp, arg_type, arg_values):
+    """Runs `comp` on each of the `arg_values` in a single `session.run()`.
+
+    As in `_run_tensorflow`, neither the arguments nor the results are
+    converted on the way into or out of the session.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the arguments, or `None` if there are none.
+      arg_values: The list of the values of the arguments.
+
+    Returns:
+      The list of the values of the results, in the same order as `arg_values`,
+      or `None` if `comp` cannot be served from the session cache.
+    """
+    prepared = self._session_cache.get_prepared_batch(comp, arg_type,
+                                                      len(arg_values))
+    if prepared is None:
+      return None
+    try:
+      return prepared.run_batch(arg_values)
+    finally:
+      prepared.release()
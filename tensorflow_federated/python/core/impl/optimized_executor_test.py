@@ -0,0 +1,149 @@
+# Lint as: python3
+# Copyright 2019, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for optimized_executor.py."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import test
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.api import computations
+from tensorflow_federated.python.core.api import intrinsics
+from tensorflow_federated.python.core.api import placements
+from tensorflow_federated.python.core.impl import compiler_pipeline
+from tensorflow_federated.python.core.impl import context_stack_impl
+from tensorflow_federated.python.core.impl import optimized_executor
+from tensorflow_federated.python.core.impl import reference_executor
+from tensorflow_federated.python.core.impl import reference_executor_test
+
+
+class OptimizedExecutorTest(reference_executor_test.ReferenceExecutorTest):
+  """Runs the test suite of the reference executor against this executor.
+
+  The reference executor is the standard of correctness for this executor, so
+  this executor is expected to pass all the same tests, in addition to the ones
+  defined below.
+  """
+
+  def test_runs_tensorflow_in_session_cache(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    executor = optimized_executor.OptimizedExecutor()
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(bar([10, 20, 30]), [11, 21, 31])
+    self.assertEqual(executor.session_cache.misses, 1)
+    self.assertEqual(executor.session_cache.hits, 2)
+
+  def test_does_not_marshal_values_computed_in_session_cache(self):
+
+    def _fail(*args, **kwargs):
+      raise AssertionError('Unexpected marshaling of {}, {}.'.format(
+          args, kwargs))
+
+    for name in [
+        'capture_computed_value_from_graph', 'stamp_computed_value_into_graph'
+    ]:
+      self.addCleanup(setattr, reference_executor, name,
+                      getattr(reference_executor, name))
+      setattr(reference_executor, name, _fail)
+
+    @computations.tf_computation(tf.float32)
+    def foo(x):
+      return x + 1.0, x * 2.0
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.float32, placements.CLIENTS))
+    def bar(x):
+      y = intrinsics.federated_map(foo, x)
+      return (intrinsics.federated_sum(y), intrinsics.federated_mean(y),
+              intrinsics.federated_zip([y, y]))
+
+    with context_stack_impl.context_stack.install(
+        optimized_executor.OptimizedExecutor()):
+      total, mean, zipped = bar([1.0, 2.0, 3.0])
+    self.assertAlmostEqual(total[0], 9.0)
+    self.assertAlmostEqual(total[1], 12.0)
+    self.assertAlmostEqual(mean[0], 3.0)
+    self.assertAlmostEqual(mean[1], 4.0)
+    self.assertLen(zipped, 3)
+
+  def test_results_match_reference_executor(self):
+    model_type = computation_types.NamedTupleType([
+        ('weights', computation_types.TensorType(tf.float32, [3, 2])),
+        ('bias', computation_types.TensorType(tf.float32, [2])),
+    ])
+
+    @computations.tf_computation(model_type, tf.float32)
+    def scale(model, factor):
+      return collections.OrderedDict([
+          ('weights', model.weights * factor),
+          ('bias', model.bias + factor),
+      ])
+
+    @computations.federated_computation(
+        computation_types.FederatedType(model_type, placements.SERVER),
+        computation_types.FederatedType(tf.float32, placements.CLIENTS))
+    def foo(model, factors):
+      return intrinsics.federated_mean(
+          intrinsics.federated_map(
+              scale, [intrinsics.federated_broadcast(model), factors]))
+
+    model = collections.OrderedDict([
+        ('weights', np.arange(6, dtype=np.float32).reshape([3, 2])),
+        ('bias', np.ones([2], dtype=np.float32)),
+    ])
+    factors = [0.5, 1.0, 2.0]
+
+    with context_stack_impl.context_stack.install(
+        reference_executor.ReferenceExecutor()):
+      expected = foo(model, factors)
+    with optimized_executor.OptimizedExecutor(map_parallelism=2) as executor:
+      with context_stack_impl.context_stack.install(executor):
+        actual = foo(model, factors)
+    self.assertAllClose(
+        anonymous_tuple.flatten(actual), anonymous_tuple.flatten(expected))
+
+    compiler = compiler_pipeline.CompilerPipeline(
+        context_stack_impl.context_stack,
+        optimization_level=compiler_pipeline.FULL_OPTIMIZATION)
+    with context_stack_impl.context_stack.install(
+        optimized_executor.OptimizedExecutor(compiler)):
+      actual = foo(model, factors)
+    self.assertAllClose(
+        anonymous_tuple.flatten(actual), anonymous_tuple.flatten(expected))
+    self.assertEqual(compiler.pass_stats['simplify'].runs, 1)
+
+
+if __name__ == '__main__':
+  # As in the test of the reference executor, the computations are run without
+  # a compiler pipeline, so that each building block can be tested separately.
+  executor_without_compiler = optimized_executor.OptimizedExecutor()
+  with context_stack_impl.context_stack.install(executor_without_compiler):
+    test.main()
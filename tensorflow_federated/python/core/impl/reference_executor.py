@@ -26,6 +26,10 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import hashlib
+from multiprocessing import pool as multiprocessing_pool
+import threading
+import time
 
 import numpy as np
 import six
@@ -34,7 +38,9 @@ from six.moves import zip
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import lru_cache
 from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import serialization_utils
 from tensorflow_federated.python.core.api import computation_base
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import placements
@@ -45,6 +51,7 @@ from tensorflow_federated.python.core.impl import context_base
 from tensorflow_federated.python.core.impl import dtype_utils
 from tensorflow_federated.python.core.impl import graph_utils
 from tensorflow_federated.python.core.impl import intrinsic_defs
+from tensorflow_federated.python.core.impl import numpy_arithmetic
 from tensorflow_federated.python.core.impl import placement_literals
 from tensorflow_federated.python.core.impl import tensorflow_deserialization
 from tensorflow_federated.python.core.impl import transformations
@@ -102,7 +109,9 @@ def to_representation_for_type(value, type_spec, callable_handler=None):
 
   * For TFF named tuple types, instances of `anonymous_tuple.AnonymousTuple`.
 
-  * For TFF sequences, Python lists.
+  * For TFF sequences, Python lists, or `tf.data.Dataset`s created in eager
+    mode, which are kept as they are, so that their elements are produced only
+    if and when they are needed (see `to_sequence_elements`).
 
   * For TFF functional types, Python callables that accept a single argument
     that is an instance of `ComputedValue` (if the function has a parameter)
@@ -181,7 +190,7 @@ def to_representation_for_type(value, type_spec, callable_handler=None):
           'number of elements {} in the type spec {}.'.format(
               len(value_elements), str(value), len(type_spec_elements),
               str(type_spec)))
-    result_elements = []
+    result_values = []
     for index, (type_elem_name, type_elem) in enumerate(type_spec_elements):
       value_elem_name, value_elem = value_elements[index]
       if value_elem_name not in [type_elem_name, None]:
@@ -189,21 +198,26 @@ def to_representation_for_type(value, type_spec, callable_handler=None):
             'Found element named `{}` where `{}` was expected at position {} '
             'in the value tuple. Value: {}. Type: {}'.format(
                 value_elem_name, type_elem_name, index, value, type_spec))
-      converted_value_elem = to_representation_for_type(value_elem, type_elem,
-                                                        callable_handler)
-      result_elements.append((type_elem_name, converted_value_elem))
-    return anonymous_tuple.AnonymousTuple(result_elements)
+      result_values.append(
+          to_representation_for_type(value_elem, type_elem, callable_handler))
+    return anonymous_tuple.with_values(type_spec, result_values)
   elif isinstance(type_spec, computation_types.SequenceType):
-    if isinstance(value, tf.data.Dataset):
-      if tf.executing_eagerly():
-        return [
-            to_representation_for_type(v, type_spec.element, callable_handler)
-            for v in value
-        ]
-      else:
+    if isinstance(value, graph_utils.DATASET_REPRESENTATION_TYPES):
+      if not tf.executing_eagerly():
         raise ValueError(
             'Processing `tf.data.Datasets` outside of eager mode is not '
             'currently supported.')
+      ds_element_type = type_utils.tf_dtypes_and_shapes_to_type(
+          tf.compat.v1.data.get_output_types(value),
+          tf.compat.v1.data.get_output_shapes(value))
+      if type_utils.is_assignable_from(type_spec.element, ds_element_type):
+        return value
+      # The elements may still be convertible to the element type (e.g., if
+      # the type names the elements that the data set yields as plain tuples).
+      return [
+          to_representation_for_type(v, type_spec.element, callable_handler)
+          for v in value
+      ]
     return [
         to_representation_for_type(v, type_spec.element, callable_handler)
         for v in value
@@ -248,12 +262,69 @@ def to_representation_for_type(value, type_spec, callable_handler=None):
             str(value), str(type_spec)))
 
 
-def stamp_computed_value_into_graph(value, graph):
+def to_sequence_elements(value, type_spec):
+  """Returns the list of the elements of a sequence `value` of type `type_spec`.
+
+  Sequences may be represented lazily as `tf.data.Dataset`s, which this helper
+  iterates over, so it should only be called where the elements themselves are
+  needed, e.g., to evaluate `sequence_sum` in Python.
+
+  Args:
+    value: A sequence, in the representation returned by
+      `to_representation_for_type`.
+    type_spec: An instance of `computation_types.SequenceType`.
+
+  Returns:
+    A Python list of the elements of `value`.
+  """
+  py_typecheck.check_type(type_spec, computation_types.SequenceType)
+  if isinstance(value, graph_utils.DATASET_REPRESENTATION_TYPES):
+    return [to_representation_for_type(v, type_spec.element) for v in value]
+  return value
+
+
+def to_materialized_representation(value, type_spec):
+  """Replaces the lazy sequences nested in `value` with lists of elements.
+
+  Args:
+    value: A value in the representation returned by
+      `to_representation_for_type`.
+    type_spec: The TFF type of `value`.
+
+  Returns:
+    A representation of `value` in which all sequences are Python lists.
+  """
+  type_spec = computation_types.to_type(type_spec)
+  if isinstance(type_spec, computation_types.SequenceType):
+    return to_sequence_elements(value, type_spec)
+  elif isinstance(type_spec, computation_types.NamedTupleType):
+    return anonymous_tuple.with_values(type_spec, [
+        to_materialized_representation(value[idx], v)
+        for idx, v in enumerate(type_spec)
+    ])
+  elif (isinstance(type_spec, computation_types.FederatedType) and
+        not type_spec.all_equal):
+    return [to_materialized_representation(v, type_spec.member) for v in value]
+  elif isinstance(type_spec, computation_types.FederatedType):
+    return to_materialized_representation(value, type_spec.member)
+  else:
+    return value
+
+
+def stamp_computed_value_into_graph(value, graph, feed_dict=None):
   """Stamps `value` in `graph`.
 
+  By default, tensors are stamped as constants, which embeds a copy of each of
+  them in the graph. If a `feed_dict` is supplied, tensors are instead stamped
+  as placeholders, and their values are added to `feed_dict` to be fed into
+  the graph when it is run, so that the graph does not depend on, and does not
+  grow with, the values of the tensors.
+
   Args:
     value: An instance of `ComputedValue`.
     graph: The graph to stamp in.
+    feed_dict: An optional dictionary, to which the placeholders stamped for
+      tensors are added as keys, mapped to the values to feed into them.
 
   Returns:
     A Python object made of tensors stamped into `graph`, `tf.data.Dataset`s,
@@ -268,6 +339,8 @@ def stamp_computed_value_into_graph(value, graph):
         to_representation_for_type(value.value, value.type_signature),
         value.type_signature)
     py_typecheck.check_type(graph, tf.Graph)
+    if feed_dict is not None:
+      py_typecheck.check_type(feed_dict, dict)
     if isinstance(value.type_signature, computation_types.TensorType):
       if isinstance(value.value, np.ndarray):
         value_type = computation_types.TensorType(
@@ -275,25 +348,38 @@ def stamp_computed_value_into_graph(value, graph):
             tf.TensorShape(value.value.shape))
         type_utils.check_assignable_from(value.type_signature, value_type)
         with graph.as_default():
-          return tf.constant(value.value)
+          if feed_dict is None:
+            return tf.constant(value.value)
+          placeholder = tf.placeholder(
+              dtype=value_type.dtype, shape=value_type.shape)
       else:
         with graph.as_default():
-          return tf.constant(
-              value.value,
+          if feed_dict is None:
+            return tf.constant(
+                value.value,
+                dtype=value.type_signature.dtype,
+                shape=value.type_signature.shape)
+          placeholder = tf.placeholder(
               dtype=value.type_signature.dtype,
               shape=value.type_signature.shape)
+      feed_dict[placeholder] = value.value
+      return placeholder
     elif isinstance(value.type_signature, computation_types.NamedTupleType):
-      elements = anonymous_tuple.to_elements(value.value)
-      type_elements = anonymous_tuple.to_elements(value.type_signature)
-      stamped_elements = []
-      for idx, (k, v) in enumerate(elements):
-        computed_v = ComputedValue(v, type_elements[idx][1])
-        stamped_v = stamp_computed_value_into_graph(computed_v, graph)
-        stamped_elements.append((k, stamped_v))
-      return anonymous_tuple.AnonymousTuple(stamped_elements)
+      stamped_values = []
+      for v, v_type in zip(value.value, value.type_signature):
+        stamped_values.append(
+            stamp_computed_value_into_graph(
+                ComputedValue(v, v_type), graph, feed_dict))
+      return anonymous_tuple.with_values(value.value, stamped_values)
     elif isinstance(value.type_signature, computation_types.SequenceType):
+      if isinstance(value.value, graph_utils.DATASET_REPRESENTATION_TYPES):
+        ds = graph_utils.copy_data_set_into_graph(
+            value.value, graph, value.type_signature.element)
+        if ds is not None:
+          return ds
       return graph_utils.make_data_set_from_elements(
-          graph, value.value, value.type_signature.element)
+          graph, to_sequence_elements(value.value, value.type_signature),
+          value.type_signature.element)
     else:
       raise NotImplementedError(
           'Unable to embed a computed value of type {} in graph.'.format(
@@ -318,7 +404,405 @@ def capture_computed_value_from_graph(value, type_spec):
   return ComputedValue(to_representation_for_type(value, type_spec), type_spec)
 
 
-def run_tensorflow(comp, arg):
+class _PreparedTensorFlowComputation(object):
+  """A TensorFlow computation imported into a graph with a live session.
+
+  The parameter of the computation is stamped into the graph as a structure of
+  placeholders, so that the same graph and session can be reused to run the
+  computation on any number of arguments of the same type.
+
+  If a `batch_size` is specified, the graph contains that many independent
+  copies of the computation, each with its own placeholders and variables, so
+  that the computation can be run on a batch of arguments (e.g., one for each
+  client in a `federated_map`) in a single `session.run()`.
+
+  A computation with variables (i.e., with an initializer) must only be run by
+  one thread at a time, which `_PreparedComputationPool` ensures by checking
+  out such computations to one caller at a time.
+  """
+
+  def __init__(self, comp, arg_type, batch_size, pool):
+    """Imports `comp` into a new graph and opens a session to run it in.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the arguments to feed to the computation (an
+        instance of `computation_types.Type`), or `None` if it declares no
+        parameter.
+      batch_size: The optional number of copies of the computation to import
+        for use with `run_batch()`, or `None` to import a single one for use
+        with `run()`.
+      pool: The instance of `_PreparedComputationPool` this computation is
+        checked out from, and returned to by `release()`.
+    """
+    self._graph = tf.Graph()
+    self._batch_size = batch_size
+    self._pool = pool
+    self._arg_plan = (
+        anonymous_tuple.get_structure_plan(arg_type)
+        if arg_type is not None else None)
+    self._placeholders = []
+    init_ops = []
+    results = []
+    plan = comp.deserialization_plan
+    for idx in range(batch_size if batch_size is not None else 1):
+      stamped_arg, _ = graph_utils.stamp_parameter_in_graph(
+          'arg_{}'.format(idx) if batch_size is not None else 'arg', arg_type,
+          self._graph)
+      init_op, result = (
+          tensorflow_deserialization.deserialize_and_call_tf_computation(
+              comp.proto, stamped_arg, self._graph, plan=plan))
+      if stamped_arg is not None:
+        self._placeholders.extend(self._arg_plan.flatten(stamped_arg))
+      if init_op:
+        init_ops.append(init_op)
+      results.append(result)
+    if not init_ops:
+      self._init_op = None
+    elif len(init_ops) == 1:
+      self._init_op = init_ops[0]
+    else:
+      with self._graph.as_default():
+        self._init_op = tf.group(*init_ops)
+    if batch_size is None:
+      self._result = results[0]
+    else:
+      self._result = anonymous_tuple.AnonymousTuple([(None, r) for r in results
+                                                    ])
+    self._fetcher = graph_utils.ValueFetcher(self._result)
+    self._graph.finalize()
+    self._session = tf.Session(graph=self._graph)
+
+  @property
+  def has_variables(self):
+    """Whether the computation initializes variables in each run."""
+    return self._init_op is not None
+
+  def release(self):
+    """Returns the computation to the pool it has been checked out from."""
+    self._pool.check_in(self)
+
+  def run(self, arg_value):
+    """Runs the computation on `arg_value`, and returns the fetched result.
+
+    Args:
+      arg_value: The value of the argument, in the representation returned by
+        `to_representation_for_type`, or `None` if there is no argument.
+
+    Returns:
+      The result fetched with `graph_utils.fetch_value_in_session`.
+    """
+    if self._batch_size is not None:
+      raise ValueError('Use `run_batch()` to run a batch of computations.')
+    return self._run(
+        self._arg_plan.flatten(arg_value) if self._placeholders else [])
+
+  def run_batch(self, arg_values):
+    """Runs the copies of the computation on `arg_values` in a single run.
+
+    Args:
+      arg_values: The list of the values of the arguments, one for each copy of
+        the computation, in the representation returned by
+        `to_representation_for_type`, or `None`s if there is no argument.
+
+    Returns:
+      The list of the results, in the same order as `arg_values`.
+    """
+    if self._batch_size is None or len(arg_values) != self._batch_size:
+      raise ValueError(
+          'Expected a batch of {} arguments, found {}.'.format(
+              self._batch_size, len(arg_values)))
+    flat_values = []
+    if self._placeholders:
+      for arg_value in arg_values:
+        flat_values.extend(self._arg_plan.flatten(arg_value))
+    return [v for _, v in anonymous_tuple.to_elements(self._run(flat_values))]
+
+  def _run(self, flat_values):
+    if flat_values:
+      feed_dict = dict(zip(self._placeholders, flat_values))
+    else:
+      feed_dict = None
+    if self._init_op is not None:
+      self._session.run(self._init_op, feed_dict=feed_dict)
+    return self._fetcher.fetch(self._session, feed_dict)
+
+  def close(self):
+    """Closes the session."""
+    self._session.close()
+
+
+class _PreparedComputationPool(object):
+  """The copies of a computation prepared to run for concurrent callers.
+
+  A computation without variables is prepared once, and its session is shared
+  by all callers, since it can run any number of steps concurrently. Since the
+  variables of a computation are reinitialized in each run, a computation with
+  variables is instead checked out to a single caller at a time, and a new copy
+  is prepared whenever all the existing ones are in use, so that concurrent
+  calls (e.g., from the worker threads of a `federated_map`) do not wait for one
+  another. Copies that are checked in are kept for reuse, so the pool grows to
+  the largest number of concurrent callers, and no further.
+  """
+
+  def __init__(self, comp, arg_type, batch_size):
+    """Prepares the first copy of `comp` (see `_PreparedTensorFlowComputation`).
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the arguments, or `None` if there are none.
+      batch_size: The optional number of copies of the computation to import
+        into each graph, as in `_PreparedTensorFlowComputation`.
+    """
+    self._comp = comp
+    self._arg_type = arg_type
+    self._batch_size = batch_size
+    first_copy = self.make_copy()
+    if first_copy.has_variables:
+      self._shared = None
+      self._idle = [first_copy]
+    else:
+      self._shared = first_copy
+      self._idle = []
+    self._lock = threading.Lock()
+    self._num_in_use = 0
+    self._closed = False
+
+  def check_out(self):
+    """Checks out a copy of the computation for the caller to run.
+
+    Returns:
+      An instance of `_PreparedTensorFlowComputation`, on which the caller is
+      responsible for calling `release()` when done, or `None` if all copies
+      are in use, in which case the caller must prepare its own one with
+      `make_copy()`, and likewise release it when done.
+    """
+    with self._lock:
+      self._num_in_use += 1
+      if self._shared is not None:
+        return self._shared
+      if self._idle:
+        return self._idle.pop()
+      return None
+
+  def make_copy(self):
+    """Prepares a new copy of the computation, owned by this pool."""
+    return _PreparedTensorFlowComputation(self._comp, self._arg_type,
+                                          self._batch_size, self)
+
+  def check_in(self, prepared):
+    """Returns `prepared` to the pool, or closes it if the pool is closed."""
+    with self._lock:
+      self._num_in_use -= 1
+      if prepared is self._shared:
+        if not self._closed or self._num_in_use:
+          return
+      elif not self._closed:
+        self._idle.append(prepared)
+        return
+    prepared.close()
+
+  def close(self):
+    """Closes the copies as soon as they are no longer in use."""
+    with self._lock:
+      self._closed = True
+      to_close, self._idle = self._idle, []
+      if self._shared is not None and not self._num_in_use:
+        to_close.append(self._shared)
+    for prepared in to_close:
+      prepared.close()
+
+
+# Ops that carry state across `session.run()` calls that is not reset by the
+# initializer of a computation, and that would thus make the results of a
+# computation depend on whether the graph has been reused.
+_OPS_WITH_SESSION_STATE = frozenset([
+    'AnonymousIterator',
+    'AnonymousIteratorV2',
+    'HashTable',
+    'HashTableV2',
+    'Iterator',
+    'IteratorV2',
+    'MutableDenseHashTable',
+    'MutableDenseHashTableV2',
+    'MutableHashTable',
+    'MutableHashTableOfTensors',
+    'MutableHashTableOfTensorsV2',
+    'MutableHashTableV2',
+    'OneShotIterator',
+])
+
+
+def _is_graph_reusable(graph_def):
+  """Returns whether a computation with `graph_def` can run in a shared session.
+
+  A graph is not considered reusable if it contains ops that carry state from
+  one run to the next (such as iterators or hash tables), or seeded random ops,
+  which would produce a different sequence of values with each run in the same
+  session, rather than a repeated one.
+
+  Args:
+    graph_def: An instance of `tf.GraphDef`.
+
+  Returns:
+    `True` if the graph can be reused, and `False` otherwise.
+  """
+  nodes = list(graph_def.node)
+  for function in graph_def.library.function:
+    nodes.extend(function.node_def)
+  for node in nodes:
+    if node.op in _OPS_WITH_SESSION_STATE:
+      return False
+    for attr_name in ['seed', 'seed2']:
+      if attr_name in node.attr and node.attr[attr_name].i:
+        return False
+  return True
+
+
+class TensorFlowSessionCache(object):
+  """A cache of graphs and sessions prepared to run TensorFlow computations.
+
+  Running a TensorFlow computation in `run_tensorflow` normally involves the
+  construction of a new graph, importing the serialized graph of the compiled
+  computation into it, and opening a new session. This cache retains a bounded
+  number of graphs with the parameters stamped as placeholders, together with
+  the sessions to run them in, so that repeated invocations of the same compiled
+  computation on arguments of the same type only need to feed and fetch values.
+
+  The cache is keyed by the fingerprint of the computation and the type of the
+  argument, so it is shared by all occurrences of identical computations. It
+  only serves computations with parameters and results composed of tensors and
+  named tuples, whose graphs do not carry any state across runs other than the
+  variables initialized at the beginning of each invocation. The least recently
+  used entries are evicted, and their sessions closed, when the cache is full.
+
+  Each entry is a pool of copies of the prepared computation, so that the same
+  computation can be run by multiple threads at once (see
+  `_PreparedComputationPool`).
+  """
+
+  def __init__(self, max_size=100):
+    """Constructs an empty cache.
+
+    Args:
+      max_size: The maximum number of pools of prepared computations to retain.
+    """
+    self._entries = lru_cache.LruCache(max_size, on_evict=_close_if_prepared)
+    # Guards the preparation of computations, so that concurrent misses on the
+    # same key do not import the same graph more than once, and a copy can be
+    # checked out of an entry before it has a chance to get evicted.
+    self._lock = threading.Lock()
+
+  @property
+  def hits(self):
+    return self._entries.hits
+
+  @property
+  def misses(self):
+    return self._entries.misses
+
+  def __len__(self):
+    return len(self._entries)
+
+  def clear(self):
+    """Drops all the cached computations, and closes their sessions."""
+    with self._lock:
+      self._entries.clear()
+
+  def get_prepared_computation(self, comp, arg_type):
+    """Returns `comp` prepared to run on arguments of type `arg_type`.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the argument (an instance of
+        `computation_types.Type`), or `None` if there is no argument.
+
+    Returns:
+      An instance of `_PreparedTensorFlowComputation` that has been checked out
+      on behalf of the caller, who is responsible for calling `release()` on it
+      when done, or `None` if the computation cannot be served from this cache.
+    """
+    return self._get_prepared(comp, arg_type, None)
+
+  def get_prepared_batch(self, comp, arg_type, batch_size):
+    """Returns `batch_size` copies of `comp` prepared to run in a single run.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the arguments (an instance of
+        `computation_types.Type`), or `None` if there are no arguments.
+      batch_size: The number of copies of the computation, a positive integer.
+
+    Returns:
+      An instance of `_PreparedTensorFlowComputation` to call `run_batch()` on,
+      checked out as in `get_prepared_computation()`, or `None` if the
+      computation cannot be served from this cache.
+    """
+    py_typecheck.check_type(batch_size, int)
+    return self._get_prepared(comp, arg_type, batch_size)
+
+  def _get_prepared(self, comp, arg_type, batch_size):
+    py_typecheck.check_type(comp,
+                            computation_building_blocks.CompiledComputation)
+    key = (comp.fingerprint, arg_type, batch_size)
+    with self._lock:
+      pool = self._entries.get(key, _NOT_CACHED)
+      if pool is _NOT_CACHED:
+        if _is_cacheable(comp, arg_type):
+          pool = _PreparedComputationPool(comp, arg_type, batch_size)
+        else:
+          pool = None
+        self._entries.put(key, pool)
+      if pool is None:
+        return None
+      prepared = pool.check_out()
+    # Additional copies of a computation with variables, for use by concurrent
+    # callers, are prepared without blocking the rest of the cache.
+    if prepared is None:
+      prepared = pool.make_copy()
+    return prepared
+
+
+def _is_cacheable(comp, arg_type):
+  """Returns whether `comp` on `arg_type` can use `TensorFlowSessionCache`."""
+  tensors_and_tuples = (computation_types.TensorType,
+                        computation_types.NamedTupleType)
+  if arg_type is not None:
+    if not type_utils.check_whitelisted(arg_type, tensors_and_tuples):
+      return False
+    # The placeholders are stamped with the shapes declared by `arg_type`, so
+    # these must be at least as specific as those the computation expects.
+    parameter_type = comp.type_signature.parameter
+    if (parameter_type is None or
+        not type_utils.is_assignable_from(parameter_type, arg_type)):
+      return False
+  if not type_utils.check_whitelisted(comp.type_signature.result,
+                                      tensors_and_tuples):
+    return False
+  return _is_graph_reusable(
+      serialization_utils.unpack_graph_def(comp.proto.tensorflow.graph_def))
+
+
+def _close_if_prepared(value):
+  if value is not None:
+    value.close()
+
+
+# A sentinel that marks computations missing from `TensorFlowSessionCache`, as
+# distinct from `None`, which marks computations that cannot be cached.
+_NOT_CACHED = object()
+
+# The names of the pairs of values passed to the reduction operators, e.g., in
+# `sequence_reduce`, which are constructed with the fast path of
+# `anonymous_tuple.from_names_and_values()`.
+_UNNAMED_PAIR = (None, None)
+
+
+def run_tensorflow(comp, arg, session_cache=None):
   """Runs a compiled TensorFlow computation `comp` with argument `arg`.
 
   Args:
@@ -326,6 +810,8 @@ def run_tensorflow(comp, arg):
       embedded TensorFlow code.
     arg: An instance of `ComputedValue` that represents the argument, or `None`
       if the compuation expects no argument.
+    session_cache: An optional instance of `TensorFlowSessionCache` to reuse
+      the graphs and sessions prepared for `comp` across invocations.
 
   Returns:
     An instance of `ComputedValue` with the result.
@@ -333,19 +819,58 @@ def run_tensorflow(comp, arg):
   py_typecheck.check_type(comp, computation_building_blocks.CompiledComputation)
   if arg is not None:
     py_typecheck.check_type(arg, ComputedValue)
+  if session_cache is not None:
+    py_typecheck.check_type(session_cache, TensorFlowSessionCache)
+    if arg is not None:
+      arg_type = arg.type_signature
+      arg_value = to_representation_for_type(arg.value, arg_type)
+    else:
+      arg_type = None
+      arg_value = None
+    prepared = session_cache.get_prepared_computation(comp, arg_type)
+    if prepared is not None:
+      try:
+        result_val = prepared.run(arg_value)
+      finally:
+        prepared.release()
+      return capture_computed_value_from_graph(result_val,
+                                               comp.type_signature.result)
+  # The tensors in the argument are fed into the graph rather than embedded in
+  # it as constants, so that they are not copied into the graph.
+  feed_dict = {}
   with tf.Graph().as_default() as graph:
-    stamped_arg = stamp_computed_value_into_graph(arg, graph)
+    stamped_arg = stamp_computed_value_into_graph(arg, graph, feed_dict)
     init_op, result = (
         tensorflow_deserialization.deserialize_and_call_tf_computation(
-            comp.proto, stamped_arg, graph))
+            comp.proto, stamped_arg, graph, plan=comp.deserialization_plan))
   with tf.Session(graph=graph) as sess:
     if init_op:
-      sess.run(init_op)
-    result_val = graph_utils.fetch_value_in_session(sess, result)
+      sess.run(init_op, feed_dict=feed_dict)
+    result_val = graph_utils.fetch_value_in_session(sess, result, feed_dict)
   return capture_computed_value_from_graph(result_val,
                                            comp.type_signature.result)
 
 
+class _TensorFlowFunction(object):
+  """The value of a compiled TensorFlow computation in the executor.
+
+  Calling it runs the computation on a single argument. The computation itself
+  is retained, so that an intrinsic such as `federated_map` can recognize it
+  and run it on many arguments at once.
+  """
+
+  def __init__(self, comp, run_fn):
+    self._comp = comp
+    self._run_fn = run_fn
+
+  @property
+  def comp(self):
+    return self._comp
+
+  def __call__(self, arg):
+    return self._run_fn(self._comp, arg)
+
+
 def numpy_cast(value, dtype, shape):
   """Returns a Numpy representation of `value` for given `dtype` and `shape`.
 
@@ -394,15 +919,13 @@ def multiply_by_scalar(value, multiplier):
                             value.type_signature.shape)
     return ComputedValue(result_val, value.type_signature)
   elif isinstance(value.type_signature, computation_types.NamedTupleType):
-    elements = anonymous_tuple.to_elements(value.value)
-    type_elements = anonymous_tuple.to_elements(value.type_signature)
-    result_elements = []
-    for idx, (k, v) in enumerate(elements):
-      multiplied_v = multiply_by_scalar(
-          ComputedValue(v, type_elements[idx][1]), multiplier).value
-      result_elements.append((k, multiplied_v))
+    result_values = [
+        multiply_by_scalar(ComputedValue(v, v_type), multiplier).value
+        for v, v_type in zip(value.value, value.type_signature)
+    ]
     return ComputedValue(
-        anonymous_tuple.AnonymousTuple(result_elements), value.type_signature)
+        anonymous_tuple.with_values(value.value, result_values),
+        value.type_signature)
   else:
     raise NotImplementedError(
         'Multiplying vlues of type {} by a scalar is unsupported.'.format(
@@ -552,15 +1075,14 @@ def fit_argument(arg, type_spec, context):
     return arg
   elif isinstance(type_spec, computation_types.NamedTupleType):
     py_typecheck.check_type(arg.value, anonymous_tuple.AnonymousTuple)
-    result_elements = []
-    for idx, (elem_name,
-              elem_type) in enumerate(anonymous_tuple.to_elements(type_spec)):
+    result_values = []
+    for idx, elem_type in enumerate(type_spec):
       elem_val = ComputedValue(arg.value[idx], arg.type_signature[idx])
       if elem_val != elem_type:
         elem_val = fit_argument(elem_val, elem_type, context)
-      result_elements.append((elem_name, elem_val.value))
+      result_values.append(elem_val.value)
     return ComputedValue(
-        anonymous_tuple.AnonymousTuple(result_elements), type_spec)
+        anonymous_tuple.with_values(type_spec, result_values), type_spec)
   elif isinstance(type_spec, computation_types.FederatedType):
     type_utils.check_federated_type(
         arg.type_signature, placement=type_spec.placement)
@@ -590,6 +1112,34 @@ def fit_argument(arg, type_spec, context):
     return arg
 
 
+class CompilationStats(object):
+  """Counters that describe the compilation work done by an executor.
+
+  Attributes:
+    calls: The number of computations submitted for compilation.
+    cache_hits: The number of those served from the compile cache.
+    total_seconds: The total time spent in compilation, in seconds, including
+      the lookups in the compile cache.
+    last_call_seconds: The time spent compiling the most recently submitted
+      computation, in seconds.
+    deserialization_seconds: The part of `total_seconds` spent deserializing
+      compiled computations into building blocks, in seconds.
+  """
+
+  def __init__(self):
+    self.calls = 0
+    self.cache_hits = 0
+    self.total_seconds = 0.0
+    self.last_call_seconds = 0.0
+    self.deserialization_seconds = 0.0
+
+  def __str__(self):
+    return ('CompilationStats(calls={}, cache_hits={}, total_seconds={:.6f}, '
+            'last_call_seconds={:.6f}, deserialization_seconds={:.6f})'.format(
+                self.calls, self.cache_hits, self.total_seconds,
+                self.last_call_seconds, self.deserialization_seconds))
+
+
 class ReferenceExecutor(context_base.Context):
   """A simple interpreted reference executor.
 
@@ -606,19 +1156,113 @@ class ReferenceExecutor(context_base.Context):
   the handler of computation invocations at the top level of the context stack.
   """
 
-  def __init__(self, compiler=None):
+  def __init__(self,
+               compiler=None,
+               session_cache=None,
+               map_parallelism=None,
+               aggregation_fan_in=None,
+               aggregation_accumulator_dtype=None,
+               compile_cache_size=100,
+               client_batch_size=None):
     """Creates a reference executor.
 
     Args:
       compiler: The compiler pipeline to be used by this executor, or `None` if
         the executor is to run without one.
+      session_cache: An optional instance of `TensorFlowSessionCache` to use
+        for running compiled TensorFlow computations, or `None` if each of the
+        invocations is to run in a new graph and session.
+      map_parallelism: The optional number of worker threads to use for
+        applying the mapping function to the individual members of federated
+        values and sequences in `federated_map` and `sequence_map`, or `None`
+        if these are to be evaluated sequentially on the calling thread. The
+        threads are shut down by `close()`.
+      aggregation_fan_in: The optional fan-in of the tree in which the values of
+        numeric tensors and named tuples thereof are summed by `federated_sum`,
+        `federated_mean`, `federated_weighted_mean` and `sequence_sum`, or
+        `None` if these are to be summed left to right. If `map_parallelism`
+        is also set, the subtrees over the members of a federated value are
+        summed in parallel.
+      aggregation_accumulator_dtype: The optional floating point dtype (e.g.,
+        `tf.float64`) in which to accumulate the weighted sums computed by
+        `federated_weighted_mean`, or `None` to accumulate in the dtypes of the
+        values being averaged. Cannot be combined with `aggregation_fan_in`.
+      compile_cache_size: The maximum number of compiled computations to retain
+        for reuse when the same computation is invoked again, or `None` if each
+        invocation is to be compiled anew.
+      client_batch_size: The optional maximum number of clients for which a
+        compiled TensorFlow computation mapped by `federated_map` is to run in a
+        single `session.run()`, or `None` if it is to run separately for each
+        client. Requires a `session_cache`. Mapping functions that are not
+        compiled computations, or that cannot be served from the session cache,
+        are always run separately for each client.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+      ValueError: If `map_parallelism`, `compile_cache_size` or
+        `client_batch_size` is not positive, `aggregation_fan_in` is less than
+        2, `aggregation_accumulator_dtype` is not a floating point dtype or is
+        set along with `aggregation_fan_in`, or `client_batch_size` is set
+        without a `session_cache`.
     """
     # TODO(b/113116813): Add a way to declare environmental bindings here,
     # e.g., a way to specify how data URIs are mapped to physical resources.
 
     if compiler is not None:
       py_typecheck.check_type(compiler, compiler_pipeline.CompilerPipeline)
+    if session_cache is not None:
+      py_typecheck.check_type(session_cache, TensorFlowSessionCache)
+    if map_parallelism is not None:
+      py_typecheck.check_type(map_parallelism, int)
+      if map_parallelism < 1:
+        raise ValueError(
+            'The map parallelism must be positive, found {}.'.format(
+                map_parallelism))
+    if aggregation_fan_in is not None:
+      py_typecheck.check_type(aggregation_fan_in, int)
+      if aggregation_fan_in < 2:
+        raise ValueError(
+            'The aggregation fan-in must be at least 2, found {}.'.format(
+                aggregation_fan_in))
+    if aggregation_accumulator_dtype is not None:
+      aggregation_accumulator_dtype = tf.as_dtype(aggregation_accumulator_dtype)
+      if not aggregation_accumulator_dtype.is_floating:
+        raise ValueError(
+            'The aggregation accumulator dtype must be a floating point dtype, '
+            'found {}.'.format(str(aggregation_accumulator_dtype)))
+      if aggregation_fan_in is not None:
+        raise ValueError(
+            'The aggregation accumulator dtype is only supported when values '
+            'are summed left to right, not with an aggregation fan-in.')
+      aggregation_accumulator_dtype = (
+          aggregation_accumulator_dtype.as_numpy_dtype)
+    if client_batch_size is not None:
+      py_typecheck.check_type(client_batch_size, int)
+      if client_batch_size < 1:
+        raise ValueError(
+            'The client batch size must be positive, found {}.'.format(
+                client_batch_size))
+      if session_cache is None:
+        raise ValueError('Batching clients requires a session cache.')
     self._compiler = compiler
+    self._session_cache = session_cache
+    self._map_parallelism = map_parallelism
+    self._aggregation_fan_in = aggregation_fan_in
+    self._aggregation_accumulator_dtype = aggregation_accumulator_dtype
+    self._client_batch_size = client_batch_size
+    self._map_pool = None
+    self._map_pool_lock = threading.Lock()
+    self._map_thread_state = threading.local()
+    if compile_cache_size is not None:
+      # Compiled computations are looked up first by the identity of the proto
+      # of the computation, and only if that fails, by its fingerprint, which is
+      # more costly to compute, but it is shared by equal computations.
+      self._compiled_by_proto_id = lru_cache.LruCache(compile_cache_size)
+      self._compiled_by_fingerprint = lru_cache.LruCache(compile_cache_size)
+    else:
+      self._compiled_by_proto_id = None
+      self._compiled_by_fingerprint = None
+    self._compilation_stats = CompilationStats()
     self._intrinsic_method_dict = {
         intrinsic_defs.FEDERATED_AGGREGATE.uri:
             self._federated_aggregate,
@@ -679,7 +1323,8 @@ class ReferenceExecutor(context_base.Context):
       if arg is not None:
         raise TypeError('Unexpected argument {}.'.format(str(arg)))
       else:
-        value = computed_comp.value
+        value = to_materialized_representation(computed_comp.value,
+                                               computed_comp.type_signature)
         result_type = fn.type_signature.result
         if type_utils.is_anon_tuple_with_py_container(value, result_type):
           return type_utils.convert_to_py_container(value, result_type)
@@ -705,15 +1350,43 @@ class ReferenceExecutor(context_base.Context):
       py_typecheck.check_type(result, ComputedValue)
       type_utils.check_assignable_from(comp.type_signature.result,
                                        result.type_signature)
-      value = result.value
+      value = to_materialized_representation(result.value,
+                                             result.type_signature)
       fn_result_type = fn.type_signature.result
       if type_utils.is_anon_tuple_with_py_container(value, fn_result_type):
         return type_utils.convert_to_py_container(value, fn_result_type)
       return value
 
+  @property
+  def compilation_stats(self):
+    """Returns the `CompilationStats` of this executor."""
+    return self._compilation_stats
+
+  def close(self):
+    """Shuts down the worker threads used for `map_parallelism`, if any.
+
+    The executor can still be used after it is closed, in which case a new pool
+    of worker threads is started when one is next needed.
+    """
+    with self._map_pool_lock:
+      map_pool = self._map_pool
+      self._map_pool = None
+    if map_pool is not None:
+      map_pool.close()
+      map_pool.join()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
   def _compile(self, comp):
     """Compiles a `computation_base.Computation` to prepare it for execution.
 
+    Compiled computations are retained in the compile cache (if enabled), and
+    reused when the same computation is invoked again.
+
     Args:
       comp: An instance of `computation_base.Computation`.
 
@@ -722,11 +1395,46 @@ class ReferenceExecutor(context_base.Context):
       contains the compiled logic of `comp`.
     """
     py_typecheck.check_type(comp, computation_base.Computation)
+    start_time = time.time()
+    compiled_comp, cache_hit = self._compile_with_cache(comp)
+    elapsed_seconds = time.time() - start_time
+    stats = self._compilation_stats
+    stats.calls += 1
+    if cache_hit:
+      stats.cache_hits += 1
+    stats.total_seconds += elapsed_seconds
+    stats.last_call_seconds = elapsed_seconds
+    return compiled_comp
+
+  def _compile_with_cache(self, comp):
+    """Returns a tuple (compiled computation, whether it was cached)."""
+    if self._compiled_by_proto_id is None:
+      return self._compile_uncached(comp), False
+    proto = computation_impl.ComputationImpl.get_proto(comp)
+    # The entries hold on to the proto, so its identity can not be reused.
+    entry = self._compiled_by_proto_id.get(id(proto))
+    if entry is not None and entry[0] is proto:
+      return entry[1], True
+    fingerprint = hashlib.sha256(
+        proto.SerializeToString(deterministic=True)).hexdigest()
+    compiled_comp = self._compiled_by_fingerprint.get(fingerprint)
+    cache_hit = compiled_comp is not None
+    if not cache_hit:
+      compiled_comp = self._compile_uncached(comp)
+      self._compiled_by_fingerprint.put(fingerprint, compiled_comp)
+    self._compiled_by_proto_id.put(id(proto), (proto, compiled_comp))
+    return compiled_comp, cache_hit
+
+  def _compile_uncached(self, comp):
     if self._compiler is not None:
       comp = self._compiler.compile(comp)
+    start_time = time.time()
+    comp = computation_building_blocks.ComputationBuildingBlock.from_proto(
+        computation_impl.ComputationImpl.get_proto(comp))
+    self._compilation_stats.deserialization_seconds += (
+        time.time() - start_time)
     comp, _ = transformations.replace_compiled_computations_names_with_unique_names(
-        computation_building_blocks.ComputationBuildingBlock.from_proto(
-            computation_impl.ComputationImpl.get_proto(comp)))
+        comp)
     return comp
 
   def _compute(self, comp, context):
@@ -781,8 +1489,40 @@ class ReferenceExecutor(context_base.Context):
           'Expected all parsed compiled computations to be tensorflow, '
           'but found \'{}\' instead.'.format(computation_oneof))
     else:
-      return ComputedValue(lambda x: run_tensorflow(comp, x),
-                           comp.type_signature)
+      return ComputedValue(
+          _TensorFlowFunction(comp, self._run_tensorflow), comp.type_signature)
+
+  def _run_tensorflow(self, comp, arg):
+    return run_tensorflow(comp, arg, self._session_cache)
+
+  def _run_tensorflow_batch(self, comp, arg_type, arg_values):
+    """Runs `comp` on each of the `arg_values` in a single `session.run()`.
+
+    Args:
+      comp: An instance of `computation_building_blocks.CompiledComputation`
+        with embedded TensorFlow code.
+      arg_type: The type of the arguments, or `None` if there are none.
+      arg_values: The list of the values of the arguments.
+
+    Returns:
+      The list of the values of the results, in the same order as `arg_values`,
+      or `None` if `comp` cannot be served from the session cache.
+    """
+    prepared = self._session_cache.get_prepared_batch(comp, arg_type,
+                                                      len(arg_values))
+    if prepared is None:
+      return None
+    if arg_type is not None:
+      arg_values = [to_representation_for_type(v, arg_type) for v in arg_values]
+    try:
+      result_vals = prepared.run_batch(arg_values)
+    finally:
+      prepared.release()
+    result_type = comp.type_signature.result
+    return [
+        capture_computed_value_from_graph(v, result_type).value
+        for v in result_vals
+    ]
 
   def _compute_call(self, comp, context):
     py_typecheck.check_type(comp, computation_building_blocks.Call)
@@ -893,14 +1633,140 @@ class ReferenceExecutor(context_base.Context):
     py_typecheck.check_type(comp, computation_building_blocks.Placement)
     raise NotImplementedError('Placement is currently unsupported.')
 
+  def _map_values(self, fn, values, parameter_type):
+    """Applies `fn` to each of the `values`, and returns a list of the results.
+
+    If the executor has been configured with `map_parallelism`, the values are
+    mapped by a pool of worker threads. Since much of the time is spent running
+    TensorFlow, which releases the global interpreter lock, this allows the
+    members of a federated value to be processed concurrently. Nested maps that
+    are encountered on the worker threads are evaluated sequentially.
+
+    Args:
+      fn: The mapping function, a callable that accepts and returns instances
+        of `ComputedValue`.
+      values: The list of values to map.
+      parameter_type: The type of the parameter of `fn`.
+
+    Returns:
+      The list of the values of the results, in the same order as `values`.
+    """
+
+    def _apply(x):
+      return fn(ComputedValue(x, parameter_type)).value
+
+    if not self._can_map_in_parallel(values):
+      return [_apply(x) for x in values]
+    return self._map_in_parallel(_apply, values)
+
+  def _map_in_client_batches(self, fn, values, parameter_type):
+    """Applies a compiled TensorFlow `fn` to `values` in batches of clients.
+
+    Each batch of `client_batch_size` values runs in a single session, in which
+    as many independent copies of the computation are stamped. The values left
+    over after the last full batch are then mapped as by `_map_values()`, so
+    that only one batched graph is prepared per computation, whatever the number
+    of values. If the executor has been configured with `map_parallelism`, the
+    batches are run by the pool of worker threads.
+
+    Args:
+      fn: An instance of `_TensorFlowFunction`.
+      values: The list of values to map.
+      parameter_type: The type of the parameter of `fn`.
+
+    Returns:
+      The list of the values of the results, in the same order as `values`, or
+      `None` if `fn` cannot be run in batches.
+    """
+    batch_size = self._client_batch_size
+    num_batched = len(values) - len(values) % batch_size
+    batches = [
+        values[start:start + batch_size]
+        for start in range(0, num_batched, batch_size)
+    ]
+
+    def _run_batch(batch):
+      return self._run_tensorflow_batch(fn.comp, parameter_type, batch)
+
+    if self._can_map_in_parallel(batches):
+      batch_results = self._map_in_parallel(_run_batch, batches)
+    else:
+      batch_results = [_run_batch(batch) for batch in batches]
+    if any(r is None for r in batch_results):
+      return None
+    result_vals = [v for batch_result in batch_results for v in batch_result]
+    result_vals.extend(
+        self._map_values(fn, values[num_batched:], parameter_type))
+    return result_vals
+
+  def _can_map_in_parallel(self, values):
+    return (self._map_parallelism is not None and len(values) > 1 and
+            not getattr(self._map_thread_state, 'in_worker', False))
+
+  def _map_in_parallel(self, fn, values):
+    """Applies `fn` to each of the `values` on the pool of worker threads."""
+
+    def _apply_in_worker(x):
+      self._map_thread_state.in_worker = True
+      return fn(x)
+
+    with self._map_pool_lock:
+      if self._map_pool is None:
+        self._map_pool = multiprocessing_pool.ThreadPool(self._map_parallelism)
+    return self._map_pool.map(_apply_in_worker, values)
+
+  def _sum_with_plan(self, plan, values, transform=None):
+    """Sums `values` with `plan`, as configured by `aggregation_fan_in`.
+
+    The values are consumed one at a time, and if a `transform` is specified,
+    it is applied to each of the values only as it is about to be added in, so
+    that at no point are all the transformed values held in memory.
+
+    Args:
+      plan: An instance of `numpy_arithmetic.ArithmeticPlan`.
+      values: The list of values to sum.
+      transform: An optional function to apply to each of the `values` to turn
+        it into a value of the type of `plan`.
+
+    Returns:
+      The sum of the (transformed) values.
+    """
+
+    def _stream(values):
+      if transform is None:
+        return iter(values)
+      return (transform(v) for v in values)
+
+    fan_in = self._aggregation_fan_in
+    if fan_in is None:
+      return plan.sum(_stream(values))
+    if len(values) <= fan_in or not self._can_map_in_parallel(values):
+      return plan.tree_sum(_stream(values), fan_in)
+    # The values are split into contiguous runs, one per worker thread, each of
+    # which is reduced in a subtree, and the roots of these are then combined.
+    num_subtrees = min(self._map_parallelism, len(values))
+    bounds = [len(values) * k // num_subtrees for k in range(num_subtrees + 1)]
+    partial_sums = self._map_in_parallel(
+        lambda k: plan.tree_sum(_stream(values[bounds[k]:bounds[k + 1]]),
+                                fan_in), list(range(num_subtrees)))
+    return plan.tree_sum(partial_sums, fan_in)
+
   def _sequence_sum(self, arg):
     py_typecheck.check_type(arg.type_signature, computation_types.SequenceType)
+    elements = to_sequence_elements(arg.value, arg.type_signature)
+    plan = numpy_arithmetic.get_arithmetic_plan(arg.type_signature.element)
+    if plan is not None:
+      return ComputedValue(
+          self._sum_with_plan(plan, elements), arg.type_signature.element)
     total = self._generic_zero(arg.type_signature.element)
-    for v in arg.value:
+    pair_type = computation_types.NamedTupleType(
+        [arg.type_signature.element, arg.type_signature.element])
+    for v in elements:
       total = self._generic_plus(
           ComputedValue(
-              anonymous_tuple.AnonymousTuple([(None, total.value), (None, v)]),
-              [arg.type_signature.element, arg.type_signature.element]))
+              anonymous_tuple.from_names_and_values(_UNNAMED_PAIR,
+                                                    [total.value, v]),
+              pair_type))
     return total
 
   def _federated_collect(self, arg):
@@ -919,9 +1785,13 @@ class ReferenceExecutor(context_base.Context):
                                     mapping_type.parameter, placements.CLIENTS,
                                     False)
     fn = arg.value[0]
-    result_val = [
-        fn(ComputedValue(x, mapping_type.parameter)).value for x in arg.value[1]
-    ]
+    result_val = None
+    if (self._client_batch_size is not None and
+        isinstance(fn, _TensorFlowFunction) and arg.value[1]):
+      result_val = self._map_in_client_batches(fn, arg.value[1],
+                                               mapping_type.parameter)
+    if result_val is None:
+      result_val = self._map_values(fn, arg.value[1], mapping_type.parameter)
     result_type = computation_types.FederatedType(mapping_type.result,
                                                   placements.CLIENTS, False)
     return ComputedValue(result_val, result_type)
@@ -965,6 +1835,11 @@ class ReferenceExecutor(context_base.Context):
             arg.type_signature, placements.SERVER, all_equal=True))
 
   def _generic_zero(self, type_spec):
+    if isinstance(type_spec, (computation_types.TensorType,
+                              computation_types.NamedTupleType)):
+      plan = numpy_arithmetic.get_arithmetic_plan(type_spec)
+      if plan is not None:
+        return ComputedValue(plan.zero(), type_spec)
     if isinstance(type_spec, computation_types.TensorType):
       # TODO(b/113116813): Replace this with something more efficient, probably
       # calling some helper method from Numpy.
@@ -975,10 +1850,9 @@ class ReferenceExecutor(context_base.Context):
       return ComputedValue(zeros_val, type_spec)
     elif isinstance(type_spec, computation_types.NamedTupleType):
       return ComputedValue(
-          anonymous_tuple.AnonymousTuple([
-              (k, self._generic_zero(v).value)
-              for k, v in anonymous_tuple.to_elements(type_spec)
-          ]), type_spec)
+          anonymous_tuple.with_values(
+              type_spec, [self._generic_zero(v).value for v in type_spec]),
+          type_spec)
     elif isinstance(
         type_spec,
         (computation_types.SequenceType, computation_types.FunctionType,
@@ -1012,22 +1886,26 @@ class ReferenceExecutor(context_base.Context):
       raise TypeError('Generic plus is undefined for two-tuples of different '
                       'types ({} vs. {}).'.format(
                           str(element_type), str(arg.type_signature[1])))
+    plan = numpy_arithmetic.get_arithmetic_plan(element_type)
+    if plan is not None:
+      return ComputedValue(
+          plan.plus(arg.value[0], arg.value[1]), element_type)
     if isinstance(element_type, computation_types.TensorType):
       return ComputedValue(arg.value[0] + arg.value[1], element_type)
     elif isinstance(element_type, computation_types.NamedTupleType):
       py_typecheck.check_type(arg.value[0], anonymous_tuple.AnonymousTuple)
       py_typecheck.check_type(arg.value[1], anonymous_tuple.AnonymousTuple)
-      result_val_elements = []
-      for idx, (name, elem_type) in enumerate(
-          anonymous_tuple.to_elements(element_type)):
+      result_values = []
+      for idx, elem_type in enumerate(element_type):
         to_add = ComputedValue(
-            anonymous_tuple.AnonymousTuple([(None, arg.value[0][idx]),
-                                            (None, arg.value[1][idx])]),
-            [elem_type, elem_type])
+            anonymous_tuple.from_names_and_values(
+                _UNNAMED_PAIR, [arg.value[0][idx], arg.value[1][idx]]),
+            computation_types.NamedTupleType([elem_type, elem_type]))
         add_result = self._generic_plus(to_add)
-        result_val_elements.append((name, add_result.value))
+        result_values.append(add_result.value)
       return ComputedValue(
-          anonymous_tuple.AnonymousTuple(result_val_elements), element_type)
+          anonymous_tuple.with_values(element_type, result_values),
+          element_type)
     else:
       # TODO(b/113116813): Implement the remaining cases, e.g. federated
       # types like int32@SERVER.
@@ -1044,9 +1922,9 @@ class ReferenceExecutor(context_base.Context):
     type_utils.check_assignable_from(mapping_type.parameter,
                                      sequence_type.element)
     fn = arg.value[0]
-    result_val = [
-        fn(ComputedValue(x, mapping_type.parameter)).value for x in arg.value[1]
-    ]
+    result_val = self._map_values(
+        fn, to_sequence_elements(arg.value[1], sequence_type),
+        mapping_type.parameter)
     result_type = computation_types.SequenceType(mapping_type.result)
     return ComputedValue(result_val, result_type)
 
@@ -1062,10 +1940,11 @@ class ReferenceExecutor(context_base.Context):
                                      [zero_type, sequence_type.element])
     total = ComputedValue(arg.value[1], zero_type)
     reduce_fn = arg.value[2]
-    for v in arg.value[0]:
+    for v in to_sequence_elements(arg.value[0], sequence_type):
       total = reduce_fn(
           ComputedValue(
-              anonymous_tuple.AnonymousTuple([(None, total.value), (None, v)]),
+              anonymous_tuple.from_names_and_values(_UNNAMED_PAIR,
+                                                    [total.value, v]),
               op_type.parameter))
     return total
 
@@ -1085,7 +1964,8 @@ class ReferenceExecutor(context_base.Context):
     for v in arg.value[0]:
       total = reduce_fn(
           ComputedValue(
-              anonymous_tuple.AnonymousTuple([(None, total.value), (None, v)]),
+              anonymous_tuple.from_names_and_values(_UNNAMED_PAIR,
+                                                    [total.value, v]),
               op_type.parameter))
     return self._federated_value_at_server(total)
 
@@ -1165,7 +2045,18 @@ class ReferenceExecutor(context_base.Context):
     py_typecheck.check_type(w_type, computation_types.TensorType)
     if w_type.shape.ndims != 0:
       raise TypeError('Expected scalar weight, got {}.'.format(str(w_type)))
+    plan = numpy_arithmetic.get_arithmetic_plan(v_type)
+    # The accumulator dtype is never set along with the fan-in.
+    if plan is not None and self._aggregation_fan_in is None:
+      result_val = plan.weighted_mean(arg.value[0], arg.value[1],
+                                      self._aggregation_accumulator_dtype)
+      return ComputedValue(result_val, type_constructors.at_server(v_type))
     total = sum(arg.value[1])
+    if plan is not None:
+      result_val = self._sum_with_plan(
+          plan, list(zip(arg.value[0], arg.value[1])),
+          lambda vw: plan.multiply_by_scalar(vw[0], vw[1] / total))
+      return ComputedValue(result_val, type_constructors.at_server(v_type))
     products_val = [
         multiply_by_scalar(ComputedValue(v, v_type), w / total).value
         for v, w in zip(arg.value[0], arg.value[1])
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import threading
 
 import numpy as np
 import tensorflow as tf
@@ -139,6 +140,15 @@ class ReferenceExecutorTest(test.TestCase):
             computation_types.FederatedType(
                 tf.int32, placements.CLIENTS, all_equal=False)), x)
 
+  def test_to_representation_for_type_keeps_data_sets_lazy(self):
+    ds = tf.data.Dataset.range(5)
+    sequence_type = computation_types.SequenceType(tf.int64)
+    self.assertIs(
+        reference_executor.to_representation_for_type(ds, sequence_type), ds)
+    self.assertEqual(
+        reference_executor.to_sequence_elements(ds, sequence_type),
+        list(range(5)))
+
   def test_stamp_computed_value_into_graph_with_undefined_tensor_dims(self):
     v_type = computation_types.TensorType(tf.int32, [None])
     v_value = np.array([1, 2, 3], dtype=np.int32)
@@ -162,6 +172,27 @@ class ReferenceExecutorTest(test.TestCase):
         v_val = graph_utils.fetch_value_in_session(sess, stamped_v)
     self.assertEqual(str(v_val), '<x=10,y=<z=0.6>>')
 
+  def test_stamp_computed_value_into_graph_with_feed_dict(self):
+    v_val = anonymous_tuple.AnonymousTuple([
+        ('x', np.arange(1000, dtype=np.float32)), ('y', 10)
+    ])
+    v_type = [('x', (tf.float32, [None])), ('y', tf.int32)]
+    v = reference_executor.ComputedValue(
+        reference_executor.to_representation_for_type(v_val, v_type), v_type)
+    feed_dict = {}
+    with tf.Graph().as_default() as graph:
+      stamped_v = reference_executor.stamp_computed_value_into_graph(
+          v, graph, feed_dict)
+      self.assertLen(feed_dict, 2)
+      self.assertEmpty(
+          [op for op in graph.get_operations() if op.type == 'Const'])
+      self.assertEqual(stamped_v.x.shape.as_list(), [1000])
+      with tf.Session(graph=graph) as sess:
+        v_result = graph_utils.fetch_value_in_session(sess, stamped_v,
+                                                      feed_dict)
+    self.assertTrue(np.array_equal(v_result.x, v_val.x))
+    self.assertEqual(v_result.y, 10)
+
   def test_computation_context_resolve_reference(self):
     c1 = reference_executor.ComputationContext()
     c2 = reference_executor.ComputationContext(
@@ -337,6 +368,345 @@ class ReferenceExecutorTest(test.TestCase):
     self.assertIsInstance(result, test_named_tuple)
     self.assertEqual(result, test_named_tuple(10.0))
 
+  def test_session_cache_reuses_prepared_computations(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    session_cache = reference_executor.TensorFlowSessionCache()
+    executor = reference_executor.ReferenceExecutor(session_cache=session_cache)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(bar([1, 2, 3]), [2, 3, 4])
+      self.assertEqual(foo(10), 11)
+    self.assertLen(session_cache, 1)
+    self.assertEqual(session_cache.misses, 1)
+    self.assertEqual(session_cache.hits, 3)
+
+  def test_session_cache_evicts_least_recently_used_computations(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    @computations.tf_computation(tf.int32)
+    def bar(x):
+      return x * 2
+
+    session_cache = reference_executor.TensorFlowSessionCache(max_size=1)
+    executor = reference_executor.ReferenceExecutor(session_cache=session_cache)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(foo(10), 11)
+      self.assertEqual(bar(10), 20)
+      self.assertEqual(foo(20), 21)
+    self.assertLen(session_cache, 1)
+    self.assertEqual(session_cache.misses, 3)
+    self.assertEqual(session_cache.hits, 0)
+
+  def test_session_cache_reinitializes_variables_in_each_invocation(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      v = tf.Variable(10)
+      return v.assign_add(x)
+
+    session_cache = reference_executor.TensorFlowSessionCache()
+    executor = reference_executor.ReferenceExecutor(session_cache=session_cache)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(foo(1), 11)
+      self.assertEqual(foo(1), 11)
+    self.assertEqual(session_cache.hits, 1)
+
+  def test_session_cache_checks_out_copies_with_variables_to_one_caller(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      v = tf.Variable(10)
+      return v.assign_add(x)
+
+    @computations.tf_computation(tf.int32)
+    def bar(x):
+      return x + 1
+
+    foo_comp, bar_comp = [
+        computation_building_blocks.CompiledComputation(
+            computation_impl.ComputationImpl.get_proto(c)) for c in [foo, bar]
+    ]
+    arg_type = computation_types.TensorType(tf.int32)
+    session_cache = reference_executor.TensorFlowSessionCache()
+    first = session_cache.get_prepared_computation(foo_comp, arg_type)
+    second = session_cache.get_prepared_computation(foo_comp, arg_type)
+    self.assertIsNot(first, second)
+    self.assertEqual(first.run(np.int32(1)), 11)
+    self.assertEqual(second.run(np.int32(2)), 12)
+    first.release()
+    third = session_cache.get_prepared_computation(foo_comp, arg_type)
+    self.assertIs(third, first)
+    second.release()
+    third.release()
+    first = session_cache.get_prepared_computation(bar_comp, arg_type)
+    second = session_cache.get_prepared_computation(bar_comp, arg_type)
+    self.assertIs(first, second)
+    first.release()
+    second.release()
+    self.assertLen(session_cache, 2)
+    session_cache.clear()
+
+  def test_session_cache_with_tuples_of_tensors(self):
+
+    @computations.tf_computation([('a', tf.int32), ('b', tf.float32)])
+    def foo(a, b):
+      return tf.to_float(a) + b, a * 2
+
+    session_cache = reference_executor.TensorFlowSessionCache()
+    executor = reference_executor.ReferenceExecutor(session_cache=session_cache)
+    with context_stack_impl.context_stack.install(executor):
+      result = foo(1, 2.0)
+      self.assertEqual(result[0], 3.0)
+      self.assertEqual(result[1], 2)
+      result = foo(3, 4.0)
+      self.assertEqual(result[0], 7.0)
+      self.assertEqual(result[1], 6)
+    self.assertEqual(session_cache.hits, 1)
+
+  def test_session_cache_falls_back_for_sequences(self):
+
+    @computations.tf_computation(computation_types.SequenceType(tf.int32))
+    def foo(ds):
+      return ds.reduce(np.int32(0), lambda x, y: x + y)
+
+    session_cache = reference_executor.TensorFlowSessionCache()
+    executor = reference_executor.ReferenceExecutor(session_cache=session_cache)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(foo([1, 2, 3]), 6)
+      self.assertEqual(foo([4, 5]), 9)
+    self.assertEqual(session_cache.misses, 1)
+    self.assertEqual(session_cache.hits, 1)
+
+  def test_client_batch_size_without_session_cache_fails(self):
+    with self.assertRaises(ValueError):
+      reference_executor.ReferenceExecutor(client_batch_size=2)
+
+  def test_client_batch_size_runs_clients_in_batches(self):
+
+    @computations.tf_computation([('a', tf.int32), ('b', tf.float32)])
+    def foo(a, b):
+      v = tf.Variable(1.0)
+      with tf.control_dependencies([v.assign_add(b)]):
+        return tf.to_float(a) * v.read_value()
+
+    @computations.federated_computation(
+        computation_types.FederatedType([('a', tf.int32), ('b', tf.float32)],
+                                        placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    clients = [[k, float(k)] for k in range(7)]
+    expected = [k * (1.0 + k) for k in range(7)]
+    session_cache = reference_executor.TensorFlowSessionCache()
+    executor = reference_executor.ReferenceExecutor(
+        session_cache=session_cache, client_batch_size=3)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertAllClose(bar(clients), expected)
+      self.assertAllClose(bar(clients), expected)
+      self.assertAllClose(bar(clients[:5]), expected[:5])
+    # One entry with 3 copies of `foo`, and one with a single copy for the
+    # clients left over after the last full batch, whatever their number.
+    self.assertLen(session_cache, 2)
+    self.assertEqual(session_cache.misses, 2)
+    self.assertEqual(session_cache.hits, 7)
+
+  def test_client_batch_size_falls_back_for_sequences(self):
+
+    @computations.tf_computation(computation_types.SequenceType(tf.int32))
+    def foo(ds):
+      return ds.reduce(np.int32(0), lambda x, y: x + y)
+
+    @computations.federated_computation(
+        computation_types.FederatedType(
+            computation_types.SequenceType(tf.int32), placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    executor = reference_executor.ReferenceExecutor(
+        session_cache=reference_executor.TensorFlowSessionCache(),
+        client_batch_size=2)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(bar([[1, 2], [3], [4, 5, 6]]), [3, 3, 15])
+
+  def test_map_parallelism_with_non_positive_value_fails(self):
+    with self.assertRaises(ValueError):
+      reference_executor.ReferenceExecutor(map_parallelism=0)
+
+  def test_map_parallelism_preserves_order_of_federated_map_results(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x * 10
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    with reference_executor.ReferenceExecutor(
+        session_cache=reference_executor.TensorFlowSessionCache(),
+        map_parallelism=4) as executor:
+      with context_stack_impl.context_stack.install(executor):
+        self.assertEqual(bar(list(range(20))), [x * 10 for x in range(20)])
+
+  def test_map_parallelism_runs_computations_with_variables_concurrently(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      v = tf.Variable(10)
+      return v.assign_add(x)
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    # Each run waits for the other one to start fetching its result, which it
+    # only does in time if the two runs overlap.
+    lock = threading.Lock()
+    num_started = [0]
+    all_started = threading.Event()
+    overlapped = []
+    original_fetch = graph_utils.ValueFetcher.fetch
+
+    def _fetch_when_all_started(fetcher, *args, **kwargs):
+      with lock:
+        num_started[0] += 1
+        if num_started[0] == 2:
+          all_started.set()
+      all_started.wait(10.0)
+      overlapped.append(all_started.is_set())
+      return original_fetch(fetcher, *args, **kwargs)
+
+    graph_utils.ValueFetcher.fetch = _fetch_when_all_started
+    self.addCleanup(setattr, graph_utils.ValueFetcher, 'fetch', original_fetch)
+    with reference_executor.ReferenceExecutor(
+        session_cache=reference_executor.TensorFlowSessionCache(),
+        map_parallelism=2) as executor:
+      with context_stack_impl.context_stack.install(executor):
+        self.assertEqual(bar([1, 2]), [11, 12])
+    self.assertEqual(overlapped, [True, True])
+
+  def test_map_parallelism_continues_after_close(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x * 10
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placements.CLIENTS))
+    def bar(x):
+      return intrinsics.federated_map(foo, x)
+
+    executor = reference_executor.ReferenceExecutor(map_parallelism=2)
+    self.addCleanup(executor.close)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(bar([1, 2, 3]), [10, 20, 30])
+      executor.close()
+      executor.close()
+      self.assertEqual(bar([4, 5, 6]), [40, 50, 60])
+
+  def test_map_parallelism_with_nested_sequence_map(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    @computations.federated_computation(computation_types.SequenceType(
+        tf.int32))
+    def bar(x):
+      return intrinsics.sequence_sum(intrinsics.sequence_map(foo, x))
+
+    @computations.federated_computation(
+        computation_types.FederatedType(
+            computation_types.SequenceType(tf.int32), placements.CLIENTS))
+    def baz(x):
+      return intrinsics.federated_map(bar, x)
+
+    with reference_executor.ReferenceExecutor(map_parallelism=2) as executor:
+      with context_stack_impl.context_stack.install(executor):
+        self.assertEqual(baz([[1, 2], [3], [4, 5, 6]]), [5, 4, 18])
+
+  def test_aggregation_fan_in_with_bad_value_fails(self):
+    with self.assertRaises(ValueError):
+      reference_executor.ReferenceExecutor(aggregation_fan_in=1)
+
+  def test_aggregation_fan_in_matches_left_to_right_aggregation(self):
+    value_type = computation_types.NamedTupleType([
+        ('a', computation_types.TensorType(tf.float32, [2])),
+        ('b', tf.float32),
+    ])
+
+    @computations.federated_computation(
+        computation_types.FederatedType(value_type, placements.CLIENTS),
+        computation_types.FederatedType(tf.float32, placements.CLIENTS))
+    def foo(values, weights):
+      return (intrinsics.federated_sum(values),
+              intrinsics.federated_mean(values),
+              intrinsics.federated_mean(values, weights))
+
+    values = [
+        collections.OrderedDict([('a', np.array([k, -k], dtype=np.float32)),
+                                 ('b', np.float32(k * 0.1))])
+        for k in range(23)
+    ]
+    weights = [np.float32(k % 5 + 1) for k in range(23)]
+
+    with context_stack_impl.context_stack.install(
+        reference_executor.ReferenceExecutor()):
+      expected = foo(values, weights)
+    for executor in [
+        reference_executor.ReferenceExecutor(aggregation_fan_in=2),
+        reference_executor.ReferenceExecutor(aggregation_fan_in=4),
+        reference_executor.ReferenceExecutor(
+            map_parallelism=3, aggregation_fan_in=3),
+    ]:
+      with executor, context_stack_impl.context_stack.install(executor):
+        result = foo(values, weights)
+      self.assertAllClose(
+          anonymous_tuple.flatten(result), anonymous_tuple.flatten(expected))
+
+  def test_compile_cache_reuses_compiled_computations(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    executor = reference_executor.ReferenceExecutor()
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(foo(1), 2)
+      self.assertEqual(foo(2), 3)
+    self.assertEqual(executor.compilation_stats.calls, 2)
+    self.assertEqual(executor.compilation_stats.cache_hits, 1)
+    self.assertGreater(executor.compilation_stats.total_seconds, 0.0)
+    self.assertGreater(executor.compilation_stats.deserialization_seconds, 0.0)
+    self.assertLessEqual(executor.compilation_stats.deserialization_seconds,
+                         executor.compilation_stats.total_seconds)
+
+  def test_compile_cache_disabled(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    executor = reference_executor.ReferenceExecutor(compile_cache_size=None)
+    with context_stack_impl.context_stack.install(executor):
+      self.assertEqual(foo(1), 2)
+      self.assertEqual(foo(2), 3)
+    self.assertEqual(executor.compilation_stats.calls, 2)
+    self.assertEqual(executor.compilation_stats.cache_hits, 0)
+
   def test_computation_with_batched_federated_int_sequence(self):
     ds1_shape = tf.TensorShape([None])
     sequence_type = computation_types.SequenceType(
@@ -455,6 +825,25 @@ class ReferenceExecutorTest(test.TestCase):
       def _(x):
         return intrinsics.federated_apply(foo, x)
 
+  def test_lazy_data_set_results_are_returned_as_lists(self):
+    sequence_type = computation_types.SequenceType(tf.int64)
+
+    @computations.federated_computation(sequence_type)
+    def foo(x):
+      return x
+
+    @computations.tf_computation(tf.int64)
+    def bar(x):
+      return x + 1
+
+    @computations.federated_computation(sequence_type)
+    def baz(x):
+      return intrinsics.sequence_sum(intrinsics.sequence_map(bar, x))
+
+    ds = tf.data.Dataset.range(5)
+    self.assertEqual(foo(ds), list(range(5)))
+    self.assertEqual(baz(ds), 15)
+
   def test_graph_mode_dataset_fails_well(self):
     sequence_type = computation_types.SequenceType(tf.int32)
     federated_type = computation_types.FederatedType(sequence_type,
@@ -522,6 +911,25 @@ class ReferenceExecutorTest(test.TestCase):
     ds = tf.data.Dataset.from_tensor_slices([10, 20])
     self.assertEqual(foo(ds), 30)
 
+  def test_tensorflow_computation_copies_dataset_into_graph(self):
+    sequence_type = computation_types.SequenceType(tf.int64)
+
+    @computations.tf_computation(sequence_type)
+    def foo(ds):
+      return ds.reduce(np.int64(0), lambda x, y: x + y)
+
+    def _make_data_set_from_elements(*args):
+      del args  # unused
+      raise AssertionError('The data set was not copied into the graph.')
+
+    # The data set can be serialized, so it must not be listed into the graph.
+    self.addCleanup(setattr, graph_utils, 'make_data_set_from_elements',
+                    graph_utils.make_data_set_from_elements)
+    graph_utils.make_data_set_from_elements = _make_data_set_from_elements
+
+    ds = tf.data.Dataset.range(5).map(lambda x: x * 2)
+    self.assertEqual(foo(ds), 20)
+
   def test_tensorflow_computation_with_sequence_of_tuples(self):
     tuple_type = computation_types.NamedTupleType([
         ('x', tf.int32),
@@ -1048,6 +1456,36 @@ class ReferenceExecutorTest(test.TestCase):
         '(<{float32}@CLIENTS,{float32}@CLIENTS> -> float32@SERVER)')
     self.assertEqual(foo([5.0, 2.0, 3.0], [10.0, 20.0, 30.0]), 3.0)
 
+  def test_federated_weighted_average_with_float64_accumulator(self):
+
+    @computations.federated_computation(
+        computation_types.FederatedType(
+            computation_types.TensorType(tf.float32, [2]), placements.CLIENTS),
+        computation_types.FederatedType(tf.float32, placements.CLIENTS))
+    def foo(v, w):
+      return intrinsics.federated_mean(v, w)
+
+    values = [np.array([k, -k], dtype=np.float32) for k in range(100)]
+    weights = [np.float32(k % 7 + 1) for k in range(100)]
+    expected = (np.sum([v * w for v, w in zip(values, weights)], axis=0) /
+                np.sum(weights))
+    executor = reference_executor.ReferenceExecutor(
+        aggregation_accumulator_dtype=tf.float64)
+    with context_stack_impl.context_stack.install(executor):
+      result = foo(values, weights)
+    self.assertEqual(result.dtype, np.float32)
+    self.assertAllClose(result, expected)
+
+  def test_aggregation_accumulator_dtype_with_integer_dtype_fails(self):
+    with self.assertRaises(ValueError):
+      reference_executor.ReferenceExecutor(
+          aggregation_accumulator_dtype=tf.int64)
+
+  def test_aggregation_accumulator_dtype_with_aggregation_fan_in_fails(self):
+    with self.assertRaises(ValueError):
+      reference_executor.ReferenceExecutor(
+          aggregation_fan_in=2, aggregation_accumulator_dtype=tf.float64)
+
   def test_federated_broadcast_without_data_on_clients(self):
 
     @computations.federated_computation(
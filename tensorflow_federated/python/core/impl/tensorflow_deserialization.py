@@ -36,7 +36,10 @@ from tensorflow_federated.python.core.impl import type_serialization
 from tensorflow_federated.python.core.impl import type_utils
 
 
-def deserialize_and_call_tf_computation(computation_proto, arg, graph):
+def deserialize_and_call_tf_computation(computation_proto,
+                                        arg,
+                                        graph,
+                                        plan=None):
   """Deserializes a TF computation and inserts it into `graph`.
 
   This method performs an action that can be considered roughly the opposite of
@@ -55,6 +58,9 @@ def deserialize_and_call_tf_computation(computation_proto, arg, graph):
     arg: The argument to invoke the computation with, or None if the computation
       does not specify a parameter type and does not expects one.
     graph: The graph to stamp into.
+    plan: An optional instance of `DeserializationPlan` constructed from
+      `computation_proto`, for callers that stamp the same computation
+      repeatedly. If `None`, a new plan is derived from `computation_proto`.
 
   Returns:
     A tuple (init_op, result) where:
@@ -74,8 +80,12 @@ def deserialize_and_call_tf_computation(computation_proto, arg, graph):
     raise ValueError(
         'Expected a TensorFlow computation, got {}.'.format(computation_oneof))
   py_typecheck.check_type(graph, tf.Graph)
+  if plan is None:
+    plan = DeserializationPlan(computation_proto)
+  else:
+    py_typecheck.check_type(plan, DeserializationPlan)
   with graph.as_default():
-    type_spec = type_serialization.deserialize_type(computation_proto.type)
+    type_spec = plan.type_signature
     if not type_spec.parameter:
       if arg is None:
         input_map = None
@@ -95,26 +105,24 @@ def deserialize_and_call_tf_computation(computation_proto, arg, graph):
             'is of a mismatching type {}.'.format(
                 str(type_spec.parameter), str(arg_type)))
       else:
-        input_map = {
-            k: graph.get_tensor_by_name(v) for k, v in six.iteritems(
-                graph_utils.compute_map_from_bindings(
-                    computation_proto.tensorflow.parameter, arg_binding))
-        }
-    return_elements = graph_utils.extract_tensor_names_from_binding(
-        computation_proto.tensorflow.result)
-    orig_init_op_name = computation_proto.tensorflow.initialize_op
-    if orig_init_op_name:
-      return_elements.append(orig_init_op_name)
+        arg_names = graph_utils.extract_tensor_names_from_binding(arg_binding)
+        if len(arg_names) == len(plan.parameter_names):
+          name_map = zip(plan.parameter_names, arg_names)
+        else:
+          # Raises an error that describes how the bindings mismatch.
+          name_map = six.iteritems(
+              graph_utils.compute_map_from_bindings(
+                  computation_proto.tensorflow.parameter, arg_binding))
+        input_map = {k: graph.get_tensor_by_name(v) for k, v in name_map}
     # N. B. Unlike MetaGraphDef, the GraphDef alone contains no information
     # about collections, and hence, when we import a graph with Variables,
     # those Variables are not added to global collections, and hence
     # functions like tf.global_variables_initializers() will not
     # contain their initialization ops.
     output_tensors = tf.import_graph_def(
-        serialization_utils.unpack_graph_def(
-            computation_proto.tensorflow.graph_def),
+        plan.graph_def,
         input_map,
-        return_elements,
+        plan.return_elements,
         # N. B. It is very important not to return any names from the original
         # computation_proto.tensorflow.graph_def, those names might or might not
         # be valid in the current graph. Using a different scope makes the graph
@@ -122,9 +130,47 @@ def deserialize_and_call_tf_computation(computation_proto, arg, graph):
         # node names is less likely to be needed.
         name='subcomputation')
 
-    output_map = {k: v for k, v in zip(return_elements, output_tensors)}
-    new_init_op_name = output_map.pop(orig_init_op_name, None)
-    return (new_init_op_name,
-            graph_utils.assemble_result_from_graph(
-                type_spec.result, computation_proto.tensorflow.result,
-                output_map))
+    num_results = len(plan.return_elements) - int(plan.has_init_op)
+    new_init_op = output_tensors[num_results] if plan.has_init_op else None
+    return (new_init_op, plan.assemble_result(output_tensors[:num_results]))
+
+
+class DeserializationPlan(object):
+  """The parts of a TensorFlow computation proto needed to stamp it in graphs.
+
+  These are derived from the proto once, and can then be reused by the owner of
+  the plan each time it stamps the same computation into a graph, rather than
+  repeatedly deserializing its type and graph, and walking its bindings.
+  """
+
+  def __init__(self, computation_proto):
+    """Derives the plan from `computation_proto`.
+
+    Args:
+      computation_proto: An instance of `pb.Computation` with the `computation`
+        one of equal to `tensorflow`.
+
+    Raises:
+      TypeError: If the argument is of the wrong type.
+      ValueError: If `computation_proto` is not a TensorFlow computation proto.
+    """
+    py_typecheck.check_type(computation_proto, pb.Computation)
+    computation_oneof = computation_proto.WhichOneof('computation')
+    if computation_oneof != 'tensorflow':
+      raise ValueError('Expected a TensorFlow computation, got {}.'.format(
+          computation_oneof))
+    tf_proto = computation_proto.tensorflow
+    self.type_signature = type_serialization.deserialize_type(
+        computation_proto.type)
+    self.graph_def = serialization_utils.unpack_graph_def(tf_proto.graph_def)
+    if self.type_signature.parameter is not None:
+      self.parameter_names = graph_utils.extract_tensor_names_from_binding(
+          tf_proto.parameter)
+    else:
+      self.parameter_names = []
+    result_names, self.assemble_result = graph_utils.make_result_assembler(
+        self.type_signature.result, tf_proto.result)
+    self.return_elements = list(result_names)
+    self.has_init_op = bool(tf_proto.initialize_op)
+    if self.has_init_op:
+      self.return_elements.append(tf_proto.initialize_op)
@@ -43,6 +43,21 @@ class TensorFlowDeserializationTest(test.TestCase):
       result_val = sess.run(result)
     self.assertEqual(result_val, 11)
 
+  @test.graph_mode_test
+  def test_deserialize_and_call_tf_computation_repeatedly_with_plan(self):
+    ctx_stack = context_stack_impl.context_stack
+    add, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: (tf.add(x[0], x[1]), x[0]), [tf.int32, tf.int32], ctx_stack)
+    plan = tensorflow_deserialization.DeserializationPlan(add)
+    for k in range(3):
+      with tf.Graph().as_default() as graph:
+        _, result = (
+            tensorflow_deserialization.deserialize_and_call_tf_computation(
+                add, [tf.constant(k), tf.constant(10)], graph, plan=plan))
+        with tf.Session() as sess:
+          result_val = sess.run(list(result))
+      self.assertEqual(result_val, [k + 10, k])
+
 
 if __name__ == '__main__':
   test.main()
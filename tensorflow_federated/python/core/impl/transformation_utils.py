@@ -71,60 +71,198 @@ def transform_postorder(comp, transform):
   """
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
+  comp, children_modified = _transform_children(
+      comp, lambda child: transform_postorder(child, transform))
+  comp, comp_modified = transform(comp)
+  return comp, comp_modified or children_modified
+
+
+def transform_preorder(comp, transform):
+  """Traverses `comp` recursively preorder and replaces its constituents.
+
+  The counterpart of `transform_postorder`: the transformation `transform` is
+  applied first to each element of `comp` viewed as an expression tree, then to
+  the building blocks the transformed element is parameterized by, left to
+  right. Hence, the building blocks introduced by `transform` are themselves
+  visited, and `transform` must eventually stop modifying them.
+
+  Args:
+    comp: A `computation_building_block.ComputationBuildingBlock` to traverse
+      and transform top-down.
+    transform: The transformation to apply locally to each building block in
+      `comp`, as the `transform` of `transform_postorder`.
+
+  Returns:
+    A (building block, bool) tuple, as returned by `transform_postorder`.
+
+  Raises:
+    TypeError: If the arguments are of the wrong computation_types.
+    NotImplementedError: If the argument is a kind of computation building block
+      that is currently not recognized.
+  """
+  py_typecheck.check_type(comp,
+                          computation_building_blocks.ComputationBuildingBlock)
+  comp, comp_modified = transform(comp)
+  comp, children_modified = _transform_children(
+      comp, lambda child: transform_preorder(child, transform))
+  return comp, comp_modified or children_modified
+
+
+def transform_postorder_with_rules(comp,
+                                   rules,
+                                   change_log=None,
+                                   max_chained_rewrites=100):
+  """Applies a set of local rewrite rules to `comp` in a single traversal.
+
+  Each rule is a transformation of the kind accepted by `transform_postorder`,
+  which only looks at the building block it is given and its descendants. The
+  building blocks in `comp` are visited postorder, and at each of them, the
+  rules are tried in order. When a rule rewrites a building block, the rewritten
+  building block is visited in turn, so that the rules may apply to it and to
+  any new building blocks the rewrite has introduced below it. The parts of it
+  that have already been visited (i.e., that the rule has carried over from the
+  original building block) are not visited again. Otherwise, the building block
+  is final, and the traversal moves on to its parent.
+
+  Since the rules are local, a rewrite can only enable further rewrites of the
+  rewritten building block and of its ancestors, all of which are visited
+  after it. Hence, a single traversal leaves no building block in `comp` that
+  any of the rules applies to, which is the fixpoint of repeatedly running
+  `transform_postorder` with each of the rules, at the cost of a single
+  traversal and a single rebuild of the modified ancestors. As with any such
+  fixpoint, the rules must not undo each other's rewrites, or the traversal
+  would not terminate. As a safety net, the traversal fails on any chain of more
+  than `max_chained_rewrites` rewrites, in which each rewrite is of a building
+  block produced by the previous one (i.e., of its result, or of a building
+  block it has introduced below it).
+
+  Args:
+    comp: A `computation_building_block.ComputationBuildingBlock` to traverse
+      and transform bottom-up.
+    rules: A list of pairs, each consisting of the name of a rule and a Python
+      function that accepts a building block, and returns a (building block,
+      bool) tuple, as the `transform` of `transform_postorder`.
+    change_log: An optional Python list, to which a (name, building block,
+      building block) tuple is appended for each rewrite, with the name of the
+      rule, and the building blocks before and after the rewrite.
+    max_chained_rewrites: The maximum length of a chain of rewrites, each of a
+      building block produced by the previous one.
+
+  Returns:
+    A (building block, bool) tuple, as returned by `transform_postorder`.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If `max_chained_rewrites` is not positive, or it is exceeded.
+    NotImplementedError: If the argument is a kind of computation building block
+      that is currently not recognized.
+  """
+  py_typecheck.check_type(comp,
+                          computation_building_blocks.ComputationBuildingBlock)
+  py_typecheck.check_type(rules, (list, tuple))
+  if change_log is not None:
+    py_typecheck.check_type(change_log, list)
+  py_typecheck.check_type(max_chained_rewrites, int)
+  if max_chained_rewrites < 1:
+    raise ValueError(
+        'The maximum number of chained rewrites must be positive, found '
+        '{}.'.format(max_chained_rewrites))
+  # The building blocks that have been visited and that no rule applies to, by
+  # id. The building blocks are retained, so that the ids are not reused.
+  final_comps = {}
+
+  def _visit(comp, num_rewrites=0):
+    """Visits `comp`, produced by a chain of `num_rewrites` rewrites."""
+    if id(comp) in final_comps:
+      return comp, False
+    comp, children_modified = _transform_children(
+        comp, lambda child: _visit(child, num_rewrites))
+    for name, rule in rules:
+      transformed_comp, modified = rule(comp)
+      if modified:
+        if num_rewrites >= max_chained_rewrites:
+          raise ValueError(
+              'Exceeded the maximum of {} chained rewrites, last with rule {} '
+              'from {} to {}. The rules likely undo each other\'s rewrites, '
+              'or keep expanding the computation.'.format(
+                  max_chained_rewrites, name, comp.tff_repr,
+                  transformed_comp.tff_repr))
+        if change_log is not None:
+          change_log.append((name, comp, transformed_comp))
+        transformed_comp, _ = _visit(transformed_comp, num_rewrites + 1)
+        return transformed_comp, True
+    final_comps[id(comp)] = comp
+    return comp, children_modified
+
+  return _visit(comp)
+
+
+def _transform_children(comp, transform):
+  """Applies `transform` to the children of `comp`, and rebuilds it if needed.
+
+  Args:
+    comp: A `computation_building_block.ComputationBuildingBlock`.
+    transform: A Python function that accepts a building block, and returns a
+      (building block, bool) tuple, applied to each child of `comp`.
+
+  Returns:
+    A (building block, bool) tuple, with `comp` rebuilt from the transformed
+    children, or `comp` itself if none of them were modified, and whether any
+    were modified.
+
+  Raises:
+    NotImplementedError: If the argument is a kind of computation building block
+      that is currently not recognized.
+  """
   if isinstance(
       comp,
       (computation_building_blocks.CompiledComputation,
        computation_building_blocks.Data, computation_building_blocks.Intrinsic,
        computation_building_blocks.Placement,
        computation_building_blocks.Reference)):
-    return transform(comp)
+    return comp, False
   elif isinstance(comp, computation_building_blocks.Selection):
-    source, source_modified = transform_postorder(comp.source, transform)
+    source, source_modified = transform(comp.source)
     if source_modified:
       comp = computation_building_blocks.Selection(source, comp.name,
                                                    comp.index)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or source_modified
+    return comp, source_modified
   elif isinstance(comp, computation_building_blocks.Tuple):
     elements = []
     elements_modified = False
     for key, value in anonymous_tuple.to_elements(comp):
-      value, value_modified = transform_postorder(value, transform)
+      value, value_modified = transform(value)
       elements.append((key, value))
       elements_modified = elements_modified or value_modified
     if elements_modified:
       comp = computation_building_blocks.Tuple(elements)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or elements_modified
+    return comp, elements_modified
   elif isinstance(comp, computation_building_blocks.Call):
-    fn, fn_modified = transform_postorder(comp.function, transform)
+    fn, fn_modified = transform(comp.function)
     if comp.argument is not None:
-      arg, arg_modified = transform_postorder(comp.argument, transform)
+      arg, arg_modified = transform(comp.argument)
     else:
       arg, arg_modified = (None, False)
     if fn_modified or arg_modified:
       comp = computation_building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or fn_modified or arg_modified
+    return comp, fn_modified or arg_modified
   elif isinstance(comp, computation_building_blocks.Lambda):
-    result, result_modified = transform_postorder(comp.result, transform)
+    result, result_modified = transform(comp.result)
     if result_modified:
       comp = computation_building_blocks.Lambda(comp.parameter_name,
                                                 comp.parameter_type, result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or result_modified
+    return comp, result_modified
   elif isinstance(comp, computation_building_blocks.Block):
     local_symbols = []
     locals_modified = False
     for key, value in comp.locals:
-      value, value_modified = transform_postorder(value, transform)
+      value, value_modified = transform(value)
       local_symbols.append((key, value))
       locals_modified = locals_modified or value_modified
-    result, result_modified = transform_postorder(comp.result, transform)
+    result, result_modified = transform(comp.result)
     if locals_modified or result_modified:
       comp = computation_building_blocks.Block(local_symbols, result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or locals_modified or result_modified
+    return comp, locals_modified or result_modified
   else:
     raise NotImplementedError(
         'Unrecognized computation building block: {}'.format(str(comp)))
@@ -884,6 +1022,33 @@ def list_comp_names(comp):
   return names
 
 
+def get_unique_compiled_computations(comp):
+  """Returns the distinct compiled computations in `comp`, by fingerprint.
+
+  Occurrences of compiled computations with identical content (e.g., the same
+  TensorFlow computation referenced in several places, which may have been
+  given different names) are identified by their fingerprint, so the number of
+  unique TensorFlow graphs that `comp` contains is the length of the result.
+
+  Args:
+    comp: The root of the AST in which to look for compiled computations, an
+      instance of `computation_building_blocks.ComputationBuildingBlock`.
+
+  Returns:
+    A `collections.OrderedDict` that maps the fingerprint of each distinct
+    compiled computation in `comp` to its first occurrence, in postorder.
+  """
+  unique_comps = collections.OrderedDict()
+
+  def _collect(inner_comp):
+    if isinstance(inner_comp, computation_building_blocks.CompiledComputation):
+      unique_comps.setdefault(inner_comp.fingerprint, inner_comp)
+    return inner_comp, False
+
+  transform_postorder(comp, _collect)
+  return unique_comps
+
+
 class ReferenceCounter(BoundVariableTracker):
   """Data container to track number References to a variable in an AST.
 
@@ -410,6 +410,165 @@ class TransformationUtilsTest(parameterized.TestCase):
 
     self.assertEqual(leaf_name_order, list(postorder_nodes))
 
+  def test_transform_preorder_walks_parents_before_children(self):
+    complex_ast = _construct_nested_tree()
+    postorder_uris = []
+    postorder_kinds = []
+
+    def record_postorder(comp):
+      postorder_kinds.append(type(comp).__name__)
+      if isinstance(comp, computation_building_blocks.Data):
+        postorder_uris.append(comp.uri)
+      return comp, False
+
+    preorder_uris = []
+    preorder_kinds = []
+
+    def record_preorder(comp):
+      preorder_kinds.append(type(comp).__name__)
+      if isinstance(comp, computation_building_blocks.Data):
+        preorder_uris.append(comp.uri)
+      return comp, False
+
+    transformation_utils.transform_postorder(complex_ast, record_postorder)
+    same_comp, modified = transformation_utils.transform_preorder(
+        complex_ast, record_preorder)
+
+    self.assertIs(same_comp, complex_ast)
+    self.assertFalse(modified)
+    self.assertEqual(preorder_uris, postorder_uris)
+    self.assertEqual(preorder_kinds[0], type(complex_ast).__name__)
+    self.assertEqual(postorder_kinds[-1], type(complex_ast).__name__)
+    self.assertCountEqual(preorder_kinds, postorder_kinds)
+
+  def test_transform_preorder_visits_transformed_children(self):
+    data = computation_building_blocks.Data('x', tf.int32)
+
+    def wrap_data_in_tuple(comp):
+      if isinstance(comp, computation_building_blocks.Data):
+        return computation_building_blocks.Selection(
+            computation_building_blocks.Tuple([comp]), index=0), True
+      return comp, False
+
+    visited = []
+
+    def transform(comp):
+      visited.append(type(comp).__name__)
+      if isinstance(comp, computation_building_blocks.Lambda):
+        return computation_building_blocks.Lambda(comp.parameter_name,
+                                                  comp.parameter_type,
+                                                  wrap_data_in_tuple(
+                                                      comp.result)[0]), True
+      return comp, False
+
+    comp = computation_building_blocks.Lambda('y', tf.int32, data)
+    transformed_comp, modified = transformation_utils.transform_preorder(
+        comp, transform)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed_comp.tff_repr, '(y -> <x>[0])')
+    self.assertEqual(visited, ['Lambda', 'Selection', 'Tuple', 'Data'])
+
+  def test_transform_postorder_with_rules_fails_on_none_rules(self):
+    comp = computation_building_blocks.Data('x', tf.int32)
+    with self.assertRaises(TypeError):
+      transformation_utils.transform_postorder_with_rules(comp, None)
+
+  @parameterized.named_parameters(
+      _construct_trivial_instance_of_all_computation_building_blocks() +
+      [('complex_tree', _construct_nested_tree())])
+  def test_transform_postorder_with_rules_returns_untransformed(self, comp):
+
+    def transform_noop(comp):
+      return comp, False
+
+    same_comp, modified = transformation_utils.transform_postorder_with_rules(
+        comp, [('noop', transform_noop)])
+    self.assertIs(same_comp, comp)
+    self.assertFalse(modified)
+
+  def test_transform_postorder_with_rules_reaches_fixpoint(self):
+
+    def select_from_tuple(comp):
+      if (isinstance(comp, computation_building_blocks.Selection) and
+          isinstance(comp.source, computation_building_blocks.Tuple)):
+        return comp.source[comp.index], True
+      return comp, False
+
+    def wrap_a_in_tuple(comp):
+      if isinstance(comp, computation_building_blocks.Data) and comp.uri == 'a':
+        data = computation_building_blocks.Data('b', tf.int32)
+        return computation_building_blocks.Selection(
+            computation_building_blocks.Tuple([data]), index=0), True
+      return comp, False
+
+    data_a = computation_building_blocks.Data('a', tf.int32)
+    data_c = computation_building_blocks.Data('c', tf.int32)
+    comp = computation_building_blocks.Selection(
+        computation_building_blocks.Tuple([
+            computation_building_blocks.Selection(
+                computation_building_blocks.Tuple([data_a, data_c]), index=0),
+            data_c
+        ]),
+        index=0)
+    change_log = []
+
+    transformed_comp, modified = (
+        transformation_utils.transform_postorder_with_rules(
+            comp, [('select_from_tuple', select_from_tuple),
+                   ('wrap_a_in_tuple', wrap_a_in_tuple)], change_log))
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed_comp.tff_repr, 'b')
+    self.assertEqual([name for name, _, _ in change_log], [
+        'wrap_a_in_tuple', 'select_from_tuple', 'select_from_tuple',
+        'select_from_tuple'
+    ])
+    self.assertIs(change_log[0][1], data_a)
+
+  def test_transform_postorder_with_rules_does_not_revisit_carried_over_nodes(
+      self):
+    visited = []
+
+    def select_from_tuple(comp):
+      visited.append(comp)
+      if (isinstance(comp, computation_building_blocks.Selection) and
+          isinstance(comp.source, computation_building_blocks.Tuple)):
+        return comp.source[comp.index], True
+      return comp, False
+
+    data = computation_building_blocks.Data('x', tf.int32)
+    comp = computation_building_blocks.Lambda(
+        'y', tf.int32,
+        computation_building_blocks.Selection(
+            computation_building_blocks.Tuple([data]), index=0))
+
+    transformed_comp, _ = transformation_utils.transform_postorder_with_rules(
+        comp, [('select_from_tuple', select_from_tuple)])
+
+    self.assertEqual(transformed_comp.tff_repr, '(y -> x)')
+    self.assertEqual(len([c for c in visited if c is data]), 1)
+
+  def test_transform_postorder_with_rules_fails_on_rules_undoing_each_other(
+      self):
+
+    def wrap_in_tuple(comp):
+      if isinstance(comp, computation_building_blocks.Data):
+        return computation_building_blocks.Tuple([comp]), True
+      return comp, False
+
+    def unwrap_tuple(comp):
+      if isinstance(comp, computation_building_blocks.Tuple):
+        return comp[0], True
+      return comp, False
+
+    comp = computation_building_blocks.Data('x', tf.int32)
+    with self.assertRaises(ValueError):
+      transformation_utils.transform_postorder_with_rules(
+          comp, [('wrap_in_tuple', wrap_in_tuple),
+                 ('unwrap_tuple', unwrap_tuple)],
+          max_chained_rewrites=10)
+
   # TODO(b/113123410): Add more tests for corner cases of `transform_preorder`.
 
   def test_transform_postorder_with_symbol_bindings_fails_on_none_comp(self):
@@ -1613,6 +1772,26 @@ class TransformationUtilsTest(parameterized.TestCase):
     constructed_tree = _make_context_tree()
     self.assertEqual(references, constructed_tree)
 
+  def test_get_unique_compiled_computations_identifies_identical_graphs(self):
+    add_one, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: x + 1, tf.int32, context_stack_impl.context_stack)
+    add_two, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+        lambda x: x + 2, tf.int32, context_stack_impl.context_stack)
+    first = computation_building_blocks.CompiledComputation(add_one, name='a')
+    second = computation_building_blocks.CompiledComputation(add_one, name='b')
+    third = computation_building_blocks.CompiledComputation(add_two, name='c')
+    arg = computation_building_blocks.Reference('x', tf.int32)
+    comp = computation_building_blocks.Lambda(
+        'x', tf.int32,
+        computation_building_blocks.Tuple([
+            computation_building_blocks.Call(first, arg),
+            computation_building_blocks.Call(second, arg),
+            computation_building_blocks.Call(third, arg),
+        ]))
+    unique_comps = transformation_utils.get_unique_compiled_computations(comp)
+    self.assertLen(unique_comps, 2)
+    self.assertEqual(list(unique_comps.values()), [first, third])
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import itertools
 
 import six
@@ -27,11 +28,13 @@ from six.moves import zip
 from tensorflow_federated.python.common_libs import anonymous_tuple
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl import compiled_computation_transforms
 from tensorflow_federated.python.core.impl import computation_building_blocks
 from tensorflow_federated.python.core.impl import context_stack_base
 from tensorflow_federated.python.core.impl import federated_computation_utils
 from tensorflow_federated.python.core.impl import intrinsic_defs
 from tensorflow_federated.python.core.impl import transformation_utils
+from tensorflow_federated.python.core.impl import type_utils
 
 
 def replace_compiled_computations_names_with_unique_names(comp):
@@ -152,18 +155,18 @@ def replace_called_lambda_with_block(comp):
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
 
-  def _should_transform(comp):
-    return (isinstance(comp, computation_building_blocks.Call) and
-            isinstance(comp.function, computation_building_blocks.Lambda))
+  return transformation_utils.transform_postorder(
+      comp, _replace_called_lambda_with_block_rule)
 
-  def _transform(comp):
-    if not _should_transform(comp):
-      return comp, False
-    transformed_comp = computation_building_blocks.Block(
-        [(comp.function.parameter_name, comp.argument)], comp.function.result)
-    return transformed_comp, True
 
-  return transformation_utils.transform_postorder(comp, _transform)
+def _replace_called_lambda_with_block_rule(comp):
+  """The local rule of `replace_called_lambda_with_block`."""
+  if not (isinstance(comp, computation_building_blocks.Call) and
+          isinstance(comp.function, computation_building_blocks.Lambda)):
+    return comp, False
+  transformed_comp = computation_building_blocks.Block(
+      [(comp.function.parameter_name, comp.argument)], comp.function.result)
+  return transformed_comp, True
 
 
 def remove_mapped_or_applied_identity(comp):
@@ -201,27 +204,22 @@ def remove_mapped_or_applied_identity(comp):
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
 
-  def _should_transform(comp):
-    """Returns `True` if `comp` is a mapped or applied identity function."""
-    if (isinstance(comp, computation_building_blocks.Call) and
-        isinstance(comp.function, computation_building_blocks.Intrinsic) and
-        comp.function.uri in (
-            intrinsic_defs.FEDERATED_MAP.uri,
-            intrinsic_defs.FEDERATED_APPLY.uri,
-            intrinsic_defs.SEQUENCE_MAP.uri,
-        )):
-      called_function = comp.argument[0]
-      if _is_identity_function(called_function):
-        return True
-    return False
+  return transformation_utils.transform_postorder(
+      comp, _remove_mapped_or_applied_identity_rule)
 
-  def _transform(comp):
-    if not _should_transform(comp):
-      return comp, False
-    transformed_comp = comp.argument[1]
-    return transformed_comp, True
 
-  return transformation_utils.transform_postorder(comp, _transform)
+def _remove_mapped_or_applied_identity_rule(comp):
+  """The local rule of `remove_mapped_or_applied_identity`."""
+  if not (isinstance(comp, computation_building_blocks.Call) and
+          isinstance(comp.function, computation_building_blocks.Intrinsic) and
+          comp.function.uri in (
+              intrinsic_defs.FEDERATED_MAP.uri,
+              intrinsic_defs.FEDERATED_APPLY.uri,
+              intrinsic_defs.SEQUENCE_MAP.uri,
+          ) and _is_identity_function(comp.argument[0])):
+    return comp, False
+  transformed_comp = comp.argument[1]
+  return transformed_comp, True
 
 
 def replace_chained_federated_maps_with_federated_map(comp):
@@ -278,73 +276,68 @@ def replace_chained_federated_maps_with_federated_map(comp):
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
 
-  def _should_transform(comp):
-    """Returns `True` if `comp` is a chained federated map computation."""
-    uri = intrinsic_defs.FEDERATED_MAP.uri
-    if _is_called_intrinsic(comp, uri):
-      outer_arg = comp.argument[1]
-      if _is_called_intrinsic(outer_arg, uri):
-        return True
-    return False
-
-  def _transform(comp):
-    """Returns a new transformed computation or `comp`."""
-    if not _should_transform(comp):
-      return comp, False
-
-    def _create_block_to_chained_calls(comps):
-      r"""Constructs a transformed block computation from `comps`.
-
-                     Block
-                    /     \
-          [fn=Tuple]       Lambda(arg)
-              |                       \
-      [Comp(y), Comp(x)]               Call
-                                      /    \
-                                Sel(1)      Call
-                               /           /    \
-                        Ref(fn)      Sel(0)      Ref(arg)
-                                    /
-                             Ref(fn)
-
-      (let fn=<y, x> in (arg -> fn[1](fn[0](arg)))
-
-      Args:
-        comps: a Python list of computations.
-
-      Returns:
-        A `computation_building_blocks.Block`.
-      """
-      functions = computation_building_blocks.Tuple(comps)
-      fn_ref = computation_building_blocks.Reference('fn',
-                                                     functions.type_signature)
-      arg_type = comps[0].type_signature.parameter
-      arg_ref = computation_building_blocks.Reference('arg', arg_type)
-      arg = arg_ref
-      for index, _ in enumerate(comps):
-        fn_sel = computation_building_blocks.Selection(fn_ref, index=index)
-        call = computation_building_blocks.Call(fn_sel, arg)
-        arg = call
-      lam = computation_building_blocks.Lambda(arg_ref.name,
-                                               arg_ref.type_signature, call)
-      return computation_building_blocks.Block([('fn', functions)], lam)
-
-    block = _create_block_to_chained_calls((
-        comp.argument[1].argument[0],
-        comp.argument[0],
-    ))
-    arg = computation_building_blocks.Tuple([
-        block,
-        comp.argument[1].argument[1],
-    ])
-    intrinsic_type = computation_types.FunctionType(
-        arg.type_signature, comp.function.type_signature.result)
-    intrinsic = computation_building_blocks.Intrinsic(comp.function.uri,
-                                                      intrinsic_type)
-    transformed_comp = computation_building_blocks.Call(intrinsic, arg)
-    return transformed_comp, True
-
-  return transformation_utils.transform_postorder(comp, _transform)
+  return transformation_utils.transform_postorder(
+      comp, _replace_chained_federated_maps_with_federated_map_rule)
+
+
+def _replace_chained_federated_maps_with_federated_map_rule(comp):
+  """The local rule of `replace_chained_federated_maps_with_federated_map`."""
+  uri = intrinsic_defs.FEDERATED_MAP.uri
+  if not (_is_called_intrinsic(comp, uri) and
+          _is_called_intrinsic(comp.argument[1], uri)):
+    return comp, False
+
+  def _create_block_to_chained_calls(comps):
+    r"""Constructs a transformed block computation from `comps`.
+
+                   Block
+                  /     \
+        [fn=Tuple]       Lambda(arg)
+            |                       \
+    [Comp(y), Comp(x)]               Call
+                                    /    \
+                              Sel(1)      Call
+                             /           /    \
+                      Ref(fn)      Sel(0)      Ref(arg)
+                                  /
+                           Ref(fn)
+
+    (let fn=<y, x> in (arg -> fn[1](fn[0](arg)))
+
+    Args:
+      comps: a Python list of computations.
+
+    Returns:
+      A `computation_building_blocks.Block`.
+    """
+    functions = computation_building_blocks.Tuple(comps)
+    fn_ref = computation_building_blocks.Reference('fn',
+                                                   functions.type_signature)
+    arg_type = comps[0].type_signature.parameter
+    arg_ref = computation_building_blocks.Reference('arg', arg_type)
+    arg = arg_ref
+    for index, _ in enumerate(comps):
+      fn_sel = computation_building_blocks.Selection(fn_ref, index=index)
+      call = computation_building_blocks.Call(fn_sel, arg)
+      arg = call
+    lam = computation_building_blocks.Lambda(arg_ref.name,
+                                             arg_ref.type_signature, call)
+    return computation_building_blocks.Block([('fn', functions)], lam)
+
+  block = _create_block_to_chained_calls((
+      comp.argument[1].argument[0],
+      comp.argument[0],
+  ))
+  arg = computation_building_blocks.Tuple([
+      block,
+      comp.argument[1].argument[1],
+  ])
+  intrinsic_type = computation_types.FunctionType(
+      arg.type_signature, comp.function.type_signature.result)
+  intrinsic = computation_building_blocks.Intrinsic(comp.function.uri,
+                                                    intrinsic_type)
+  transformed_comp = computation_building_blocks.Call(intrinsic, arg)
+  return transformed_comp, True
 
 
 def replace_tuple_intrinsics_with_intrinsic(comp):
@@ -567,18 +560,18 @@ def merge_chained_blocks(comp):
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
 
-  def _should_transform(comp):
-    return (isinstance(comp, computation_building_blocks.Block) and
-            isinstance(comp.result, computation_building_blocks.Block))
+  return transformation_utils.transform_postorder(comp,
+                                                  _merge_chained_blocks_rule)
 
-  def _transform(comp):
-    if not _should_transform(comp):
-      return comp, False
-    transformed_comp = computation_building_blocks.Block(
-        comp.locals + comp.result.locals, comp.result.result)
-    return transformed_comp, True
 
-  return transformation_utils.transform_postorder(comp, _transform)
+def _merge_chained_blocks_rule(comp):
+  """The local rule of `merge_chained_blocks`."""
+  if not (isinstance(comp, computation_building_blocks.Block) and
+          isinstance(comp.result, computation_building_blocks.Block)):
+    return comp, False
+  transformed_comp = computation_building_blocks.Block(
+      comp.locals + comp.result.locals, comp.result.result)
+  return transformed_comp, True
 
 
 def replace_selection_from_tuple_with_tuple_element(comp):
@@ -610,26 +603,21 @@ def replace_selection_from_tuple_with_tuple_element(comp):
   py_typecheck.check_type(comp,
                           computation_building_blocks.ComputationBuildingBlock)
 
-  def _should_transform(comp):
-    if (isinstance(comp, computation_building_blocks.Selection) and
-        isinstance(comp.source, computation_building_blocks.Tuple)):
-      return True
-    return False
+  return transformation_utils.transform_postorder(
+      comp, _replace_selection_from_tuple_with_tuple_element_rule)
 
-  def _get_index_from_name(selection_name, tuple_type_signature):
-    type_elements = anonymous_tuple.to_elements(tuple_type_signature)
-    return [x[0] for x in type_elements].index(selection_name)
 
-  def _transform(comp):
-    if not _should_transform(comp):
-      return comp, False
-    if comp.name is not None:
-      index = _get_index_from_name(comp.name, comp.source.type_signature)
-    else:
-      index = comp.index
-    return comp.source[index], True
-
-  return transformation_utils.transform_postorder(comp, _transform)
+def _replace_selection_from_tuple_with_tuple_element_rule(comp):
+  """The local rule of `replace_selection_from_tuple_with_tuple_element`."""
+  if not (isinstance(comp, computation_building_blocks.Selection) and
+          isinstance(comp.source, computation_building_blocks.Tuple)):
+    return comp, False
+  if comp.name is not None:
+    type_elements = anonymous_tuple.to_elements(comp.source.type_signature)
+    index = [x[0] for x in type_elements].index(comp.name)
+  else:
+    index = comp.index
+  return comp.source[index], True
 
 
 def uniquify_references(comp):
@@ -687,6 +675,568 @@ def uniquify_references(comp):
   return new_comp
 
 
+def merge_tensorflow_computations(comp):
+  r"""Merges adjacent TensorFlow computations in `comp` into single ones.
+
+  This transform traverses `comp` postorder, and fuses called compiled
+  computations into a single compiled computation wherever the resulting
+  structure can be evaluated with a single call to TensorFlow. It matches and
+  replaces the following patterns:
+
+  1. A selection from the result of a called compiled computation:
+
+                Selection(x)
+                    |
+                   Call
+                  /    \
+             Graph      Comp
+
+     is replaced with a single called compiled computation that only produces
+     the selected output:
+
+                                Call
+                               /    \
+  select_graph_output(Graph, x)      Comp
+
+  2. A chain of called compiled computations:
+
+                Call
+               /    \
+        Graph_2      Call
+                    /    \
+             Graph_1      Comp
+
+     is replaced with a single called compiled computation that represents
+     their composition:
+
+                                                    Call
+                                                   /    \
+  compose_tensorflow_computations(Graph_2, Graph_1)      Comp
+
+  3. A tuple of compiled computations called on the same argument:
+
+                Tuple
+               / ... \
+           Call       Call
+          /    \     /    \
+    Graph_1    Comp Graph_n    Comp
+
+     is replaced with a single called compiled computation that returns the
+     results of all of them in a tuple:
+
+                                          Call
+                                         /    \
+  concatenate_tensorflow_computations(...)     Comp
+
+     The arguments are considered the same only if they are references to the
+     same name, or the same selections from such references. These are
+     evaluated in the same scope, so they refer to the same value. Other
+     arguments are never merged, even if they are equal, since evaluating them
+     once rather than for each element could change the result (e.g., if they
+     read external data or draw random numbers).
+
+  Chains are not merged if the initializer of `Graph_2` reads its parameter,
+  and `Graph_1` has an initializer (see
+  `compiled_computation_transforms.can_compose_initialize_ops`).
+
+  Because the traversal is postorder, these patterns compose; e.g., a compiled
+  computation called on a tuple of compiled computations called on the same
+  argument is reduced to a single called compiled computation. Only compiled
+  computations whose parameter and result types consist of tensors and named
+  tuples are merged.
+
+  Args:
+    comp: The computation building block in which to perform the merges.
+
+  Returns:
+    A new computation with the transformation applied or the original `comp`.
+
+  Raises:
+    TypeError: If types do not match.
+  """
+  py_typecheck.check_type(comp,
+                          computation_building_blocks.ComputationBuildingBlock)
+
+  def _is_mergeable_type(type_spec):
+    return type_spec is None or type_utils.check_whitelisted(
+        type_spec,
+        (computation_types.TensorType, computation_types.NamedTupleType))
+
+  def _is_called_mergeable_graph(comp):
+    """Returns `True` if `comp` is a mergeable called compiled computation."""
+    if not (isinstance(comp, computation_building_blocks.Call) and isinstance(
+        comp.function, computation_building_blocks.CompiledComputation)):
+      return False
+    function_type = comp.function.type_signature
+    return (_is_mergeable_type(function_type.parameter) and
+            _is_mergeable_type(function_type.result))
+
+  def _is_same_argument(first, second):
+    """Returns `True` if `first` and `second` refer to the same value."""
+    if first is None or second is None:
+      return first is None and second is None
+    if (isinstance(first, computation_building_blocks.Reference) and
+        isinstance(second, computation_building_blocks.Reference)):
+      return (first.name == second.name and
+              first.type_signature == second.type_signature)
+    if (isinstance(first, computation_building_blocks.Selection) and
+        isinstance(second, computation_building_blocks.Selection)):
+      return (first.name == second.name and first.index == second.index and
+              _is_same_argument(first.source, second.source))
+    return False
+
+  def _transform_selection(comp):
+    called_graph = comp.source
+    if comp.name is not None:
+      selected_graph = compiled_computation_transforms.select_graph_output(
+          called_graph.function, name=comp.name)
+    else:
+      selected_graph = compiled_computation_transforms.select_graph_output(
+          called_graph.function, index=comp.index)
+    return computation_building_blocks.Call(selected_graph,
+                                            called_graph.argument)
+
+  def _transform_call(comp):
+    inner = comp.argument
+    composed_graph = (
+        compiled_computation_transforms.compose_tensorflow_computations(
+            comp.function, inner.function))
+    return computation_building_blocks.Call(composed_graph, inner.argument)
+
+  def _transform_tuple(comp):
+    elements = anonymous_tuple.to_elements(comp)
+    concatenated_graph = (
+        compiled_computation_transforms.concatenate_tensorflow_computations(
+            [(name, element.function) for name, element in elements]))
+    return computation_building_blocks.Call(concatenated_graph,
+                                            elements[0][1].argument)
+
+  def _should_transform_tuple(comp):
+    elements = [element for _, element in anonymous_tuple.to_elements(comp)]
+    if len(elements) < 2:
+      return False
+    if not all(_is_called_mergeable_graph(element) for element in elements):
+      return False
+    first = elements[0]
+    return all(
+        element.function.type_signature.parameter ==
+        first.function.type_signature.parameter and
+        _is_same_argument(element.argument, first.argument)
+        for element in elements[1:])
+
+  def _transform(comp):
+    if (isinstance(comp, computation_building_blocks.Selection) and
+        _is_called_mergeable_graph(comp.source)):
+      return _transform_selection(comp), True
+    if (_is_called_mergeable_graph(comp) and
+        _is_called_mergeable_graph(comp.argument) and
+        type_utils.is_assignable_from(
+            comp.function.type_signature.parameter,
+            comp.argument.function.type_signature.result) and
+        compiled_computation_transforms.can_compose_initialize_ops(
+            comp.function, comp.argument.function)):
+      return _transform_call(comp), True
+    if (isinstance(comp, computation_building_blocks.Tuple) and
+        _should_transform_tuple(comp)):
+      return _transform_tuple(comp), True
+    return comp, False
+
+  return transformation_utils.transform_postorder(comp, _transform)
+
+
+def eliminate_common_subexpressions(comp):
+  r"""Binds repeated subexpressions in `comp` to locals, computed only once.
+
+  This transform traverses `comp` preorder, and in the result of each `Lambda`
+  and `Block` (and in `comp` itself, if it is neither), which together form the
+  scopes of `comp`, it finds the subexpressions that occur more than once, and
+  replaces the following computation:
+
+            Lambda(x)
+                     \
+                      Tuple
+                      |
+                      [Comp(y), Comp(y)]
+
+  (x -> <y, y>)
+
+  with the following computation that evaluates the repeated subexpression once:
+
+            Lambda(x)
+                     \
+                      Block
+                     /     \
+             v=Comp(y)      Tuple
+                            |
+                            [Ref(v), Ref(v)]
+
+  (x -> (let v=y in <v, v>))
+
+  Subexpressions are compared by their structure, i.e., two subexpressions are
+  the same if they are built of the same building blocks, up to the names of
+  the variables bound within them. The structure is hashed bottom-up, so each
+  comparison takes constant time. A subexpression is only bound in the scope
+  being processed if none of its variables are bound within that scope, i.e.,
+  the local can be placed at the top of the scope. Only selections, calls,
+  tuples and blocks that do not have functional types are bound, as evaluating
+  references, functions and constants is not worth saving.
+
+  As in `merge_tensorflow_computations`, two equal subexpressions are not
+  assumed to evaluate to the same value if they contain data blocks or calls of
+  functions that may read external data or draw random numbers. Only calls of
+  lambdas and of intrinsics that do not apply functions (e.g., `federated_sum`,
+  but not `federated_map`) are considered deterministic, since a function that
+  is referred to or selected may, e.g., be bound to a compiled computation.
+  Other subexpressions are never bound, though their deterministic parts can
+  be.
+
+  Within each scope, the largest repeated subexpression is bound first, and the
+  subexpressions are counted again, since the repeated subexpressions within it
+  may no longer be repeated. The locals are placed in the scope before those of
+  the larger subexpressions, which may refer to them.
+
+  Args:
+    comp: The computation building block in which to perform the replacements.
+
+  Returns:
+    A new computation with the transformation applied or the original `comp`.
+
+  Raises:
+    TypeError: If types do not match.
+  """
+  py_typecheck.check_type(comp,
+                          computation_building_blocks.ComputationBuildingBlock)
+  name_generator = _unique_name_generator(comp, prefix='_cse')
+  # The blocks constructed by this transform, by id, which are not processed
+  # again. The blocks are retained, so that the ids are not reused.
+  constructed_blocks = {}
+
+  def _bind_common_subexpressions(result):
+    """Returns the locals to bind in the scope with `result`, and the result."""
+    new_locals = []
+    while True:
+      if new_locals:
+        region = computation_building_blocks.Block(new_locals, result)
+      else:
+        region = result
+      table = _SubexpressionTable()
+      table.visit(region, {}, 0)
+      number = table.get_largest_repeated_subexpression()
+      if number is None:
+        return new_locals, result
+      value = table.first_occurrences[number]
+      ref = computation_building_blocks.Reference(
+          six.next(name_generator), value.type_signature)
+      region, _, _, _ = table.visit(region, {}, 0, number, ref)
+      if new_locals:
+        new_locals = region.locals
+        result = region.result
+      else:
+        result = region
+      new_locals = [(ref.name, value)] + new_locals
+
+  def _make_block(new_locals, result):
+    block = computation_building_blocks.Block(new_locals, result)
+    constructed_blocks[id(block)] = block
+    return block
+
+  def _transform(comp):
+    if isinstance(comp, computation_building_blocks.Lambda):
+      new_locals, result = _bind_common_subexpressions(comp.result)
+      if not new_locals:
+        return comp, False
+      return computation_building_blocks.Lambda(
+          comp.parameter_name, comp.parameter_type,
+          _make_block(new_locals, result)), True
+    elif (isinstance(comp, computation_building_blocks.Block) and
+          id(comp) not in constructed_blocks):
+      new_locals, result = _bind_common_subexpressions(comp.result)
+      if not new_locals:
+        return comp, False
+      return _make_block(comp.locals + new_locals, result), True
+    return comp, False
+
+  if not isinstance(
+      comp,
+      (computation_building_blocks.Lambda, computation_building_blocks.Block)):
+    new_locals, result = _bind_common_subexpressions(comp)
+    if new_locals:
+      comp, _ = transformation_utils.transform_preorder(
+          _make_block(new_locals, result), _transform)
+      return comp, True
+  return transformation_utils.transform_preorder(comp, _transform)
+
+
+class _SubexpressionTable(object):
+  """Numbers the subexpressions of a computation by their structure.
+
+  Each subexpression is assigned the number of its key, which is built from the
+  kind of the building block, its non-computational attributes, and the numbers
+  of its children, so subexpressions of the same structure share a number, and
+  keys are compared in constant time. References to variables bound within the
+  computation are keyed by the distance to their binding (i.e., by de Bruijn
+  index), and all other references by name, so that numbers do not depend on
+  the names of bound variables.
+
+  The table also records, for each number, the number of occurrences and the
+  first occurrence of the subexpressions worth binding to a local (see
+  `eliminate_common_subexpressions`), and their size.
+  """
+
+  def __init__(self):
+    self._numbers = {}
+    # Whether the subexpressions of each number always evaluate to the same
+    # value, which only depends on their structure.
+    self._deterministic = {}
+    self.counts = collections.defaultdict(int)
+    self.sizes = {}
+    self.first_occurrences = {}
+
+  def get_largest_repeated_subexpression(self):
+    """Returns the number of the largest repeated subexpression, or `None`."""
+    best = None
+    for number, count in six.iteritems(self.counts):
+      if count < 2:
+        continue
+      if best is None or (self.sizes[number], -number) > (self.sizes[best],
+                                                          -best):
+        best = number
+    return best
+
+  def visit(self, comp, scope, depth, target=None, replacement=None):
+    """Numbers `comp` and its subexpressions, optionally replacing some.
+
+    Args:
+      comp: The building block to visit.
+      scope: A dictionary from the names of the variables bound within the
+        visited computation around `comp` to the depths at which they are bound.
+        Restored on return.
+      depth: The number of variables bound within the visited computation
+        around `comp`.
+      target: The optional number of the subexpressions to replace.
+      replacement: The building block to replace them with, if `target` is set.
+
+    Returns:
+      A tuple of the (possibly replaced) building block, the number of `comp`,
+      its size, and the set of depths of the variables bound within the
+      visited computation that `comp` refers to, but does not bind itself.
+    """
+    children_free = []
+    children_numbers = []
+    deterministic = True
+    size = 1
+    if isinstance(comp, computation_building_blocks.Reference):
+      level = scope.get(comp.name)
+      if level is None:
+        key = ('reference', comp.name)
+      else:
+        key = ('bound', depth - level)
+        children_free.append(frozenset([level]))
+    elif isinstance(comp, computation_building_blocks.Data):
+      key = ('data', comp.uri, comp.type_signature)
+      deterministic = False
+    elif isinstance(comp, computation_building_blocks.Intrinsic):
+      key = ('intrinsic', comp.uri, comp.type_signature)
+    elif isinstance(comp, computation_building_blocks.Placement):
+      key = ('placement', comp.uri)
+    elif isinstance(comp, computation_building_blocks.CompiledComputation):
+      key = ('compiled', comp.fingerprint)
+    elif isinstance(comp, computation_building_blocks.Selection):
+      source, number, child_size, free = self.visit(comp.source, scope, depth,
+                                                    target, replacement)
+      key = ('selection', number, comp.name, comp.index)
+      children_numbers.append(number)
+      size += child_size
+      children_free.append(free)
+      if source is not comp.source:
+        comp = computation_building_blocks.Selection(source, comp.name,
+                                                     comp.index)
+    elif isinstance(comp, computation_building_blocks.Tuple):
+      elements = []
+      element_keys = []
+      elements_modified = False
+      for name, value in anonymous_tuple.to_elements(comp):
+        element, number, child_size, free = self.visit(value, scope, depth,
+                                                       target, replacement)
+        elements.append((name, element))
+        element_keys.append((name, number))
+        elements_modified = elements_modified or element is not value
+        size += child_size
+        children_free.append(free)
+      key = ('tuple', tuple(element_keys))
+      children_numbers.extend(number for _, number in element_keys)
+      if elements_modified:
+        comp = computation_building_blocks.Tuple(elements)
+    elif isinstance(comp, computation_building_blocks.Call):
+      fn, fn_number, child_size, free = self.visit(comp.function, scope, depth,
+                                                   target, replacement)
+      size += child_size
+      children_free.append(free)
+      if comp.argument is not None:
+        arg, arg_number, child_size, free = self.visit(comp.argument, scope,
+                                                       depth, target,
+                                                       replacement)
+        size += child_size
+        children_free.append(free)
+      else:
+        arg, arg_number = None, None
+      key = ('call', fn_number, arg_number)
+      children_numbers.append(fn_number)
+      if arg_number is not None:
+        children_numbers.append(arg_number)
+      deterministic = _is_deterministic_function(comp.function)
+      if fn is not comp.function or arg is not comp.argument:
+        comp = computation_building_blocks.Call(fn, arg)
+    elif isinstance(comp, computation_building_blocks.Lambda):
+      saved_binding = scope.get(comp.parameter_name)
+      scope[comp.parameter_name] = depth + 1
+      result, number, child_size, free = self.visit(comp.result, scope,
+                                                    depth + 1, target,
+                                                    replacement)
+      _restore_binding(scope, comp.parameter_name, saved_binding)
+      key = ('lambda', comp.parameter_type, number)
+      children_numbers.append(number)
+      size += child_size
+      children_free.append(free)
+      if result is not comp.result:
+        comp = computation_building_blocks.Lambda(comp.parameter_name,
+                                                  comp.parameter_type, result)
+    elif isinstance(comp, computation_building_blocks.Block):
+      saved_bindings = []
+      new_locals = []
+      local_numbers = []
+      locals_modified = False
+      for index, (name, value) in enumerate(comp.locals):
+        local_value, number, child_size, free = self.visit(
+            value, scope, depth + index, target, replacement)
+        new_locals.append((name, local_value))
+        local_numbers.append(number)
+        locals_modified = locals_modified or local_value is not value
+        size += child_size
+        children_free.append(free)
+        saved_bindings.append((name, scope.get(name)))
+        scope[name] = depth + index + 1
+      result, number, child_size, free = self.visit(comp.result, scope,
+                                                    depth + len(comp.locals),
+                                                    target, replacement)
+      for name, saved_binding in reversed(saved_bindings):
+        _restore_binding(scope, name, saved_binding)
+      key = ('block', tuple(local_numbers), number)
+      children_numbers.extend(local_numbers)
+      children_numbers.append(number)
+      size += child_size
+      children_free.append(free)
+      if locals_modified or result is not comp.result:
+        comp = computation_building_blocks.Block(new_locals, result)
+    else:
+      raise NotImplementedError(
+          'Unrecognized computation building block: {}'.format(str(comp)))
+
+    free = frozenset(
+        level for levels in children_free for level in levels
+        if level <= depth)
+    number = self._numbers.get(key)
+    if number is None:
+      number = len(self._numbers)
+      self._numbers[key] = number
+      self._deterministic[number] = deterministic and all(
+          self._deterministic[n] for n in children_numbers)
+    if target is not None:
+      if number == target:
+        return replacement, number, size, free
+      return comp, number, size, free
+    if (not free and isinstance(comp, _BINDABLE_BUILDING_BLOCKS) and
+        not isinstance(comp.type_signature, computation_types.FunctionType) and
+        self._deterministic[number]):
+      self.counts[number] += 1
+      self.sizes[number] = size
+      self.first_occurrences.setdefault(number, comp)
+    return comp, number, size, free
+
+
+# The kinds of building blocks that `eliminate_common_subexpressions` binds to
+# locals when repeated.
+_BINDABLE_BUILDING_BLOCKS = (
+    computation_building_blocks.Selection,
+    computation_building_blocks.Tuple,
+    computation_building_blocks.Call,
+    computation_building_blocks.Block,
+)
+
+
+# The URIs of the intrinsics whose results only depend on their arguments, as
+# opposed to those that apply functions passed in their arguments.
+_DETERMINISTIC_INTRINSIC_URIS = frozenset([
+    intrinsic_defs.FEDERATED_BROADCAST.uri,
+    intrinsic_defs.FEDERATED_COLLECT.uri,
+    intrinsic_defs.FEDERATED_MEAN.uri,
+    intrinsic_defs.FEDERATED_SUM.uri,
+    intrinsic_defs.FEDERATED_VALUE_AT_CLIENTS.uri,
+    intrinsic_defs.FEDERATED_VALUE_AT_SERVER.uri,
+    intrinsic_defs.FEDERATED_WEIGHTED_MEAN.uri,
+    intrinsic_defs.FEDERATED_ZIP_AT_CLIENTS.uri,
+    intrinsic_defs.FEDERATED_ZIP_AT_SERVER.uri,
+    intrinsic_defs.GENERIC_PLUS.uri,
+    intrinsic_defs.GENERIC_ZERO.uri,
+    intrinsic_defs.SEQUENCE_SUM.uri,
+])
+
+
+def _is_deterministic_function(fn):
+  """Returns `True` if calls of `fn` always evaluate to the same value.
+
+  The body of a lambda is checked separately, as a subexpression of the call.
+
+  Args:
+    fn: The function of a call, an instance of
+      `computation_building_blocks.ComputationBuildingBlock`.
+
+  Returns:
+    `True` if `fn` is a lambda, or an intrinsic that does not apply functions,
+    and `False` otherwise.
+  """
+  if isinstance(fn, computation_building_blocks.Lambda):
+    return True
+  if isinstance(fn, computation_building_blocks.Intrinsic):
+    return fn.uri in _DETERMINISTIC_INTRINSIC_URIS
+  return False
+
+
+def _restore_binding(scope, name, saved_binding):
+  if saved_binding is None:
+    del scope[name]
+  else:
+    scope[name] = saved_binding
+
+
+def _unique_name_generator(comp, prefix='_var'):
+  """Yields names that are not used by any variable in `comp`.
+
+  Args:
+    comp: The computation building block whose names are to be avoided.
+    prefix: The prefix of the names to generate.
+
+  Yields:
+    Strings `prefix` followed by an increasing integer.
+  """
+  used_names = set()
+
+  def _add_names(comp):
+    if isinstance(comp, computation_building_blocks.Reference):
+      used_names.add(comp.name)
+    elif isinstance(comp, computation_building_blocks.Lambda):
+      used_names.add(comp.parameter_name)
+    elif isinstance(comp, computation_building_blocks.Block):
+      used_names.update(name for name, _ in comp.locals)
+    return comp, False
+
+  transformation_utils.transform_postorder(comp, _add_names)
+  for index in itertools.count(start=1):
+    name = '{}{}'.format(prefix, index)
+    if name not in used_names:
+      yield name
+
+
 def _is_called_intrinsic(comp, uri):
   """Returns `True` if `comp` is a called intrinsic with the `uri` or `uri`s.
 
@@ -711,3 +1261,22 @@ def _is_identity_function(comp):
   return (isinstance(comp, computation_building_blocks.Lambda) and
           isinstance(comp.result, computation_building_blocks.Reference) and
           comp.parameter_name == comp.result.name)
+
+
+# The local rules of the passes above that simplify the structure of a
+# computation, in the order in which they are to be tried by
+# `transformation_utils.transform_postorder_with_rules`. The rules preserve the
+# semantics of the computation, and none of them undoes the rewrites of another.
+# `replace_tuple_intrinsics_with_intrinsic` is omitted, as the intrinsic calls
+# it constructs are not understood by the executors.
+SIMPLIFICATION_RULES = (
+    ('replace_called_lambda_with_block',
+     _replace_called_lambda_with_block_rule),
+    ('remove_mapped_or_applied_identity',
+     _remove_mapped_or_applied_identity_rule),
+    ('replace_chained_federated_maps_with_federated_map',
+     _replace_chained_federated_maps_with_federated_map_rule),
+    ('merge_chained_blocks', _merge_chained_blocks_rule),
+    ('replace_selection_from_tuple_with_tuple_element',
+     _replace_selection_from_tuple_with_tuple_element_rule),
+)
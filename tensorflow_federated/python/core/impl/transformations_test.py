@@ -257,6 +257,12 @@ def _create_dummy_called_intrinsic(uri='dummy', type_spec=tf.int32):
   return computation_building_blocks.Call(intrinsic, arg)
 
 
+def _create_compiled_computation(py_fn, arg_type):
+  proto, _ = tensorflow_serialization.serialize_py_fn_as_tf_computation(
+      py_fn, arg_type, context_stack_impl.context_stack)
+  return computation_building_blocks.CompiledComputation(proto)
+
+
 def _has_unique_names(comp):
   """Checks that each variable of `comp` is bound at most once."""
   names = set()
@@ -1316,5 +1322,321 @@ class UniquifyReferencesTest(absltest.TestCase):
     self.assertTrue(_has_unique_names(renamed))
 
 
+class MergeTensorFlowComputationsTest(absltest.TestCase):
+
+  def test_raises_type_error(self):
+    with self.assertRaises(TypeError):
+      transformations.merge_tensorflow_computations(None)
+
+  def test_merges_chained_calls(self):
+    inner = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    outer = _create_compiled_computation(lambda x: tf.cast(x, tf.float32),
+                                         tf.int32)
+    ref = computation_building_blocks.Reference('arg', tf.int32)
+    comp = computation_building_blocks.Call(
+        outer, computation_building_blocks.Call(inner, ref))
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertIsInstance(transformed_comp, computation_building_blocks.Call)
+    self.assertIsInstance(transformed_comp.function,
+                          computation_building_blocks.CompiledComputation)
+    self.assertIs(transformed_comp.argument, ref)
+    self.assertEqual(transformed_comp.type_signature, comp.type_signature)
+
+  def test_does_not_merge_chained_calls_with_initializer_reading_arg(self):
+
+    def _read_variable(x):
+      v = tf.Variable(10)
+      return v + x
+
+    def _initialize_variable_with_arg(x):
+      v = tf.Variable(x)
+      return v * 3
+
+    inner = _create_compiled_computation(_read_variable, tf.int32)
+    outer = _create_compiled_computation(_initialize_variable_with_arg,
+                                         tf.int32)
+    ref = computation_building_blocks.Reference('arg', tf.int32)
+    comp = computation_building_blocks.Call(
+        outer, computation_building_blocks.Call(inner, ref))
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_merges_selection_from_called_graph(self):
+    graph = _create_compiled_computation(lambda x: (x, x + 1), tf.int32)
+    ref = computation_building_blocks.Reference('arg', tf.int32)
+    comp = computation_building_blocks.Selection(
+        computation_building_blocks.Call(graph, ref), index=1)
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertIsInstance(transformed_comp, computation_building_blocks.Call)
+    self.assertEqual(
+        str(transformed_comp.function.type_signature), '(int32 -> int32)')
+
+  def test_merges_tuple_of_graphs_called_on_same_argument(self):
+    foo = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    bar = _create_compiled_computation(lambda x: x * 2, tf.int32)
+    comp = computation_building_blocks.Tuple([
+        ('a',
+         computation_building_blocks.Call(
+             foo, computation_building_blocks.Reference('arg', tf.int32))),
+        ('b',
+         computation_building_blocks.Call(
+             bar, computation_building_blocks.Reference('arg', tf.int32))),
+    ])
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertIsInstance(transformed_comp, computation_building_blocks.Call)
+    self.assertIsInstance(transformed_comp.function,
+                          computation_building_blocks.CompiledComputation)
+    self.assertEqual(transformed_comp.argument.tff_repr, 'arg')
+    self.assertEqual(
+        str(transformed_comp.type_signature), '<a=int32,b=int32>')
+
+  def test_merges_tuple_of_graphs_called_on_same_selection(self):
+    foo = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    bar = _create_compiled_computation(lambda x: x * 2, tf.int32)
+    arg_type = computation_types.NamedTupleType([('a', tf.int32)])
+
+    def _selection():
+      return computation_building_blocks.Selection(
+          computation_building_blocks.Reference('arg', arg_type), name='a')
+
+    comp = computation_building_blocks.Tuple([
+        computation_building_blocks.Call(foo, _selection()),
+        computation_building_blocks.Call(bar, _selection()),
+    ])
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertIsInstance(transformed_comp, computation_building_blocks.Call)
+    self.assertEqual(transformed_comp.argument.tff_repr, 'arg.a')
+
+  def test_does_not_merge_tuple_of_graphs_called_on_equal_data(self):
+    foo = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    bar = _create_compiled_computation(lambda x: x * 2, tf.int32)
+    data = computation_building_blocks.Data('data', tf.int32)
+    comp = computation_building_blocks.Tuple([
+        computation_building_blocks.Call(foo, data),
+        computation_building_blocks.Call(bar, data),
+    ])
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_does_not_merge_tuple_of_graphs_called_on_different_arguments(self):
+    foo = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    comp = computation_building_blocks.Tuple([
+        computation_building_blocks.Call(
+            foo, computation_building_blocks.Reference('x', tf.int32)),
+        computation_building_blocks.Call(
+            foo, computation_building_blocks.Reference('y', tf.int32)),
+    ])
+
+    transformed_comp, modified = transformations.merge_tensorflow_computations(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_does_not_merge_graphs_over_sequences(self):
+    inner = _create_compiled_computation(lambda x: x,
+                                         computation_types.SequenceType(
+                                             tf.int32))
+    outer = _create_compiled_computation(lambda x: x.reduce(0, tf.add),
+                                         computation_types.SequenceType(
+                                             tf.int32))
+    comp = computation_building_blocks.Call(
+        outer,
+        computation_building_blocks.Call(
+            inner,
+            computation_building_blocks.Reference(
+                'arg', computation_types.SequenceType(tf.int32))))
+
+    _, modified = transformations.merge_tensorflow_computations(comp)
+
+    self.assertFalse(modified)
+
+
+class EliminateCommonSubexpressionsTest(absltest.TestCase):
+
+  def test_raises_type_error(self):
+    with self.assertRaises(TypeError):
+      transformations.eliminate_common_subexpressions(None)
+
+  def test_binds_repeated_selection_in_lambda(self):
+    arg_type = computation_types.NamedTupleType([('a', [('b', tf.int32)])])
+    ref = computation_building_blocks.Reference('x', arg_type)
+
+    def _selection():
+      return computation_building_blocks.Selection(
+          computation_building_blocks.Selection(ref, name='a'), name='b')
+
+    comp = computation_building_blocks.Lambda(
+        'x', arg_type,
+        computation_building_blocks.Tuple([_selection(), _selection()]))
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertEqual(comp.tff_repr, '(x -> <x.a.b,x.a.b>)')
+    self.assertEqual(transformed_comp.tff_repr,
+                     '(x -> (let _cse1=x.a.b in <_cse1,_cse1>))')
+    self.assertEqual(transformed_comp.type_signature, comp.type_signature)
+
+  def test_binds_largest_repeated_subexpression_first(self):
+    fn = computation_building_blocks.Lambda(
+        'a', tf.int32, computation_building_blocks.Reference('a', tf.int32))
+    arg = computation_building_blocks.Reference('y', [tf.int32])
+    selection = computation_building_blocks.Selection(arg, index=0)
+    call = computation_building_blocks.Call(fn, selection)
+    comp = computation_building_blocks.Tuple([call, call, selection])
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertEqual(
+        transformed_comp.tff_repr,
+        '(let _cse2=y[0],_cse1=(a -> a)(_cse2) in <_cse1,_cse1,_cse2>)')
+
+  def test_does_not_bind_subexpressions_of_inner_variables(self):
+    ref = computation_building_blocks.Reference('x', [tf.int32])
+    inner = computation_building_blocks.Lambda(
+        'x', [tf.int32], computation_building_blocks.Selection(ref, index=0))
+    comp = computation_building_blocks.Lambda(
+        'y', tf.int32, computation_building_blocks.Tuple([inner, inner]))
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_binds_repeated_subexpression_in_inner_scope(self):
+    ref = computation_building_blocks.Reference('x', [tf.int32])
+    selection = computation_building_blocks.Selection(ref, index=0)
+    inner = computation_building_blocks.Lambda(
+        'x', [tf.int32], computation_building_blocks.Tuple([selection,
+                                                             selection]))
+    comp = computation_building_blocks.Lambda('y', tf.int32, inner)
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed_comp.tff_repr,
+                     '(y -> (x -> (let _cse1=x[0] in <_cse1,_cse1>)))')
+
+  def test_does_not_bind_repeated_calls_of_compiled_computation(self):
+    graph = _create_compiled_computation(
+        lambda x: tf.random.uniform([], maxval=x, dtype=tf.int32), tf.int32)
+    ref = computation_building_blocks.Reference('arg', tf.int32)
+    call = computation_building_blocks.Call(graph, ref)
+    comp = computation_building_blocks.Tuple([call, call])
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_does_not_bind_repeated_calls_of_referenced_compiled_computation(
+      self):
+    graph = _create_compiled_computation(
+        lambda x: tf.random.uniform([], maxval=x, dtype=tf.int32), tf.int32)
+    fn = computation_building_blocks.Reference('f', graph.type_signature)
+    ref = computation_building_blocks.Reference('x', tf.int32)
+    call = computation_building_blocks.Call(fn, ref)
+    comp = computation_building_blocks.Block(
+        [('f', graph)], computation_building_blocks.Tuple([call, call]))
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertFalse(modified)
+    self.assertEqual(transformed_comp.tff_repr, comp.tff_repr)
+
+  def test_does_not_bind_repeated_calls_of_selected_function(self):
+    fn_type = computation_types.FunctionType(tf.int32, tf.int32)
+    fn = computation_building_blocks.Selection(
+        computation_building_blocks.Reference('fn', [fn_type]), index=0)
+    ref = computation_building_blocks.Reference('arg', tf.int32)
+    call = computation_building_blocks.Call(fn, ref)
+    comp = computation_building_blocks.Tuple([call, call])
+
+    _, modified = transformations.eliminate_common_subexpressions(comp)
+
+    self.assertFalse(modified)
+
+  def test_does_not_bind_repeated_calls_of_mapping_intrinsic(self):
+    graph = _create_compiled_computation(lambda x: x + 1, tf.int32)
+    arg_type = computation_types.FederatedType(tf.int32, placements.CLIENTS)
+    intrinsic = computation_building_blocks.Intrinsic(
+        intrinsic_defs.FEDERATED_MAP.uri,
+        computation_types.FunctionType([graph.type_signature, arg_type],
+                                       arg_type))
+    call = computation_building_blocks.Call(
+        intrinsic,
+        computation_building_blocks.Tuple(
+            [graph, computation_building_blocks.Reference('arg', arg_type)]))
+    comp = computation_building_blocks.Tuple([call, call])
+
+    _, modified = transformations.eliminate_common_subexpressions(comp)
+
+    self.assertFalse(modified)
+
+  def test_binds_repeated_calls_of_deterministic_intrinsic(self):
+    arg_type = computation_types.FederatedType(tf.int32, placements.CLIENTS)
+    intrinsic = computation_building_blocks.Intrinsic(
+        intrinsic_defs.FEDERATED_SUM.uri,
+        computation_types.FunctionType(
+            arg_type,
+            computation_types.FederatedType(tf.int32, placements.SERVER,
+                                            True)))
+    call = computation_building_blocks.Call(
+        intrinsic, computation_building_blocks.Reference('arg', arg_type))
+    comp = computation_building_blocks.Tuple([call, call])
+
+    transformed_comp, modified = transformations.eliminate_common_subexpressions(
+        comp)
+
+    self.assertTrue(modified)
+    self.assertEqual(
+        transformed_comp.tff_repr,
+        '(let _cse1=federated_sum(arg) in <_cse1,_cse1>)')
+
+  def test_does_not_reuse_names(self):
+    ref = computation_building_blocks.Reference('_cse1', [tf.int32])
+    selection = computation_building_blocks.Selection(ref, index=0)
+    comp = computation_building_blocks.Lambda(
+        '_cse1', [tf.int32],
+        computation_building_blocks.Tuple([selection, selection]))
+
+    transformed_comp, _ = transformations.eliminate_common_subexpressions(comp)
+
+    self.assertEqual(transformed_comp.tff_repr,
+                     '(_cse1 -> (let _cse2=_cse1[0] in <_cse2,_cse2>))')
+
+
 if __name__ == '__main__':
   absltest.main()
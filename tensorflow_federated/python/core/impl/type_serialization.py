@@ -22,6 +22,7 @@ import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import lru_cache
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.impl import placement_literals
@@ -116,6 +117,10 @@ def deserialize_type(type_proto):
   NOTE: Currently only deserialization for tensor, named tuple, sequence, and
   function types is implemented.
 
+  The results are memoized by the content of `type_proto`, since the same types
+  recur throughout a serialized computation. Types are immutable, so the same
+  instance of computation_types.Type may be returned for equal protos.
+
   Args:
     type_proto: An instance of pb.Type or None.
 
@@ -128,10 +133,26 @@ def deserialize_type(type_proto):
     NotImplementedError: for type variants for which deserialization is not
       implemented.
   """
-  # TODO(b/113112885): Implement deserialization of the remaining types.
   if type_proto is None:
     return None
   py_typecheck.check_type(type_proto, pb.Type)
+  key = type_proto.SerializeToString(deterministic=True)
+  type_spec = _deserialized_types.get(key)
+  if type_spec is None:
+    type_spec = _deserialize_type(type_proto)
+    if type_spec is not None:
+      _deserialized_types.put(key, type_spec)
+  return type_spec
+
+
+_deserialized_types = lru_cache.LruCache(10000)
+
+
+def _deserialize_type(type_proto):
+  """Implements `deserialize_type` for an instance of pb.Type."""
+  # TODO(b/113112885): Implement deserialization of the remaining types.
+  if type_proto is None:
+    return None
   type_variant = type_proto.WhichOneof('type')
   if type_variant is None:
     return None
@@ -142,23 +163,23 @@ def deserialize_type(type_proto):
         shape=_to_tensor_shape(tensor_proto))
   elif type_variant == 'sequence':
     return computation_types.SequenceType(
-        deserialize_type(type_proto.sequence.element))
+        _deserialize_type(type_proto.sequence.element))
   elif type_variant == 'tuple':
     return computation_types.NamedTupleType([
-        (lambda k, v: (k, v) if k else v)(e.name, deserialize_type(e.value))
+        (lambda k, v: (k, v) if k else v)(e.name, _deserialize_type(e.value))
         for e in type_proto.tuple.element
     ])
   elif type_variant == 'function':
     return computation_types.FunctionType(
-        parameter=deserialize_type(type_proto.function.parameter),
-        result=deserialize_type(type_proto.function.result))
+        parameter=_deserialize_type(type_proto.function.parameter),
+        result=_deserialize_type(type_proto.function.result))
   elif type_variant == 'placement':
     return computation_types.PlacementType()
   elif type_variant == 'federated':
     placement_oneof = type_proto.federated.placement.WhichOneof('placement')
     if placement_oneof == 'value':
       return computation_types.FederatedType(
-          member=deserialize_type(type_proto.federated.member),
+          member=_deserialize_type(type_proto.federated.member),
           placement=placement_literals.uri_to_placement_literal(
               type_proto.federated.placement.value.uri),
           all_equal=type_proto.federated.all_equal)
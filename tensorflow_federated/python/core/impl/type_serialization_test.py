@@ -165,6 +165,15 @@ class TypeSerializationTest(test.TestCase, parameterized.TestCase):
         computation_types.FederatedType(tf.int32, placements.CLIENTS, False)
     ])
 
+  def test_deserialize_type_reuses_types_for_equal_protos(self):
+    t = computation_types.to_type([('a', (tf.int32, [10])), ('b', tf.bool)])
+    t1 = type_serialization.deserialize_type(
+        type_serialization.serialize_type(t))
+    t2 = type_serialization.deserialize_type(
+        type_serialization.serialize_type(t))
+    self.assertEqual(t1, t)
+    self.assertIs(t1, t2)
+
   def _serialize_deserialize_roundtrip_test(self, type_list):
     """Performs roundtrip serialization/deserialization of computation_types.
 
@@ -26,6 +26,7 @@ from six.moves import range
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import anonymous_tuple
+from tensorflow_federated.python.common_libs import lru_cache
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import typed_object
@@ -769,6 +770,10 @@ def is_average_compatible(type_spec):
 def is_assignable_from(target_type, source_type):
   """Determines whether `target_type` is assignable from `source_type`.
 
+  The answers are memoized per pair of types, so repeated checks of the same
+  pair (e.g., for each client in a federated computation) only traverse the
+  types once.
+
   Args:
     target_type: The expected type (that of the target of the assignment).
     source_type: The actual type (that of the source of the assignment), tested
@@ -784,6 +789,22 @@ def is_assignable_from(target_type, source_type):
   source_type = computation_types.to_type(source_type)
   py_typecheck.check_type(target_type, computation_types.Type)
   py_typecheck.check_type(source_type, computation_types.Type)
+  key = (target_type, source_type)
+  result = _assignability_cache.get(key)
+  if result is None:
+    # Errors (e.g., on abstract types) are raised anew each time, not cached.
+    result = _is_assignable_from(target_type, source_type)
+    _assignability_cache.put(key, result)
+  return result
+
+
+# Types are hashed structurally, and the hash of each is computed only once, so
+# the keys are cheap to look up.
+_assignability_cache = lru_cache.LruCache(10000)
+
+
+def _is_assignable_from(target_type, source_type):
+  """Implements `is_assignable_from` for two instances of `tff.Type`."""
   if isinstance(target_type, computation_types.TensorType):
 
     def _shape_is_assignable_from(x, y):
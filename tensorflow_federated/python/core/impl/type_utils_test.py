@@ -795,6 +795,19 @@ class TypeUtilsTest(test.TestCase, parameterized.TestCase):
     t1 = computation_types.AbstractType('T1')
     t2 = computation_types.AbstractType('T2')
     self.assertRaises(TypeError, type_utils.is_assignable_from, t1, t2)
+    # The error is raised again, rather than the result cached.
+    self.assertRaises(TypeError, type_utils.is_assignable_from, t1, t2)
+
+  def test_is_assignable_from_with_equal_types_returns_same_results(self):
+    t1 = computation_types.to_type([('a', (tf.int32, [None])), ('b', tf.bool)])
+    t2 = computation_types.to_type([('a', (tf.int32, [10])), ('b', tf.bool)])
+    for _ in range(2):
+      self.assertTrue(type_utils.is_assignable_from(t1, t2))
+      self.assertFalse(type_utils.is_assignable_from(t2, t1))
+      self.assertTrue(
+          type_utils.is_assignable_from(
+              [('a', (tf.int32, [None])), ('b', tf.bool)],
+              [('a', (tf.int32, [10])), ('b', tf.bool)]))
 
   def test_is_assignable_from_with_placement_type(self):
     t1 = computation_types.PlacementType()